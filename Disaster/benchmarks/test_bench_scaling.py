@@ -0,0 +1,97 @@
+"""Scaling benchmarks for the orchestrator, optimiser and simulation runner.
+
+Run with ``pytest benchmarks --benchmark-only`` (requires ``pytest-benchmark``);
+restrict sizes with ``-k``, e.g. ``-k "300 or 3000"``.
+"""
+import dataclasses
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from energy_network.config import OptimizationParameters
+from energy_network.incremental import IncrementalOrchestrator
+from energy_network.optimization import EnergyAllocationOptimizer
+from energy_network.orchestrator import EnergyOrchestrator
+from energy_network.simulation import SimulationRunner
+from energy_network.topology import ConnectionIndex
+from synthetic_grid import make_grid
+
+SIZES = [3, 30, 300, 3_000, 10_000]
+TOPOLOGIES = ["geometric", "scale_free"]
+MODES = ["greedy", "lp", "multihop"]
+
+
+def _record_peak_memory(benchmark, func) -> None:
+    """Run ``func`` once under tracemalloc and attach the peak to the report."""
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mb"] = round(peak / 2**20, 3)
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+@pytest.mark.parametrize("regions", SIZES)
+def test_run_cycle(benchmark, regions, topology, mode):
+    grid = make_grid(regions, topology=topology, seed=regions)
+    orchestrator = EnergyOrchestrator(
+        grid.region_configs, EnergyAllocationOptimizer(OptimizationParameters(), mode=mode)
+    )
+    orchestrator.connection_index  # build outside the timed region
+
+    _record_peak_memory(benchmark, lambda: orchestrator.run_cycle(grid.snapshots))
+    plan = benchmark(orchestrator.run_cycle, grid.snapshots)
+    benchmark.extra_info["dispatches"] = len(plan)
+    benchmark.extra_info["transferred_mw"] = plan.total_transferred
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+@pytest.mark.parametrize("regions", SIZES)
+def test_optimise(benchmark, regions, topology, mode):
+    grid = make_grid(regions, topology=topology, seed=regions)
+    optimizer = EnergyAllocationOptimizer(OptimizationParameters(), mode=mode)
+    index = ConnectionIndex.from_region_configs(grid.region_configs.values())
+    supply, demand = grid.region_supply(), grid.region_demand()
+
+    _record_peak_memory(benchmark, lambda: optimizer.optimise(supply, demand, index))
+    plan = benchmark(optimizer.optimise, supply, demand, index)
+    benchmark.extra_info["edges"] = index.edge_count
+    benchmark.extra_info["transferred_mw"] = plan.total_transferred
+
+
+@pytest.mark.parametrize("regions", SIZES)
+def test_simulation_run(benchmark, tmp_path: Path, regions):
+    grid = make_grid(regions, seed=regions)
+    grid.write_scenario(tmp_path / "synthetic.json")
+    runner = SimulationRunner(tmp_path, grid.region_configs.values(), OptimizationParameters())
+
+    _record_peak_memory(benchmark, lambda: runner.run("synthetic"))
+    result = benchmark(runner.run, "synthetic")
+    benchmark.extra_info["dispatches"] = len(result.plan)
+
+
+@pytest.mark.parametrize("mode", ["greedy", "lp"])
+@pytest.mark.parametrize("regions", SIZES)
+def test_incremental_refresh(benchmark, regions, mode):
+    grid = make_grid(regions, seed=regions)
+    orchestrator = EnergyOrchestrator(
+        grid.region_configs, EnergyAllocationOptimizer(OptimizationParameters(), mode=mode)
+    )
+    incremental = IncrementalOrchestrator(orchestrator)
+    incremental.prime(grid.snapshots)
+    event = grid.snapshots[regions // 2].disaster_event
+    severities = iter(np.tile([0.9, 0.1], 1_000_000))
+
+    def one_event():
+        incremental.apply(dataclasses.replace(event, severity=next(severities)))
+        return incremental.refresh()
+
+    plan = benchmark(one_event)
+    benchmark.extra_info["dispatches"] = len(plan)
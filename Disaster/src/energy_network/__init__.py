@@ -3,6 +3,8 @@
 from .config import GridConnection, RegionConfig, OptimizationParameters
 from .data_ingestion import DisasterEvent, EnergyStatus, RegionalDataIngestor
 from .forecasting import DemandForecaster, SupplyForecaster
+from .incremental import EnergyStatusUpdate, IncrementalOrchestrator
+from .monte_carlo import MonteCarloSweep, PerturbationSpec, SweepStatistics
 from .optimization import EnergyAllocationOptimizer, EnergyDispatchPlan
 from .orchestrator import EnergyOrchestrator, RegionalSnapshot
 from .simulation import SimulationRunner
@@ -21,4 +23,9 @@ __all__ = [
     "EnergyOrchestrator",
     "RegionalSnapshot",
     "SimulationRunner",
+    "MonteCarloSweep",
+    "PerturbationSpec",
+    "SweepStatistics",
+    "EnergyStatusUpdate",
+    "IncrementalOrchestrator",
 ]
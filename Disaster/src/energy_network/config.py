@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List
 
 
-@dataclass
+@dataclass(slots=True)
 class GridConnection:
     """Represents a cross-border interconnection between two regions."""
 
@@ -14,7 +14,7 @@ class GridConnection:
     loss_factor: float = 0.05
 
 
-@dataclass
+@dataclass(slots=True)
 class RegionConfig:
     """Static configuration for a region participating in the network."""
 
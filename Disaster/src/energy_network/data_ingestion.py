@@ -4,10 +4,10 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class DisasterEvent:
     """Represents a disaster impacting a region at a specific time."""
 
@@ -18,7 +18,7 @@ class DisasterEvent:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EnergyStatus:
     """Snapshot of demand, generation and storage conditions."""
 
@@ -33,37 +33,184 @@ class EnergyStatus:
         return self.generation_mw - self.demand_mw
 
 
+def _event_from_entry(entry: Dict[str, Any]) -> DisasterEvent:
+    return DisasterEvent(
+        region=entry["region"],
+        event_type=entry["event_type"],
+        severity=float(entry.get("severity", 0.0)),
+        infrastructure_impact=float(entry.get("infrastructure_impact", 0.0)),
+        description=entry.get("description", ""),
+    )
+
+
+class ScenarioCache:
+    """Parsed scenario documents keyed by resolved path and modification time.
+
+    A file is parsed once and served from memory until its mtime changes.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+    def load(self, path: Path) -> Dict[str, Any]:
+        key = path.resolve()
+        mtime = key.stat().st_mtime_ns
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with key.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        self._entries[key] = (mtime, payload)
+        return payload
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _JsonStreamReader:
+    """Incremental JSON reader that decodes one value at a time from a text stream."""
+
+    def __init__(self, handle: TextIO, chunk_size: int) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, token: str) -> None:
+        found = self.peek()
+        if found != token:
+            raise ValueError(f"Expected {token!r} in JSON document, found {found!r}")
+        self._position += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk; make sure it is complete.
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._position = end
+            return value
+
+
+def iter_json_array(handle: TextIO, key: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of the top-level ``key`` array of a JSON object one by one.
+
+    Only a single item is decoded at a time; sibling values are decoded and
+    discarded, so memory is bounded by the largest single value rather than
+    the whole document.
+    """
+
+    reader = _JsonStreamReader(handle, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() != "]":
+                while True:
+                    yield reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.expect(",")
+            reader.expect("]")
+        else:
+            reader.value()
+        if reader.peek() != ",":
+            break
+        reader.expect(",")
+    reader.expect("}")
+
+
 class RegionalDataIngestor:
-    """Loads regional disaster and energy context data."""
+    """Loads regional disaster and energy context data.
 
-    def __init__(self, data_root: Path) -> None:
+    Scenario files are parsed once through a :class:`ScenarioCache`; pass a
+    shared cache to reuse parsed documents across ingestors.
+    """
+
+    def __init__(self, data_root: Path, cache: Optional[ScenarioCache] = None) -> None:
         self.data_root = data_root
+        self.cache = cache or ScenarioCache()
+
+    def _scenario_path(self, scenario_name: str) -> Path:
+        return self.data_root / f"{scenario_name}.json"
+
+    def _payload(self, scenario_name: str) -> Dict[str, Any]:
+        return self.cache.load(self._scenario_path(scenario_name))
 
     def load_disaster_events(self, scenario_name: str) -> Iterable[DisasterEvent]:
         """Load a stream of disaster events from a JSON scenario file."""
 
-        scenario_path = self.data_root / f"{scenario_name}.json"
-        with scenario_path.open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
+        for entry in self._payload(scenario_name).get("events", []):
+            yield _event_from_entry(entry)
 
-        for entry in payload.get("events", []):
-            yield DisasterEvent(
-                region=entry["region"],
-                event_type=entry["event_type"],
-                severity=float(entry.get("severity", 0.0)),
-                infrastructure_impact=float(entry.get("infrastructure_impact", 0.0)),
-                description=entry.get("description", ""),
-            )
+    def stream_disaster_events(
+        self, scenario_name: str, chunk_size: int = 1 << 16
+    ) -> Iterator[DisasterEvent]:
+        """Incrementally parse disaster events without loading the whole file.
+
+        Intended for very large event files; bypasses the scenario cache.
+        """
+
+        with self._scenario_path(scenario_name).open("r", encoding="utf-8") as handle:
+            for entry in iter_json_array(handle, "events", chunk_size=chunk_size):
+                yield _event_from_entry(entry)
+
+    def load_event_timeline(self, scenario_name: str) -> Iterator[Tuple[int, DisasterEvent]]:
+        """Yield ``(step, event)`` pairs from a scenario's ``timeline`` in step order.
+
+        Each timeline entry is a disaster event with an extra integer ``step``
+        at which it takes effect; it stays active until a later entry for the
+        same region replaces it.
+        """
+
+        entries = sorted(
+            self._payload(scenario_name).get("timeline", []), key=lambda entry: int(entry["step"])
+        )
+        for entry in entries:
+            yield int(entry["step"]), _event_from_entry(entry)
 
     def load_energy_baseline(self, scenario_name: str) -> Dict[str, EnergyStatus]:
         """Load baseline energy states per region for a scenario."""
 
-        scenario_path = self.data_root / f"{scenario_name}.json"
-        with scenario_path.open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
-
         baseline: Dict[str, EnergyStatus] = {}
-        for region, stats in payload.get("baseline", {}).items():
+        for region, stats in self._payload(scenario_name).get("baseline", {}).items():
             baseline[region] = EnergyStatus(
                 demand_mw=float(stats["demand_mw"]),
                 generation_mw=float(stats["generation_mw"]),
@@ -74,7 +221,4 @@ class RegionalDataIngestor:
     def region_list(self, scenario_name: str) -> List[str]:
         """Return a list of regions represented in a scenario file."""
 
-        scenario_path = self.data_root / f"{scenario_name}.json"
-        with scenario_path.open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
-        return list(payload.get("baseline", {}).keys())
+        return list(self._payload(scenario_name).get("baseline", {}).keys())
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
 
 from .data_ingestion import EnergyStatus
 
@@ -14,52 +16,188 @@ class ForecastResult:
     confidence: float
 
 
-def _moving_average(values: Iterable[float]) -> float:
-    data = list(values)
-    if not data:
-        return 0.0
-    return sum(data) / len(data)
+@dataclass
+class BatchForecastResult:
+    """Forecasts for many regions, aligned with the ``regions`` passed in."""
+
+    demand_mw: np.ndarray
+    generation_mw: np.ndarray
+    confidence: np.ndarray
+
+
+class RollingHistory:
+    """Fixed-size history for many regions kept as a 2-D ring buffer.
+
+    Row ``r`` of ``values`` holds the last ``window`` observations of one
+    region; running sums make each update and moving average O(1) per region.
+    Reads mirror the ``Dict[str, List[float]]`` the forecasters used to keep:
+    ``history[region]``, ``history.get(region, [])``, ``region in history``
+    and iteration over the regions.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("History window must be at least 1")
+        self.window = window
+        self.rows: Dict[str, int] = {}
+        self.values = np.zeros((0, window))
+        self.sums = np.zeros(0)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.cursor = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_mapping(cls, window: int, history: Mapping[str, Sequence[float]]) -> "RollingHistory":
+        """Seed a buffer with each region's observations, oldest first."""
+
+        rolling = cls(window)
+        for region, values in history.items():
+            row = rolling.rows_for([region])
+            for value in list(values)[-window:]:
+                rolling.push(row, np.array([value], dtype=float))
+        return rolling
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, region: object) -> bool:
+        return region in self.rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __getitem__(self, region: str) -> List[float]:
+        if region not in self.rows:
+            raise KeyError(region)
+        return self.get(region)
+
+    def _grow(self, size: int) -> None:
+        capacity = max(size, 2 * len(self.values), 8)
+        extra = capacity - len(self.values)
+        self.values = np.vstack([self.values, np.zeros((extra, self.window))])
+        self.sums = np.concatenate([self.sums, np.zeros(extra)])
+        self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int64)])
+        self.cursor = np.concatenate([self.cursor, np.zeros(extra, dtype=np.int64)])
+
+    def rows_for(self, regions: Sequence[str]) -> np.ndarray:
+        """Return the buffer row of each region, allocating rows for new ones."""
+
+        rows = self.rows
+        for region in regions:
+            if region not in rows:
+                rows[region] = len(rows)
+        if len(rows) > len(self.values):
+            self._grow(len(rows))
+        return np.fromiter((rows[region] for region in regions), np.int64, len(regions))
+
+    def push(self, rows: np.ndarray, values: np.ndarray) -> None:
+        """Append one observation to each of the ``rows``, which must be distinct."""
+
+        if len(rows) > 1 and len(np.unique(rows)) != len(rows):
+            raise ValueError("Each region may appear only once per batch")
+        slots = self.cursor[rows]
+        evicted = np.where(self.counts[rows] >= self.window, self.values[rows, slots], 0.0)
+        self.values[rows, slots] = values
+        self.sums[rows] += values - evicted
+        self.counts[rows] = np.minimum(self.counts[rows] + 1, self.window)
+        self.cursor[rows] = (slots + 1) % self.window
+
+        # Re-derive sums once per lap so floating-point drift cannot accumulate.
+        wrapped = rows[self.cursor[rows] == 0]
+        if len(wrapped):
+            self.sums[wrapped] = self.values[wrapped].sum(axis=1)
+
+    def mean(self, rows: np.ndarray) -> np.ndarray:
+        counts = self.counts[rows]
+        return np.divide(self.sums[rows], counts, out=np.zeros(len(rows)), where=counts > 0)
+
+    def get(self, region: str, default: Optional[List[float]] = None) -> List[float]:
+        """Return a region's history, oldest first (``default`` or ``[]`` if unknown)."""
+
+        row = self.rows.get(region)
+        if row is None:
+            return [] if default is None else default
+        count = int(self.counts[row])
+        ordered = np.roll(self.values[row], -int(self.cursor[row]))
+        return ordered[self.window - count :].tolist()
 
 
 @dataclass
 class DemandForecaster:
-    """Forecasts demand based on recent history and disaster severity."""
+    """Forecasts demand based on recent history and disaster severity.
+
+    ``history`` may be seeded with a mapping of region to past demand.
+    """
 
     history_size: int = 4
     disaster_penalty: float = 0.15
-    history: Dict[str, List[float]] = field(default_factory=dict)
+    history: Union[RollingHistory, Mapping[str, Sequence[float]], None] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.history, RollingHistory):
+            self.history = RollingHistory.from_mapping(self.history_size, self.history or {})
 
     def update_history(self, region: str, demand: float) -> None:
-        self.history.setdefault(region, []).append(demand)
-        if len(self.history[region]) > self.history_size:
-            self.history[region] = self.history[region][-self.history_size :]
+        self.history.push(self.history.rows_for([region]), np.array([demand], dtype=float))
+
+    def forecast_batch(
+        self, regions: Sequence[str], demand: np.ndarray, severity: np.ndarray
+    ) -> BatchForecastResult:
+        """Record ``demand`` for each region and forecast all of them at once."""
+
+        rows = self.history.rows_for(regions)
+        self.history.push(rows, np.asarray(demand, dtype=float))
+        trend = self.history.mean(rows)
+        penalty = self.disaster_penalty * np.asarray(severity, dtype=float)
+        return BatchForecastResult(
+            demand_mw=trend * (1 + penalty),
+            generation_mw=np.zeros(len(rows)),
+            confidence=np.maximum(0.3, 1.0 - penalty),
+        )
 
     def forecast(self, region: str, current: EnergyStatus, severity: float) -> ForecastResult:
-        self.update_history(region, current.demand_mw)
-        trend = _moving_average(self.history.get(region, []))
-        adjustment = 1 + self.disaster_penalty * severity
-        forecast_value = trend * adjustment
-        confidence = max(0.3, 1.0 - self.disaster_penalty * severity)
-        return ForecastResult(demand_mw=forecast_value, generation_mw=0.0, confidence=confidence)
+        batch = self.forecast_batch([region], np.array([current.demand_mw]), np.array([severity]))
+        return ForecastResult(
+            demand_mw=float(batch.demand_mw[0]), generation_mw=0.0, confidence=float(batch.confidence[0])
+        )
 
 
 @dataclass
 class SupplyForecaster:
-    """Forecasts generation capacity including infrastructure impacts."""
+    """Forecasts generation capacity including infrastructure impacts.
+
+    ``history`` may be seeded with a mapping of region to past generation.
+    """
 
     history_size: int = 4
     impact_penalty: float = 0.2
-    history: Dict[str, List[float]] = field(default_factory=dict)
+    history: Union[RollingHistory, Mapping[str, Sequence[float]], None] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.history, RollingHistory):
+            self.history = RollingHistory.from_mapping(self.history_size, self.history or {})
 
     def update_history(self, region: str, generation: float) -> None:
-        self.history.setdefault(region, []).append(generation)
-        if len(self.history[region]) > self.history_size:
-            self.history[region] = self.history[region][-self.history_size :]
+        self.history.push(self.history.rows_for([region]), np.array([generation], dtype=float))
+
+    def forecast_batch(
+        self, regions: Sequence[str], generation: np.ndarray, infrastructure_impact: np.ndarray
+    ) -> BatchForecastResult:
+        """Record ``generation`` for each region and forecast all of them at once."""
+
+        rows = self.history.rows_for(regions)
+        self.history.push(rows, np.asarray(generation, dtype=float))
+        trend = self.history.mean(rows)
+        adjustment = np.maximum(0.0, 1 - self.impact_penalty * np.asarray(infrastructure_impact, dtype=float))
+        return BatchForecastResult(
+            demand_mw=np.zeros(len(rows)),
+            generation_mw=trend * adjustment,
+            confidence=np.maximum(0.2, adjustment),
+        )
 
     def forecast(self, region: str, current: EnergyStatus, infrastructure_impact: float) -> ForecastResult:
-        self.update_history(region, current.generation_mw)
-        trend = _moving_average(self.history.get(region, []))
-        adjustment = max(0.0, 1 - self.impact_penalty * infrastructure_impact)
-        forecast_value = trend * adjustment
-        confidence = max(0.2, adjustment)
-        return ForecastResult(demand_mw=0.0, generation_mw=forecast_value, confidence=confidence)
+        batch = self.forecast_batch(
+            [region], np.array([current.generation_mw]), np.array([infrastructure_impact])
+        )
+        return ForecastResult(
+            demand_mw=0.0, generation_mw=float(batch.generation_mw[0]), confidence=float(batch.confidence[0])
+        )
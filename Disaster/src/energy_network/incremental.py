@@ -0,0 +1,254 @@
+"""Event-driven orchestration that repairs the dispatch plan incrementally."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Union
+
+import numpy as np
+
+from .data_ingestion import DisasterEvent, EnergyStatus
+from .optimization import EnergyDispatchPlan, MultiHopDispatch
+from .orchestrator import CycleForecast, EnergyOrchestrator, RegionalSnapshot
+from .topology import ConnectionIndex
+
+
+@dataclass(slots=True)
+class EnergyStatusUpdate:
+    """New demand, generation and storage readings for one region."""
+
+    region: str
+    status: EnergyStatus
+
+
+RegionUpdate = Union[DisasterEvent, EnergyStatusUpdate]
+
+
+class IncrementalOrchestrator:
+    """Keeps a dispatch plan current as regional updates arrive.
+
+    :meth:`prime` runs one full cycle. Afterwards every update marks its region
+    dirty and :meth:`refresh` re-forecasts only the dirty regions, widens them
+    to their interconnection neighbourhood and re-solves dispatch for that
+    neighbourhood alone, keeping every other row of the plan. Exporters on the
+    edge of the neighbourhood only offer what their kept rows leave unused, so
+    the repaired plan stays feasible, though it may differ from a full
+    re-optimisation; call :meth:`prime` again to resynchronise.
+
+    Path-based solvers route power over links far from the change, so with
+    them the forecasts are still incremental but dispatch is re-solved
+    network-wide.
+    """
+
+    def __init__(self, orchestrator: EnergyOrchestrator) -> None:
+        self.orchestrator = orchestrator
+        self.snapshots: Dict[str, RegionalSnapshot] = {}
+        self.dirty: Set[str] = set()
+        self._index: Optional[ConnectionIndex] = None
+        self._importers_indptr = np.zeros(1, dtype=np.int64)
+        self._importers = np.zeros(0, dtype=np.int64)
+        self._demand = np.zeros(0)
+        self._supply = np.zeros(0)
+        self._confidence = np.zeros(0)
+        self._raw: Optional[EnergyDispatchPlan] = None
+        self._accepted = np.zeros(0, dtype=bool)
+
+    @property
+    def plan(self) -> EnergyDispatchPlan:
+        """The current plan, restricted to rows passing the confidence threshold."""
+
+        if self._raw is None:
+            return EnergyDispatchPlan()
+        return self._raw.select(self._accepted)
+
+    def _bind(self, index: ConnectionIndex) -> None:
+        """Size the per-region state for ``index`` and build its forward adjacency."""
+
+        self._index = index
+        order = np.argsort(index.neighbours, kind="stable")
+        self._importers = index.edge_targets[order]
+        self._importers_indptr = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(index.neighbours, minlength=len(index)), out=self._importers_indptr[1:])
+        self._demand = np.zeros(len(index))
+        self._supply = np.zeros(len(index))
+        self._confidence = np.ones(len(index))
+
+    def _store_forecast(self, snapshots: List[RegionalSnapshot]) -> np.ndarray:
+        names, demand, supply, confidence = self.orchestrator._forecast_batch(snapshots)
+        positions = self._index.positions
+        rows = np.fromiter((positions[name] for name in names), np.int64, len(names))
+        self._demand[rows] = demand
+        self._supply[rows] = supply
+        self._confidence[rows] = confidence
+        self.orchestrator.last_forecast = CycleForecast(
+            self._index.regions, self._demand, self._supply, self._confidence
+        )
+        return rows
+
+    def _accept(self, plan: EnergyDispatchPlan) -> np.ndarray:
+        pair_confidence = np.minimum(self._confidence[plan.source], self._confidence[plan.target])
+        return pair_confidence >= self.orchestrator.optimizer.params.ai_confidence_threshold
+
+    def prime(self, snapshots: Iterable[RegionalSnapshot]) -> EnergyDispatchPlan:
+        """Forecast and optimise the whole network from ``snapshots``."""
+
+        self.snapshots = {snapshot.config.name: snapshot for snapshot in snapshots}
+        self.dirty.clear()
+        self._bind(self.orchestrator.connection_index)
+        self._store_forecast(list(self.snapshots.values()))
+        self._optimise_all()
+        return self.plan
+
+    def _optimise_all(self) -> None:
+        regions = self._index.regions
+        positions = [self._index.positions[name] for name in self.snapshots]
+        plan = self.orchestrator.optimizer.optimise(
+            region_supply={regions[p]: float(self._supply[p]) for p in positions},
+            region_demand={regions[p]: float(self._demand[p]) for p in positions},
+            connections=self._index,
+        )
+        if list(plan.regions) != regions:
+            to_global = np.fromiter((self._index.positions[name] for name in plan.regions), np.int64)
+            plan = EnergyDispatchPlan.from_arrays(
+                regions, to_global[plan.source], to_global[plan.target], plan.transfer_mw, plan.loss_mw
+            )
+        self._raw = plan
+        self._accepted = self._accept(plan)
+
+    def apply(self, update: RegionUpdate) -> None:
+        """Record ``update`` and mark its region dirty; nothing is recomputed yet."""
+
+        snapshot = self.snapshots.get(update.region)
+        if snapshot is None:
+            raise KeyError(f"Unknown region {update.region!r}")
+        if isinstance(update, DisasterEvent):
+            snapshot = dataclasses.replace(snapshot, disaster_event=update)
+        else:
+            snapshot = dataclasses.replace(snapshot, energy_status=update.status)
+        self.snapshots[update.region] = snapshot
+        self.dirty.add(update.region)
+
+    def refresh(self) -> EnergyDispatchPlan:
+        """Bring the plan up to date with every update applied since the last call."""
+
+        if self._index is not self.orchestrator.connection_index:
+            return self.prime(list(self.snapshots.values()))
+        if not self.dirty:
+            return self.plan
+
+        dirty = self._store_forecast([self.snapshots[name] for name in self.dirty])
+        self.dirty.clear()
+        if isinstance(self.orchestrator.optimizer.solver, MultiHopDispatch):
+            self._optimise_all()
+        else:
+            self._repair(dirty)
+        return self.plan
+
+    def _repair(self, dirty: np.ndarray) -> None:
+        index, raw = self._index, self._raw
+        params = self.orchestrator.optimizer.params
+
+        # Neighbourhood: dirty regions plus everything they import from or export to.
+        zone = [dirty]
+        for position in dirty.tolist():
+            start, stop = index.indptr[position], index.indptr[position + 1]
+            zone.append(index.neighbours[start:stop])
+            start, stop = self._importers_indptr[position], self._importers_indptr[position + 1]
+            zone.append(self._importers[start:stop])
+        zone = np.unique(np.concatenate(zone))
+
+        # Importers whose supply came from the zone must be re-served as well;
+        # every row into a re-served importer is dropped and solved again.
+        importers = np.union1d(zone, raw.target[np.isin(raw.source, zone)])
+        kept = ~np.isin(raw.target, importers)
+
+        exporter_chunks = [importers]
+        for position in importers.tolist():
+            exporter_chunks.append(index.neighbours[index.indptr[position] : index.indptr[position + 1]])
+        exporters = np.setdiff1d(np.unique(np.concatenate(exporter_chunks)), importers)
+
+        # What boundary exporters already inject through kept rows.
+        boundary = kept & np.isin(raw.source, exporters)
+        committed, slots = np.unique(raw.source[boundary], return_inverse=True)
+        used = dict(
+            zip(committed.tolist(), np.bincount(slots, raw.transfer_mw[boundary] + raw.loss_mw[boundary]).tolist())
+        )
+
+        regions = index.regions
+        supply: Dict[str, float] = {}
+        demand: Dict[str, float] = {}
+        for position in importers.tolist():
+            supply[regions[position]] = float(self._supply[position])
+            demand[regions[position]] = float(self._demand[position])
+        margin = 1 + params.reserve_margin_fraction
+        for position in exporters.tolist():
+            region_supply = float(self._supply[position])
+            region_demand = float(self._demand[position])
+            committed_mw = used.get(position, 0.0)
+            if committed_mw > 0:
+                # Shrink the exporter's surplus by what it already committed,
+                # expressed through demand so every solver honours it.
+                budget = max(0.0, region_supply - region_demand * margin)
+                if self.orchestrator.optimizer.mode != "greedy":
+                    budget = min(budget, params.max_transfer_fraction * max(region_supply, 0.0))
+                region_demand = (region_supply - max(0.0, budget - committed_mw)) / margin
+            supply[regions[position]] = region_supply
+            demand[regions[position]] = region_demand
+
+        subnetwork = ConnectionIndex._from_edges(
+            (
+                (
+                    regions[importer],
+                    regions[int(index.neighbours[edge])],
+                    float(index.capacity_mw[edge]),
+                    float(index.loss_factor[edge]),
+                )
+                for importer in importers.tolist()
+                for edge in range(int(index.indptr[importer]), int(index.indptr[importer + 1]))
+            ),
+            known_regions=supply,
+        )
+        local = self.orchestrator.optimizer.optimise(supply, demand, subnetwork)
+        to_global = np.fromiter((index.positions[name] for name in local.regions), np.int64, len(local.regions))
+        repaired = EnergyDispatchPlan.from_arrays(
+            index.regions, to_global[local.source], to_global[local.target], local.transfer_mw, local.loss_mw
+        )
+
+        self._raw = EnergyDispatchPlan.from_arrays(
+            index.regions,
+            np.concatenate([raw.source[kept], repaired.source]),
+            np.concatenate([raw.target[kept], repaired.target]),
+            np.concatenate([raw.transfer_mw[kept], repaired.transfer_mw]),
+            np.concatenate([raw.loss_mw[kept], repaired.loss_mw]),
+        )
+        self._accepted = np.concatenate([self._accepted[kept], self._accept(repaired)])
+
+    async def consume(
+        self, queue: "asyncio.Queue[Optional[RegionUpdate]]"
+    ) -> AsyncIterator[EnergyDispatchPlan]:
+        """Apply updates from ``queue`` and yield the repaired plan after each batch.
+
+        Updates already waiting in the queue are coalesced into one refresh.
+        A ``None`` item ends the stream.
+        """
+
+        while True:
+            updates = [await queue.get()]
+            while not queue.empty():
+                updates.append(queue.get_nowait())
+            stop = False
+            try:
+                for update in updates:
+                    if update is None:
+                        stop = True
+                    else:
+                        self.apply(update)
+                plan = self.refresh() if self.dirty else None
+            finally:
+                for _ in updates:
+                    queue.task_done()
+            if plan is not None:
+                yield plan
+            if stop:
+                return
@@ -0,0 +1,273 @@
+"""Monte Carlo disaster sweeps over the energy sharing network."""
+from __future__ import annotations
+
+import dataclasses
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set
+
+import numpy as np
+
+from .config import OptimizationParameters, RegionConfig
+from .optimization import EnergyAllocationOptimizer, EnergyDispatchPlan
+from .orchestrator import EnergyOrchestrator, RegionalSnapshot
+from .simulation import SimulationRunner
+from .topology import ConnectionIndex
+
+PERCENTILES = (50, 90, 95, 99)
+
+# A link counts as saturated once it carries this share of its usable limit.
+SATURATION_THRESHOLD = 0.999
+
+
+@dataclass
+class PerturbationSpec:
+    """How each Monte Carlo sample perturbs the baseline scenario.
+
+    Severity and infrastructure impact receive additive Gaussian noise and are
+    clipped to ``[0, 1]``; every interconnection capacity is derated by a
+    uniform factor in ``[1 - capacity_derating, 1]``.
+    """
+
+    severity_sigma: float = 0.15
+    impact_sigma: float = 0.1
+    capacity_derating: float = 0.3
+
+
+@dataclass
+class SweepStatistics:
+    """Aggregated outcome of a Monte Carlo sweep."""
+
+    samples: int
+    unserved_mw: Dict[str, float]
+    transferred_mw: Dict[str, float]
+    mean_losses_mw: float
+    link_saturation: Dict[str, float]
+
+    def to_dict(self) -> Dict[str, object]:
+        return dataclasses.asdict(self)
+
+
+@dataclass
+class _SweepAccumulator:
+    """Mergeable partial result; keeps one float per sample, never whole plans."""
+
+    edge_count: int
+    unserved: List[np.ndarray] = field(default_factory=list)
+    transferred: List[np.ndarray] = field(default_factory=list)
+    losses: float = 0.0
+    saturated: np.ndarray | None = None
+
+    def __post_init__(self) -> None:
+        if self.saturated is None:
+            self.saturated = np.zeros(self.edge_count, dtype=np.int64)
+
+    @property
+    def samples(self) -> int:
+        return sum(len(chunk) for chunk in self.unserved)
+
+    def merge(self, other: "_SweepAccumulator") -> None:
+        self.unserved.extend(other.unserved)
+        self.transferred.extend(other.transferred)
+        self.losses += other.losses
+        self.saturated += other.saturated
+
+
+@dataclass
+class _ChunkTask:
+    data_root: Path
+    scenario: str
+    region_configs: List[RegionConfig]
+    params: OptimizationParameters
+    mode: str
+    perturbation: PerturbationSpec
+    seed: np.random.SeedSequence
+    samples: int
+
+
+def _summarise(values: np.ndarray) -> Dict[str, float]:
+    if not len(values):
+        return {"mean": 0.0, **{f"p{q}": 0.0 for q in PERCENTILES}}
+    quantiles = np.percentile(values, PERCENTILES)
+    return {"mean": float(values.mean()), **{f"p{q}": float(v) for q, v in zip(PERCENTILES, quantiles)}}
+
+
+def _perturbed_configs(
+    configs: List[RegionConfig], rng: np.random.Generator, derating: float
+) -> Dict[str, RegionConfig]:
+    perturbed: Dict[str, RegionConfig] = {}
+    for config in configs:
+        factors = rng.uniform(1 - derating, 1.0, size=len(config.grid_connections))
+        perturbed[config.name] = dataclasses.replace(
+            config,
+            grid_connections=[
+                dataclasses.replace(connection, capacity_mw=connection.capacity_mw * factor)
+                for connection, factor in zip(config.grid_connections, factors)
+            ],
+        )
+    return perturbed
+
+
+def _perturbed_snapshots(
+    baseline: List[RegionalSnapshot],
+    configs: Dict[str, RegionConfig],
+    rng: np.random.Generator,
+    spec: PerturbationSpec,
+) -> List[RegionalSnapshot]:
+    severity = rng.normal(0.0, spec.severity_sigma, size=len(baseline))
+    impact = rng.normal(0.0, spec.impact_sigma, size=len(baseline))
+    snapshots = []
+    for snapshot, severity_noise, impact_noise in zip(baseline, severity, impact):
+        event = snapshot.disaster_event
+        snapshots.append(
+            RegionalSnapshot(
+                config=configs[snapshot.config.name],
+                energy_status=dataclasses.replace(snapshot.energy_status),
+                disaster_event=dataclasses.replace(
+                    event,
+                    severity=float(np.clip(event.severity + severity_noise, 0.0, 1.0)),
+                    infrastructure_impact=float(
+                        np.clip(event.infrastructure_impact + impact_noise, 0.0, 1.0)
+                    ),
+                ),
+            )
+        )
+    return snapshots
+
+
+def _link_names(index: ConnectionIndex) -> List[str]:
+    """``"source->target"`` per edge; parallel links get a ``#2``, ``#3``... suffix."""
+
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for source, target in zip(index.neighbours.tolist(), index.edge_targets.tolist()):
+        name = f"{index.regions[source]}->{index.regions[target]}"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return names
+
+
+def _unserved_mw(orchestrator: EnergyOrchestrator, plan: EnergyDispatchPlan) -> float:
+    forecast = orchestrator.last_forecast
+    received = dict(
+        zip(plan.regions, np.bincount(plan.target, plan.transfer_mw, len(plan.regions)).tolist())
+    )
+    delivered = np.fromiter((received.get(region, 0.0) for region in forecast.regions), float)
+    deficit = np.maximum(0.0, forecast.demand_mw - forecast.supply_mw)
+    return float(np.maximum(0.0, deficit - delivered).sum())
+
+
+def _run_chunk(task: _ChunkTask) -> _SweepAccumulator:
+    """Evaluate ``task.samples`` perturbed scenarios and reduce them on the spot."""
+
+    runner = SimulationRunner(task.data_root, task.region_configs, task.params)
+    baseline = runner.initial_snapshots(task.scenario)
+    edge_count = ConnectionIndex.from_region_configs(task.region_configs).edge_count
+
+    rng = np.random.default_rng(task.seed)
+    accumulator = _SweepAccumulator(edge_count=edge_count)
+    unserved = np.zeros(task.samples)
+    transferred = np.zeros(task.samples)
+    for sample in range(task.samples):
+        configs = _perturbed_configs(task.region_configs, rng, task.perturbation.capacity_derating)
+        snapshots = _perturbed_snapshots(baseline, configs, rng, task.perturbation)
+        orchestrator = EnergyOrchestrator(configs, EnergyAllocationOptimizer(task.params, mode=task.mode))
+        plan = orchestrator.run_cycle(snapshots)
+
+        # Perturbation only derates capacities, so every sample's index has
+        # the baseline's edges in the baseline's order.
+        index = orchestrator.connection_index
+        limits = np.minimum(index.capacity_mw, task.params.ramp_limit_mw)
+        flows = plan.link_flow_mw(index)
+        accumulator.saturated += (flows > 0) & (flows >= SATURATION_THRESHOLD * limits)
+        unserved[sample] = _unserved_mw(orchestrator, plan)
+        transferred[sample] = plan.total_transferred
+        accumulator.losses += plan.total_losses
+
+    accumulator.unserved.append(unserved)
+    accumulator.transferred.append(transferred)
+    return accumulator
+
+
+class MonteCarloSweep:
+    """Runs many perturbed single-cycle simulations and aggregates their risk.
+
+    Samples are split into fixed-size chunks, each with its own child
+    ``SeedSequence``, so results are reproducible for a given ``seed`` and
+    ``chunk_size`` regardless of how many worker processes are used.
+    """
+
+    def __init__(
+        self,
+        runner: SimulationRunner,
+        perturbation: PerturbationSpec | None = None,
+        mode: str = "greedy",
+    ) -> None:
+        self.runner = runner
+        self.perturbation = perturbation or PerturbationSpec()
+        self.mode = mode
+
+    def _tasks(self, scenario: str, samples: int, seed: int, chunk_size: int) -> List[_ChunkTask]:
+        sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        configs = list(self.runner.region_configs.values())
+        return [
+            _ChunkTask(
+                data_root=self.runner.ingestor.data_root,
+                scenario=scenario,
+                region_configs=configs,
+                params=self.runner.optimization_params,
+                mode=self.mode,
+                perturbation=self.perturbation,
+                seed=child,
+                samples=size,
+            )
+            for child, size in zip(seeds, sizes)
+        ]
+
+    def run(
+        self,
+        scenario: str,
+        samples: int,
+        seed: int = 0,
+        workers: int | None = None,
+        chunk_size: int = 64,
+    ) -> SweepStatistics:
+        """Execute ``samples`` perturbed runs of ``scenario``.
+
+        ``workers`` defaults to the CPU count; ``workers=1`` runs in-process.
+        At most two chunks per worker are in flight, so memory stays flat.
+        """
+
+        tasks = self._tasks(scenario, samples, seed, chunk_size)
+        index = ConnectionIndex.from_region_configs(self.runner.region_configs.values())
+        total = _SweepAccumulator(edge_count=index.edge_count)
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for task in tasks:
+                total.merge(_run_chunk(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending: Set[Future] = set()
+                queued = iter(tasks)
+                for task in queued:
+                    pending.add(executor.submit(_run_chunk, task))
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            total.merge(future.result())
+                for future in pending:
+                    total.merge(future.result())
+
+        count = total.samples
+        saturation = total.saturated / count if count else total.saturated.astype(float)
+        return SweepStatistics(
+            samples=count,
+            unserved_mw=_summarise(np.concatenate(total.unserved) if total.unserved else np.zeros(0)),
+            transferred_mw=_summarise(np.concatenate(total.transferred) if total.transferred else np.zeros(0)),
+            mean_losses_mw=total.losses / count if count else 0.0,
+            link_saturation=dict(zip(_link_names(index), saturation.tolist())),
+        )
@@ -1,91 +1,512 @@
 """Energy allocation heuristics for the orchestration layer."""
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
 
 from .config import GridConnection, OptimizationParameters
+from .network_flow import TRANSFER_TOLERANCE_MW, build_transfer_graph, solve_lp_dispatch
+from .routing import LossAwareRouter
+from .topology import ConnectionIndex
 
 
-@dataclass
+@dataclass(slots=True)
 class EnergyDispatch:
-    """Represents a single transfer between two regions."""
+    """Represents a single transfer between two regions.
+
+    ``path`` lists every region the power crosses, source and target
+    included; ``loss_mw`` is the cumulative loss along it.
+    """
 
     source: str
     target: str
     transfer_mw: float
     loss_mw: float
+    path: Tuple[str, ...] = ()
 
 
-@dataclass
 class EnergyDispatchPlan:
-    """Aggregated dispatch plan for a network cycle."""
+    """Aggregated dispatch plan for a network cycle, stored column-wise.
 
-    dispatches: List[EnergyDispatch]
+    Row ``i`` moves ``transfer_mw[i]`` (after ``loss_mw[i]`` of losses) from
+    ``regions[source[i]]`` to ``regions[target[i]]``. Multi-hop plans also
+    carry ``path_nodes[path_offsets[i]:path_offsets[i + 1]]``; without them
+    every row is a direct transfer. Solvers also record ``edges``, the
+    :class:`ConnectionIndex` edge of every hop in row order, so parallel links
+    between two regions stay apart; plans built from rows leave it ``None``.
+    Totals are computed once at construction; ``dispatches`` materialises row
+    objects on first access.
+    """
 
-    @property
-    def total_transferred(self) -> float:
-        return sum(dispatch.transfer_mw for dispatch in self.dispatches)
+    __slots__ = (
+        "regions",
+        "source",
+        "target",
+        "transfer_mw",
+        "loss_mw",
+        "path_offsets",
+        "path_nodes",
+        "edges",
+        "total_transferred",
+        "total_losses",
+        "_dispatches",
+    )
+
+    def __init__(self, dispatches: Iterable[EnergyDispatch] = ()) -> None:
+        rows = list(dispatches)
+        positions: Dict[str, int] = {}
+        for dispatch in rows:
+            for region in (dispatch.source, *dispatch.path, dispatch.target):
+                positions.setdefault(region, len(positions))
+        path_offsets = path_nodes = None
+        if any(len(dispatch.path) > 2 for dispatch in rows):
+            paths = [dispatch.path or (dispatch.source, dispatch.target) for dispatch in rows]
+            path_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(path) for path in paths], out=path_offsets[1:])
+            path_nodes = np.fromiter(
+                (positions[region] for path in paths for region in path), np.int64, int(path_offsets[-1])
+            )
+        self._assign(
+            list(positions),
+            np.fromiter((positions[d.source] for d in rows), np.int64, len(rows)),
+            np.fromiter((positions[d.target] for d in rows), np.int64, len(rows)),
+            np.fromiter((d.transfer_mw for d in rows), float, len(rows)),
+            np.fromiter((d.loss_mw for d in rows), float, len(rows)),
+            path_offsets,
+            path_nodes,
+            None,
+        )
+        self._dispatches = rows
+
+    @classmethod
+    def from_arrays(
+        cls,
+        regions: Sequence[str],
+        source: np.ndarray,
+        target: np.ndarray,
+        transfer_mw: np.ndarray,
+        loss_mw: np.ndarray,
+        path_offsets: Optional[np.ndarray] = None,
+        path_nodes: Optional[np.ndarray] = None,
+        edges: Optional[np.ndarray] = None,
+    ) -> "EnergyDispatchPlan":
+        """Wrap existing columns without copying them."""
+
+        plan = cls.__new__(cls)
+        plan._assign(regions, source, target, transfer_mw, loss_mw, path_offsets, path_nodes, edges)
+        return plan
+
+    def _assign(
+        self,
+        regions: Sequence[str],
+        source: np.ndarray,
+        target: np.ndarray,
+        transfer_mw: np.ndarray,
+        loss_mw: np.ndarray,
+        path_offsets: Optional[np.ndarray],
+        path_nodes: Optional[np.ndarray],
+        edges: Optional[np.ndarray],
+    ) -> None:
+        self.regions = regions
+        self.source = np.asarray(source, dtype=np.int64)
+        self.target = np.asarray(target, dtype=np.int64)
+        self.transfer_mw = np.asarray(transfer_mw, dtype=float)
+        self.loss_mw = np.asarray(loss_mw, dtype=float)
+        self.path_offsets = path_offsets
+        self.path_nodes = path_nodes
+        self.edges = None if edges is None else np.asarray(edges, dtype=np.int64)
+        self.total_transferred = float(self.transfer_mw.sum())
+        self.total_losses = float(self.loss_mw.sum())
+        self._dispatches = None
+
+    def __len__(self) -> int:
+        return len(self.transfer_mw)
+
+    def _hop_counts(self) -> np.ndarray:
+        if self.path_offsets is None:
+            return np.ones(len(self), dtype=np.int64)
+        return np.diff(self.path_offsets) - 1
+
+    def link_flow_mw(self, index: ConnectionIndex) -> np.ndarray:
+        """MW entering every edge of ``index``, the index the plan was solved on.
+
+        A hop carries its row's injection less the losses of the hops before it.
+        """
+
+        if self.edges is None:
+            raise ValueError("This plan does not record the links it uses")
+        hops = self._hop_counts()
+        flow = np.repeat(self.transfer_mw + self.loss_mw, hops)
+        if self.path_offsets is not None and len(flow):
+            # Position of every hop within its row; walk the rows hop by hop.
+            depth = np.arange(len(flow)) - np.repeat(np.cumsum(hops) - hops, hops)
+            efficiency = 1 - index.loss_factor[self.edges]
+            for level in range(1, int(depth.max()) + 1):
+                at = np.flatnonzero(depth == level)
+                flow[at] = flow[at - 1] * efficiency[at - 1]
+        return np.bincount(self.edges, weights=flow, minlength=index.edge_count)
+
+    def paths(self) -> List[Tuple[str, ...]]:
+        """Region sequence of every dispatch, source first."""
+
+        regions = self.regions
+        if self.path_offsets is None:
+            return [
+                (regions[source], regions[target])
+                for source, target in zip(self.source.tolist(), self.target.tolist())
+            ]
+        nodes = [regions[node] for node in self.path_nodes.tolist()]
+        bounds = self.path_offsets.tolist()
+        return [tuple(nodes[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])]
 
     @property
-    def total_losses(self) -> float:
-        return sum(dispatch.loss_mw for dispatch in self.dispatches)
+    def dispatches(self) -> List[EnergyDispatch]:
+        if self._dispatches is None:
+            regions = self.regions
+            self._dispatches = [
+                EnergyDispatch(
+                    source=regions[source],
+                    target=regions[target],
+                    transfer_mw=transfer,
+                    loss_mw=loss,
+                    path=path,
+                )
+                for source, target, transfer, loss, path in zip(
+                    self.source.tolist(),
+                    self.target.tolist(),
+                    self.transfer_mw.tolist(),
+                    self.loss_mw.tolist(),
+                    self.paths(),
+                )
+            ]
+        return self._dispatches
 
+    def select(self, mask: np.ndarray) -> "EnergyDispatchPlan":
+        """Return the plan restricted to the rows where ``mask`` is true."""
 
-class EnergyAllocationOptimizer:
-    """Optimises energy transfers using a deterministic heuristic."""
+        path_offsets = path_nodes = None
+        if self.path_offsets is not None:
+            lengths = np.diff(self.path_offsets)
+            path_nodes = self.path_nodes[np.repeat(mask, lengths)]
+            path_offsets = np.zeros(int(np.count_nonzero(mask)) + 1, dtype=np.int64)
+            np.cumsum(lengths[mask], out=path_offsets[1:])
+        edges = None if self.edges is None else self.edges[np.repeat(mask, self._hop_counts())]
+        return EnergyDispatchPlan.from_arrays(
+            self.regions,
+            self.source[mask],
+            self.target[mask],
+            self.transfer_mw[mask],
+            self.loss_mw[mask],
+            path_offsets,
+            path_nodes,
+            edges,
+        )
 
-    def __init__(self, params: OptimizationParameters) -> None:
-        self.params = params
+    def net_import_mw(self) -> np.ndarray:
+        """Received minus injected MW per entry of ``regions``."""
 
-    def optimise(
+        size = len(self.regions)
+        received = np.bincount(self.target, weights=self.transfer_mw, minlength=size)
+        injected = np.bincount(self.source, weights=self.transfer_mw + self.loss_mw, minlength=size)
+        return received - injected
+
+    def to_records(self) -> List[Dict[str, object]]:
+        """Row-oriented export: one dict per dispatch."""
+
+        return [
+            {
+                "source": path[0],
+                "target": path[-1],
+                "transfer_mw": transfer,
+                "loss_mw": loss,
+                "path": list(path),
+            }
+            for path, transfer, loss in zip(self.paths(), self.transfer_mw.tolist(), self.loss_mw.tolist())
+        ]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Column-oriented export; arrays are returned as-is, not copied."""
+
+        payload: Dict[str, object] = {
+            "regions": list(self.regions),
+            "source": self.source,
+            "target": self.target,
+            "transfer_mw": self.transfer_mw,
+            "loss_mw": self.loss_mw,
+            "total_transferred": self.total_transferred,
+            "total_losses": self.total_losses,
+        }
+        if self.path_offsets is not None:
+            payload["path_offsets"] = self.path_offsets
+            payload["path_nodes"] = self.path_nodes
+        return payload
+
+    def to_json(self) -> bytes:
+        """Serialise the columnar form; uses orjson's native NumPy support when installed."""
+
+        try:
+            import orjson
+        except ImportError:
+            payload = {
+                key: value.tolist() if isinstance(value, np.ndarray) else value
+                for key, value in self.to_dict().items()
+            }
+            return json.dumps(payload).encode("utf-8")
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def to_arrow(self):
+        """Return a ``pyarrow.Table``; numeric columns share memory with the plan.
+
+        Region names are dictionary-encoded against ``regions``. Requires the
+        optional ``pyarrow`` dependency.
+        """
+
+        try:
+            import pyarrow as pa
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ImportError("EnergyDispatchPlan.to_arrow() requires pyarrow") from exc
+
+        dictionary = pa.array(list(self.regions), type=pa.string())
+        columns = {
+            "source": pa.DictionaryArray.from_arrays(pa.array(self.source), dictionary),
+            "target": pa.DictionaryArray.from_arrays(pa.array(self.target), dictionary),
+            "transfer_mw": pa.array(self.transfer_mw),
+            "loss_mw": pa.array(self.loss_mw),
+        }
+        if self.path_offsets is not None:
+            columns["path"] = pa.ListArray.from_arrays(
+                pa.array(self.path_offsets.astype(np.int32)),
+                pa.DictionaryArray.from_arrays(pa.array(self.path_nodes), dictionary),
+            )
+        return pa.table(columns)
+
+
+ConnectionMap = Dict[str, Iterable[GridConnection]]
+DispatchSolver = Callable[
+    [OptimizationParameters, Dict[str, float], Dict[str, float], ConnectionIndex],
+    EnergyDispatchPlan,
+]
+
+
+def _greedy_dispatch(
+    params: OptimizationParameters,
+    region_supply: Dict[str, float],
+    region_demand: Dict[str, float],
+    index: ConnectionIndex,
+) -> EnergyDispatchPlan:
+    """Serve the largest deficits first from directly connected surpluses."""
+
+    sources: List[int] = []
+    targets: List[int] = []
+    transfers: List[float] = []
+    losses: List[float] = []
+    edges: List[int] = []
+    surplus_regions = {}
+    for region, supply in region_supply.items():
+        demand = region_demand.get(region, 0.0)
+        surplus_regions[region] = max(
+            0.0, supply - demand * (1 + params.reserve_margin_fraction)
+        )
+
+    deficits = {
+        region: max(0.0, demand - region_supply.get(region, 0.0))
+        for region, demand in region_demand.items()
+    }
+
+    for target, deficit in sorted(deficits.items(), key=lambda item: item[1], reverse=True):
+        if deficit <= 0:
+            continue
+        start, stop = index.span(target)
+        for edge in range(start, stop):
+            source_position = int(index.neighbours[edge])
+            source = index.regions[source_position]
+            available = surplus_regions.get(source, 0.0)
+            if available <= 0:
+                continue
+            max_transfer = min(
+                available,
+                params.max_transfer_fraction * region_supply.get(source, 0.0),
+                deficit,
+                params.ramp_limit_mw,
+                float(index.capacity_mw[edge]),
+            )
+            if max_transfer <= 0:
+                continue
+            effective_transfer = max_transfer * (1 - float(index.loss_factor[edge]))
+            sources.append(source_position)
+            targets.append(index.positions[target])
+            transfers.append(effective_transfer)
+            losses.append(max_transfer - effective_transfer)
+            edges.append(edge)
+            surplus_regions[source] = max(0.0, available - max_transfer)
+            deficit = max(0.0, deficit - effective_transfer)
+            if deficit <= 0:
+                break
+    return EnergyDispatchPlan.from_arrays(
+        index.regions,
+        np.asarray(sources, dtype=np.int64),
+        np.asarray(targets, dtype=np.int64),
+        np.asarray(transfers, dtype=float),
+        np.asarray(losses, dtype=float),
+        edges=np.asarray(edges, dtype=np.int64),
+    )
+
+
+def _lp_dispatch(
+    params: OptimizationParameters,
+    region_supply: Dict[str, float],
+    region_demand: Dict[str, float],
+    index: ConnectionIndex,
+) -> EnergyDispatchPlan:
+    """Solve dispatch for the whole network as a single sparse LP."""
+
+    graph = build_transfer_graph(region_supply, region_demand, index)
+    flows = solve_lp_dispatch(graph, params)
+
+    edges = flows.nonzero()[0]
+    injected = flows[edges]
+    delivered = injected * (1 - graph.loss_factor[edges])
+    return EnergyDispatchPlan.from_arrays(
+        graph.regions,
+        graph.edge_source[edges],
+        graph.edge_target[edges],
+        delivered,
+        injected - delivered,
+        edges=edges,
+    )
+
+
+class MultiHopDispatch:
+    """Serve deficits along loss-compounded shortest paths, not just direct links.
+
+    Largest deficits are served first, each from its most efficient reachable
+    exporters. Route trees come from a :class:`LossAwareRouter` and are reused
+    across cycles until the topology version changes; link capacity (capped by
+    ``ramp_limit_mw``) is shared by every path crossing it. The router cache
+    is per instance, so ``SOLVERS`` registers the class and every optimiser
+    gets its own dispatcher.
+    """
+
+    def __init__(self, router: Optional[LossAwareRouter] = None) -> None:
+        self.router = router or LossAwareRouter()
+
+    def __call__(
         self,
+        params: OptimizationParameters,
         region_supply: Dict[str, float],
         region_demand: Dict[str, float],
-        connections: Dict[str, Iterable[GridConnection]],
+        index: ConnectionIndex,
     ) -> EnergyDispatchPlan:
-        """Compute a dispatch plan balancing demand deficits."""
-
-        dispatches: List[EnergyDispatch] = []
-        surplus_regions = {}
-        for region, supply in region_supply.items():
-            demand = region_demand.get(region, 0.0)
-            surplus_regions[region] = max(
-                0.0, supply - demand * (1 + self.params.reserve_margin_fraction)
-            )
+        graph = build_transfer_graph(region_supply, region_demand, index)
+        surplus = np.maximum(0.0, graph.supply - graph.demand * (1 + params.reserve_margin_fraction))
+        export_budget = np.minimum(surplus, params.max_transfer_fraction * np.maximum(graph.supply, 0.0))
+        deficits = np.maximum(0.0, graph.demand - graph.supply)
+        residual = np.minimum(index.capacity_mw, params.ramp_limit_mw)
+        efficiency = 1 - index.loss_factor
 
-        deficits = {
-            region: max(0.0, demand - region_supply.get(region, 0.0))
-            for region, demand in region_demand.items()
-        }
+        sources: List[int] = []
+        targets: List[int] = []
+        transfers: List[float] = []
+        losses: List[float] = []
+        path_nodes: List[int] = []
+        path_offsets: List[int] = [0]
+        path_edges: List[int] = []
 
-        for target, deficit in sorted(deficits.items(), key=lambda item: item[1], reverse=True):
+        for target in np.argsort(-deficits, kind="stable").tolist():
+            deficit = float(deficits[target])
             if deficit <= 0:
-                continue
-            for connection in connections.get(target, []):
-                available = surplus_regions.get(connection.target_region, 0.0)
-                if available <= 0:
-                    continue
-                max_transfer = min(
-                    available,
-                    self.params.max_transfer_fraction * region_supply.get(connection.target_region, 0.0),
-                    deficit,
-                    self.params.ramp_limit_mw,
-                    connection.capacity_mw,
+                break
+            tree = self.router.routes_to(index, target)
+            candidates = tree.sources[export_budget[tree.sources] > 0]
+            for source in candidates.tolist():
+                regions, edges = tree.path(source)
+                # Power reaching each hop is the injection times the product of
+                # upstream efficiencies, so a hop's residual caps the injection.
+                reach = np.cumprod(np.concatenate([[1.0], efficiency[edges]]))
+                injected = min(
+                    float(export_budget[source]),
+                    deficit / reach[-1],
+                    float(np.min(residual[edges] / reach[:-1])),
                 )
-                if max_transfer <= 0:
+                if injected <= TRANSFER_TOLERANCE_MW:
                     continue
-                effective_transfer = max_transfer * (1 - connection.loss_factor)
-                dispatches.append(
-                    EnergyDispatch(
-                        source=connection.target_region,
-                        target=target,
-                        transfer_mw=effective_transfer,
-                        loss_mw=max_transfer - effective_transfer,
-                    )
-                )
-                surplus_regions[connection.target_region] = max(0.0, available - max_transfer)
-                deficit = max(0.0, deficit - effective_transfer)
-                if deficit <= 0:
+                residual[edges] -= injected * reach[:-1]
+                delivered = injected * float(reach[-1])
+                export_budget[source] -= injected
+                deficit -= delivered
+
+                sources.append(source)
+                targets.append(target)
+                transfers.append(delivered)
+                losses.append(injected - delivered)
+                path_nodes.extend(regions)
+                path_offsets.append(len(path_nodes))
+                path_edges.extend(edges)
+                if deficit <= TRANSFER_TOLERANCE_MW:
                     break
-        return EnergyDispatchPlan(dispatches=dispatches)
+
+        return EnergyDispatchPlan.from_arrays(
+            index.regions,
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(transfers, dtype=float),
+            np.asarray(losses, dtype=float),
+            np.asarray(path_offsets, dtype=np.int64),
+            np.asarray(path_nodes, dtype=np.int64),
+            np.asarray(path_edges, dtype=np.int64),
+        )
+
+
+SOLVERS: Dict[str, Union[DispatchSolver, Type[DispatchSolver]]] = {
+    "greedy": _greedy_dispatch,
+    "lp": _lp_dispatch,
+    "multihop": MultiHopDispatch,
+}
+
+
+def register_solver(mode: str, solver: Union[DispatchSolver, Type[DispatchSolver]]) -> None:
+    """Make ``solver`` available as ``EnergyAllocationOptimizer(mode=...)``.
+
+    Register stateful solvers as a class: each optimiser then instantiates
+    its own, so caches are neither shared across threads nor invalidated by
+    unrelated topologies.
+    """
+
+    SOLVERS[mode] = solver
+
+
+class EnergyAllocationOptimizer:
+    """Optimises energy transfers between regions.
+
+    ``mode`` selects the solver backend: ``"greedy"`` is the original
+    deficit-first heuristic over direct links, ``"lp"`` solves all regions at
+    once as a sparse linear programme and ``"multihop"`` routes power over
+    cached loss-aware shortest paths.
+    """
+
+    def __init__(self, params: OptimizationParameters, mode: str = "greedy") -> None:
+        if mode not in SOLVERS:
+            raise ValueError(f"Unknown optimisation mode {mode!r}; expected one of {sorted(SOLVERS)}")
+        self.params = params
+        self.mode = mode
+        solver = SOLVERS[mode]
+        self.solver: DispatchSolver = solver() if isinstance(solver, type) else solver
+
+    def optimise(
+        self,
+        region_supply: Dict[str, float],
+        region_demand: Dict[str, float],
+        connections: Union[ConnectionIndex, ConnectionMap],
+    ) -> EnergyDispatchPlan:
+        """Compute a dispatch plan balancing demand deficits.
+
+        ``connections`` is either a prebuilt :class:`ConnectionIndex` or a map
+        from each importing region to the connections that can supply it.
+        """
+
+        if not isinstance(connections, ConnectionIndex):
+            connections = ConnectionIndex.from_connection_map(connections)
+        return self.solver(self.params, region_supply, region_demand, connections)
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Tuple
 
-from .config import GridConnection, RegionConfig
+import numpy as np
+
+from .config import RegionConfig
 from .data_ingestion import DisasterEvent, EnergyStatus
 from .forecasting import DemandForecaster, SupplyForecaster
 from .optimization import EnergyAllocationOptimizer, EnergyDispatchPlan
+from .topology import ConnectionIndex
 
 
 @dataclass
@@ -19,6 +22,16 @@ class RegionalSnapshot:
     disaster_event: DisasterEvent
 
 
+@dataclass
+class CycleForecast:
+    """Per-region forecasts used by the most recent orchestration cycle."""
+
+    regions: List[str]
+    demand_mw: np.ndarray
+    supply_mw: np.ndarray
+    confidence: np.ndarray
+
+
 class EnergyOrchestrator:
     """Coordinates forecasting and optimisation for the energy network."""
 
@@ -29,77 +42,79 @@ class EnergyOrchestrator:
         demand_forecaster: DemandForecaster | None = None,
         supply_forecaster: SupplyForecaster | None = None,
     ) -> None:
+        self._connection_index: ConnectionIndex | None = None
         self.region_configs = region_configs
         self.optimizer = optimizer
         self.demand_forecaster = demand_forecaster or DemandForecaster()
         self.supply_forecaster = supply_forecaster or SupplyForecaster()
-
-    def _forecast_region(self, snapshot: RegionalSnapshot) -> Tuple[float, float, float]:
-        """Return demand, supply and combined confidence."""
-
-        demand_forecast = self.demand_forecaster.forecast(
-            snapshot.config.name, snapshot.energy_status, snapshot.disaster_event.severity
-        )
-        supply_forecast = self.supply_forecaster.forecast(
-            snapshot.config.name,
-            snapshot.energy_status,
-            snapshot.disaster_event.infrastructure_impact,
-        )
-        combined_confidence = min(demand_forecast.confidence, supply_forecast.confidence)
-        forecast_supply = (
-            supply_forecast.generation_mw if supply_forecast.generation_mw > 0 else snapshot.energy_status.generation_mw
+        self.last_forecast: CycleForecast | None = None
+
+    @property
+    def region_configs(self) -> Dict[str, RegionConfig]:
+        return self._region_configs
+
+    @region_configs.setter
+    def region_configs(self, region_configs: Dict[str, RegionConfig]) -> None:
+        self._region_configs = region_configs
+        self.invalidate_connections()
+
+    def invalidate_connections(self) -> None:
+        """Drop the cached connection index after editing configs in place."""
+
+        self._connection_index = None
+
+    @property
+    def connection_index(self) -> ConnectionIndex:
+        """Reversed adjacency of ``region_configs``, built once per topology."""
+
+        if self._connection_index is None:
+            self._connection_index = ConnectionIndex.from_region_configs(self._region_configs.values())
+        return self._connection_index
+
+    def _forecast_batch(
+        self, snapshots: List[RegionalSnapshot]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Return region names with forecast demand, supply and combined confidence."""
+
+        names = [snapshot.config.name for snapshot in snapshots]
+        count = len(snapshots)
+        demand = np.fromiter((s.energy_status.demand_mw for s in snapshots), float, count)
+        generation = np.fromiter((s.energy_status.generation_mw for s in snapshots), float, count)
+        stored = np.fromiter((s.energy_status.stored_mwh for s in snapshots), float, count)
+        severity = np.fromiter((s.disaster_event.severity for s in snapshots), float, count)
+        impact = np.fromiter((s.disaster_event.infrastructure_impact for s in snapshots), float, count)
+        storage_capacity = np.fromiter((s.config.storage_capacity_mwh for s in snapshots), float, count)
+        storage_efficiency = np.fromiter((s.config.storage_efficiency for s in snapshots), float, count)
+
+        demand_forecast = self.demand_forecaster.forecast_batch(names, demand, severity)
+        supply_forecast = self.supply_forecaster.forecast_batch(names, generation, impact)
+
+        combined_confidence = np.minimum(demand_forecast.confidence, supply_forecast.confidence)
+        forecast_supply = np.where(
+            supply_forecast.generation_mw > 0, supply_forecast.generation_mw, generation
         )
-        storage_contribution = min(
-            snapshot.energy_status.stored_mwh,
-            snapshot.config.storage_capacity_mwh,
-        ) * snapshot.config.storage_efficiency / 4
-        forecast_supply += storage_contribution
-        forecast_demand = (
-            demand_forecast.demand_mw if demand_forecast.demand_mw > 0 else snapshot.energy_status.demand_mw
-        )
-        return forecast_demand, forecast_supply, combined_confidence
-
-    def _connection_map(self) -> Dict[str, Iterable[GridConnection]]:
-        mapping: Dict[str, List[GridConnection]] = {}
-        for region in self.region_configs.values():
-            for connection in region.grid_connections:
-                mapping.setdefault(connection.target_region, []).append(
-                    GridConnection(
-                        target_region=region.name,
-                        capacity_mw=connection.capacity_mw,
-                        loss_factor=connection.loss_factor,
-                    )
-                )
-        return mapping
+        forecast_supply += np.minimum(stored, storage_capacity) * storage_efficiency / 4
+        forecast_demand = np.where(demand_forecast.demand_mw > 0, demand_forecast.demand_mw, demand)
+        return names, forecast_demand, forecast_supply, combined_confidence
 
     def run_cycle(self, snapshots: List[RegionalSnapshot]) -> EnergyDispatchPlan:
         """Execute a forecasting + optimisation cycle for the given snapshots."""
 
-        region_demand: Dict[str, float] = {}
-        region_supply: Dict[str, float] = {}
-        confidence_tracker: Dict[str, float] = {}
-
-        for snapshot in snapshots:
-            demand, supply, confidence = self._forecast_region(snapshot)
-            region_demand[snapshot.config.name] = demand
-            region_supply[snapshot.config.name] = supply
-            confidence_tracker[snapshot.config.name] = confidence
+        names, demand, supply, confidence = self._forecast_batch(snapshots)
+        self.last_forecast = CycleForecast(names, demand, supply, confidence)
+        region_demand: Dict[str, float] = dict(zip(names, demand.tolist()))
+        region_supply: Dict[str, float] = dict(zip(names, supply.tolist()))
+        confidence_tracker: Dict[str, float] = dict(zip(names, confidence.tolist()))
 
         plan = self.optimizer.optimise(
             region_supply=region_supply,
             region_demand=region_demand,
-            connections=self._connection_map(),
+            connections=self.connection_index,
         )
 
         # Filter out dispatches below the AI confidence threshold.
-        filtered_dispatches = []
-        for dispatch in plan.dispatches:
-            confidence = min(
-                confidence_tracker.get(dispatch.source, 1.0),
-                confidence_tracker.get(dispatch.target, 1.0),
-            )
-            if confidence < self.optimizer.params.ai_confidence_threshold:
-                continue
-            filtered_dispatches.append(dispatch)
-
-        return EnergyDispatchPlan(dispatches=filtered_dispatches)
+        region_confidence = np.fromiter(
+            (confidence_tracker.get(region, 1.0) for region in plan.regions), float, len(plan.regions)
+        )
+        pair_confidence = np.minimum(region_confidence[plan.source], region_confidence[plan.target])
+        return plan.select(pair_confidence >= self.optimizer.params.ai_confidence_threshold)
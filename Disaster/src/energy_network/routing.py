@@ -0,0 +1,134 @@
+"""Loss-aware multi-hop routing over the interconnection index."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import dijkstra
+
+from .topology import ConnectionIndex
+
+# csgraph treats explicit zeros as missing edges, so lossless links get a tiny weight.
+_MIN_WEIGHT = 1e-12
+
+
+@dataclass
+class RouteTree:
+    """Best routes from every reachable exporter into one importing region.
+
+    ``sources`` is ordered by decreasing path efficiency; ``next_hop`` and
+    ``next_edge`` give, per reachable region, the following region and the
+    ``ConnectionIndex`` edge used on the way to the importer.
+    """
+
+    target: int
+    reachable: np.ndarray
+    efficiency: np.ndarray
+    next_hop: np.ndarray
+    next_edge: np.ndarray
+    sources: np.ndarray
+
+    def _slot(self, region: int) -> int:
+        return int(np.searchsorted(self.reachable, region))
+
+    def path(self, source: int) -> Tuple[List[int], List[int]]:
+        """Return the region and edge sequence from ``source`` to the target."""
+
+        regions = [source]
+        edges: List[int] = []
+        while regions[-1] != self.target:
+            slot = self._slot(regions[-1])
+            edges.append(int(self.next_edge[slot]))
+            regions.append(int(self.next_hop[slot]))
+        return regions, edges
+
+    def path_efficiency(self, source: int) -> float:
+        return float(self.efficiency[self._slot(source)])
+
+
+class LossAwareRouter:
+    """Caches loss-compounded shortest paths per topology version.
+
+    Edge weights are ``-log(1 - loss_factor)``, so the shortest path is the
+    one delivering the largest share of the injected power. Route trees are
+    computed on demand with Dijkstra and kept in an LRU cache until the index
+    version changes. A positive ``min_path_efficiency`` bounds the search to
+    paths delivering at least that share; note that it applies to direct links
+    too, which the greedy and LP backends would use at any loss. The default
+    of 0 searches every path. Lookups are serialised, so one router may be
+    shared between threads.
+    """
+
+    def __init__(self, min_path_efficiency: float = 0.0, max_cached_targets: int = 65536) -> None:
+        self.min_path_efficiency = min_path_efficiency
+        self.max_cached_targets = max_cached_targets
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._graph: sparse.csr_matrix | None = None
+        self._pair_keys: np.ndarray | None = None
+        self._pair_edges: np.ndarray | None = None
+        self._trees: "OrderedDict[int, RouteTree]" = OrderedDict()
+
+    def _prepare(self, index: ConnectionIndex) -> None:
+        if self._version == index.version:
+            return
+        weights = np.maximum(-np.log1p(-np.minimum(index.loss_factor, 1 - 1e-12)), _MIN_WEIGHT)
+        rows, columns = index.edge_targets, index.neighbours
+        # Keep only the lowest-loss link between any pair of regions.
+        order = np.lexsort((weights, columns, rows))
+        pairs, first = np.unique(rows[order] * len(index) + columns[order], return_index=True)
+        keep = order[first]
+        shape = (len(index), len(index))
+        # Row = importer, column = exporter: Dijkstra from an importer walks
+        # the network upstream towards every region that can feed it.
+        self._graph = sparse.csr_matrix((weights[keep], (rows[keep], columns[keep])), shape=shape)
+        self._pair_keys = pairs
+        self._pair_edges = keep
+        self._trees.clear()
+        self._version = index.version
+
+    def routes_to(self, index: ConnectionIndex, target: int) -> RouteTree:
+        """Return the (cached) route tree into region position ``target``."""
+
+        with self._lock:
+            return self._routes_to(index, target)
+
+    def _routes_to(self, index: ConnectionIndex, target: int) -> RouteTree:
+        self._prepare(index)
+        tree = self._trees.get(target)
+        if tree is not None:
+            self._trees.move_to_end(target)
+            return tree
+
+        distance, predecessor = dijkstra(
+            self._graph,
+            indices=target,
+            return_predecessors=True,
+            limit=-np.log(self.min_path_efficiency) if self.min_path_efficiency > 0 else np.inf,
+        )
+        reachable = np.flatnonzero(np.isfinite(distance))
+        next_hop = predecessor[reachable]
+        next_edge = np.full(len(reachable), -1, dtype=np.int64)
+        upstream = next_hop >= 0
+        keys = next_hop[upstream] * len(index) + reachable[upstream]
+        next_edge[upstream] = self._pair_edges[np.searchsorted(self._pair_keys, keys)]
+        efficiency = np.exp(-distance[reachable])
+        sources = reachable[np.argsort(-efficiency, kind="stable")]
+        sources = sources[sources != target]
+
+        tree = RouteTree(
+            target=target,
+            reachable=reachable,
+            efficiency=efficiency,
+            next_hop=next_hop,
+            next_edge=next_edge,
+            sources=sources,
+        )
+        self._trees[target] = tree
+        if len(self._trees) > self.max_cached_targets:
+            self._trees.popitem(last=False)
+        return tree
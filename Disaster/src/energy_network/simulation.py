@@ -3,11 +3,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List
 
 from .config import OptimizationParameters, RegionConfig
 from .data_ingestion import DisasterEvent, EnergyStatus, RegionalDataIngestor
-from .optimization import EnergyAllocationOptimizer
+from .optimization import EnergyAllocationOptimizer, EnergyDispatchPlan
 from .orchestrator import EnergyOrchestrator, RegionalSnapshot
 
 
@@ -16,7 +16,21 @@ class SimulationResult:
     """Collection of dispatch plans for an executed scenario."""
 
     scenario: str
-    dispatch_logs: List[Dict[str, float]]
+    plan: EnergyDispatchPlan
+
+    @property
+    def dispatch_logs(self) -> List[Dict[str, object]]:
+        return self.plan.to_records()
+
+
+@dataclass
+class PeriodResult:
+    """Dispatch plan and end-of-period storage for one simulation step."""
+
+    step: int
+    elapsed_minutes: float
+    plan: EnergyDispatchPlan
+    stored_mwh: Dict[str, float]
 
 
 class SimulationRunner:
@@ -32,7 +46,9 @@ class SimulationRunner:
         self.region_configs: Dict[str, RegionConfig] = {config.name: config for config in region_configs}
         self.optimization_params = optimization_params or OptimizationParameters()
 
-    def _initial_snapshots(self, scenario: str) -> List[RegionalSnapshot]:
+    def initial_snapshots(self, scenario: str) -> List[RegionalSnapshot]:
+        """Fresh snapshots of every configured region at the start of ``scenario``."""
+
         baseline = self.ingestor.load_energy_baseline(scenario)
         events = list(self.ingestor.load_disaster_events(scenario))
         events_by_region: Dict[str, DisasterEvent] = {
@@ -66,21 +82,62 @@ class SimulationRunner:
             )
         return snapshots
 
+    def _update_storage(
+        self, snapshots: List[RegionalSnapshot], plan: EnergyDispatchPlan, hours: float
+    ) -> None:
+        """Charge or discharge storage with each region's realised net balance."""
+
+        net_import = dict(zip(plan.regions, plan.net_import_mw().tolist()))
+        for snapshot in snapshots:
+            status = snapshot.energy_status
+            net_mw = status.net_balance + net_import.get(snapshot.config.name, 0.0)
+            balance_mwh = net_mw * hours
+            if balance_mwh > 0:
+                balance_mwh *= snapshot.config.storage_efficiency
+            status.stored_mwh = min(
+                snapshot.config.storage_capacity_mwh, max(0.0, status.stored_mwh + balance_mwh)
+            )
+
+    def iter_periods(
+        self, scenario: str, periods: int, step_minutes: float = 15.0
+    ) -> Iterator[PeriodResult]:
+        """Step the scenario forward ``periods`` times, yielding one result per step.
+
+        Events from the scenario ``timeline`` are applied at their step, and
+        storage levels and forecaster history carry over between steps. Results
+        are produced lazily so long horizons never hold every plan in memory.
+        """
+
+        optimizer = EnergyAllocationOptimizer(self.optimization_params)
+        orchestrator = EnergyOrchestrator(self.region_configs, optimizer)
+        snapshots = self.initial_snapshots(scenario)
+        by_region = {snapshot.config.name: snapshot for snapshot in snapshots}
+        timeline = self.ingestor.load_event_timeline(scenario)
+        pending = next(timeline, None)
+        hours = step_minutes / 60
+
+        for step in range(periods):
+            while pending is not None and pending[0] <= step:
+                event = pending[1]
+                if event.region in by_region:
+                    by_region[event.region].disaster_event = event
+                pending = next(timeline, None)
+
+            plan = orchestrator.run_cycle(snapshots)
+            self._update_storage(snapshots, plan, hours)
+            yield PeriodResult(
+                step=step,
+                elapsed_minutes=(step + 1) * step_minutes,
+                plan=plan,
+                stored_mwh={
+                    snapshot.config.name: snapshot.energy_status.stored_mwh for snapshot in snapshots
+                },
+            )
+
     def run(self, scenario: str) -> SimulationResult:
         optimizer = EnergyAllocationOptimizer(self.optimization_params)
         orchestrator = EnergyOrchestrator(self.region_configs, optimizer)
 
-        snapshots = self._initial_snapshots(scenario)
+        snapshots = self.initial_snapshots(scenario)
         plan = orchestrator.run_cycle(snapshots)
-
-        dispatch_logs = [
-            {
-                "source": dispatch.source,
-                "target": dispatch.target,
-                "transfer_mw": dispatch.transfer_mw,
-                "loss_mw": dispatch.loss_mw,
-            }
-            for dispatch in plan.dispatches
-        ]
-
-        return SimulationResult(scenario=scenario, dispatch_logs=dispatch_logs)
+        return SimulationResult(scenario=scenario, plan=plan)
@@ -57,6 +57,18 @@ def main() -> None:
         type=Path,
         help="Path to the directory containing scenario JSON files.",
     )
+    parser.add_argument(
+        "--periods",
+        type=int,
+        default=None,
+        help="Step the scenario timeline this many periods, printing one JSON line per step.",
+    )
+    parser.add_argument(
+        "--step-minutes",
+        type=float,
+        default=15.0,
+        help="Length of each period when --periods is given.",
+    )
     args = parser.parse_args()
 
     runner = SimulationRunner(
@@ -64,6 +76,21 @@ def main() -> None:
         region_configs=_default_region_configs(),
         optimization_params=OptimizationParameters(),
     )
+    if args.periods is not None:
+        for period in runner.iter_periods(args.scenario, args.periods, args.step_minutes):
+            print(
+                json.dumps(
+                    {
+                        "step": period.step,
+                        "elapsed_minutes": period.elapsed_minutes,
+                        "total_transferred_mw": period.plan.total_transferred,
+                        "total_losses_mw": period.plan.total_losses,
+                        "stored_mwh": period.stored_mwh,
+                    }
+                )
+            )
+        return
+
     result = runner.run(args.scenario)
     print(json.dumps({"scenario": result.scenario, "dispatches": result.dispatch_logs}, indent=2))
 
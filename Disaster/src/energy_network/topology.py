@@ -0,0 +1,109 @@
+"""Compact, versioned interconnection index for the energy network."""
+from __future__ import annotations
+
+import itertools
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .config import GridConnection, RegionConfig
+
+_versions = itertools.count(1)
+
+
+class ConnectionIndex:
+    """Reversed grid adjacency stored as CSR arrays.
+
+    Row ``i`` lists the regions able to export into ``regions[i]``: the
+    exporters are ``neighbours[indptr[i]:indptr[i + 1]]`` with matching
+    ``capacity_mw`` and ``loss_factor`` entries. Every index receives a new
+    ``version`` so derived caches can tell when the topology changed.
+    """
+
+    def __init__(
+        self,
+        regions: List[str],
+        indptr: np.ndarray,
+        neighbours: np.ndarray,
+        capacity_mw: np.ndarray,
+        loss_factor: np.ndarray,
+    ) -> None:
+        self.regions = regions
+        self.positions: Dict[str, int] = {region: position for position, region in enumerate(regions)}
+        self.indptr = indptr
+        self.neighbours = neighbours
+        self.capacity_mw = capacity_mw
+        self.loss_factor = loss_factor
+        self.edge_targets = np.repeat(np.arange(len(regions), dtype=np.int64), np.diff(indptr))
+        self.version = next(_versions)
+
+    @classmethod
+    def from_region_configs(cls, region_configs: Iterable[RegionConfig]) -> "ConnectionIndex":
+        """Build the index from each region's outgoing ``grid_connections``."""
+
+        configs = list(region_configs)
+        return cls._from_edges(
+            (
+                (connection.target_region, config.name, connection.capacity_mw, connection.loss_factor)
+                for config in configs
+                for connection in config.grid_connections
+            ),
+            known_regions=[config.name for config in configs],
+        )
+
+    @classmethod
+    def from_connection_map(cls, connections: Dict[str, Iterable[GridConnection]]) -> "ConnectionIndex":
+        """Build the index from an importer-keyed map of exporting connections."""
+
+        return cls._from_edges(
+            (target, connection.target_region, connection.capacity_mw, connection.loss_factor)
+            for target, links in connections.items()
+            for connection in links
+        )
+
+    @classmethod
+    def _from_edges(
+        cls, edges: Iterable[Tuple[str, str, float, float]], known_regions: Iterable[str] = ()
+    ) -> "ConnectionIndex":
+        regions: List[str] = []
+        positions: Dict[str, int] = {}
+        rows: List[List[Tuple[int, float, float]]] = []
+
+        def position(region: str) -> int:
+            if region not in positions:
+                positions[region] = len(regions)
+                regions.append(region)
+                rows.append([])
+            return positions[region]
+
+        for region in known_regions:
+            position(region)
+        for importer, exporter, capacity, loss in edges:
+            row = position(importer)
+            rows[row].append((position(exporter), capacity, loss))
+
+        indptr = np.zeros(len(regions) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=indptr[1:])
+        flat = [edge for row in rows for edge in row]
+        return cls(
+            regions=regions,
+            indptr=indptr,
+            neighbours=np.fromiter((edge[0] for edge in flat), np.int64, len(flat)),
+            capacity_mw=np.fromiter((edge[1] for edge in flat), float, len(flat)),
+            loss_factor=np.fromiter((edge[2] for edge in flat), float, len(flat)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.neighbours)
+
+    def span(self, region: str) -> Tuple[int, int]:
+        """Return the ``[start, stop)`` edge range of exporters into ``region``."""
+
+        position = self.positions.get(region)
+        if position is None:
+            return 0, 0
+        return int(self.indptr[position]), int(self.indptr[position + 1])
@@ -0,0 +1,51 @@
+import io
+import json
+import os
+from pathlib import Path
+
+from energy_network.data_ingestion import RegionalDataIngestor, ScenarioCache, iter_json_array
+
+DATA_ROOT = Path(__file__).resolve().parents[1] / "data"
+
+
+def test_scenario_file_is_parsed_once_until_modified(tmp_path: Path, monkeypatch):
+    scenario = tmp_path / "scenario.json"
+    scenario.write_text((DATA_ROOT / "sample_transnational_event.json").read_text(encoding="utf-8"))
+    calls = []
+    original_load = json.load
+    monkeypatch.setattr(json, "load", lambda handle: calls.append(1) or original_load(handle))
+
+    ingestor = RegionalDataIngestor(data_root=tmp_path)
+    events = list(ingestor.load_disaster_events("scenario"))
+    baseline = ingestor.load_energy_baseline("scenario")
+    regions = ingestor.region_list("scenario")
+    assert len(calls) == 1
+    assert len(events) == 3 and regions == list(baseline) == ["Japan", "Korea", "EU"]
+
+    payload = json.loads(scenario.read_text(encoding="utf-8"))
+    payload["baseline"].pop("EU")
+    scenario.write_text(json.dumps(payload), encoding="utf-8")
+    stat = scenario.stat()
+    os.utime(scenario, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert ingestor.region_list("scenario") == ["Japan", "Korea"]
+    assert len(calls) == 2
+
+
+def test_baseline_views_are_independent_copies():
+    ingestor = RegionalDataIngestor(data_root=DATA_ROOT, cache=ScenarioCache())
+    first = ingestor.load_energy_baseline("sample_transnational_event")
+    first["Japan"].stored_mwh = 0.0
+    assert ingestor.load_energy_baseline("sample_transnational_event")["Japan"].stored_mwh == 12000
+
+
+def test_streaming_parser_matches_full_load():
+    ingestor = RegionalDataIngestor(data_root=DATA_ROOT)
+    streamed = list(ingestor.stream_disaster_events("sample_transnational_event", chunk_size=7))
+    assert streamed == list(ingestor.load_disaster_events("sample_transnational_event"))
+
+
+def test_iter_json_array_skips_sibling_values():
+    document = '{"meta": {"events": [0]}, "count": 12345, "events": [1, {"a": [2]}, "x"], "tail": []}'
+    assert list(iter_json_array(io.StringIO(document), "events", chunk_size=3)) == [1, {"a": [2]}, "x"]
+    assert list(iter_json_array(io.StringIO('{"events": []}'), "events")) == []
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from energy_network.data_ingestion import EnergyStatus
+from energy_network.forecasting import DemandForecaster, RollingHistory, SupplyForecaster
+
+
+def test_rolling_history_keeps_last_window_and_mean():
+    history = RollingHistory(window=3)
+    rows = history.rows_for(["A", "B"])
+    for value in range(1, 6):
+        history.push(rows, np.array([value, 10.0 * value]))
+
+    assert history.get("A") == [3, 4, 5]
+    assert history.get("B") == [30, 40, 50]
+    assert history.mean(rows).tolist() == pytest.approx([4.0, 40.0])
+    assert history.get("missing") == []
+
+
+def test_rolling_history_grows_for_new_regions():
+    history = RollingHistory(window=2)
+    names = [f"R{i}" for i in range(20)]
+    history.push(history.rows_for(names[:5]), np.ones(5))
+    history.push(history.rows_for(names), np.full(20, 3.0))
+
+    assert len(history) == 20
+    assert history.get("R0") == [1, 3]
+    assert history.get("R19") == [3]
+
+
+def test_forecast_batch_matches_per_region_forecast():
+    regions = ["A", "B", "C"]
+    demand = np.array([100.0, 200.0, 300.0])
+    severity = np.array([0.0, 0.5, 1.0])
+    batch_forecaster, single_forecaster = DemandForecaster(), DemandForecaster()
+
+    for step in range(6):
+        batch = batch_forecaster.forecast_batch(regions, demand + step, severity)
+        singles = [
+            single_forecaster.forecast(region, EnergyStatus(value + step, 0.0, 0.0), level)
+            for region, value, level in zip(regions, demand, severity)
+        ]
+    assert batch.demand_mw.tolist() == pytest.approx([single.demand_mw for single in singles])
+    assert batch.confidence.tolist() == pytest.approx([single.confidence for single in singles])
+
+
+def test_supply_forecast_applies_infrastructure_impact():
+    forecaster = SupplyForecaster(impact_penalty=0.5)
+    result = forecaster.forecast_batch(["A", "B"], np.array([100.0, 100.0]), np.array([0.0, 1.0]))
+    assert result.generation_mw.tolist() == pytest.approx([100.0, 50.0])
+    assert result.confidence.tolist() == pytest.approx([1.0, 0.5])
+
+
+def test_duplicate_regions_in_a_batch_are_rejected():
+    forecaster = DemandForecaster()
+    forecaster.forecast_batch(["A"], np.array([100.0]), np.array([0.0]))
+
+    with pytest.raises(ValueError, match="once per batch"):
+        forecaster.forecast_batch(["A", "B", "A"], np.array([1.0, 2.0, 3.0]), np.zeros(3))
+    assert forecaster.history.get("A") == [100.0]
+    assert forecaster.history.get("B") == []
+
+
+@pytest.mark.parametrize("forecaster_class", [DemandForecaster, SupplyForecaster])
+def test_history_can_still_be_passed_to_the_constructor(forecaster_class):
+    forecaster = forecaster_class(history_size=3, history={"A": [1.0, 2.0, 3.0, 4.0], "B": [10.0]})
+
+    assert forecaster.history["A"] == [2.0, 3.0, 4.0]
+    assert forecaster.history.get("B", []) == [10.0]
+    assert sorted(forecaster.history) == ["A", "B"]
+    with pytest.raises(KeyError):
+        forecaster.history["C"]
+
+    forecaster.update_history("A", 5.0)
+    assert forecaster.history["A"] == [3.0, 4.0, 5.0]
+    shared = RollingHistory(window=2)
+    assert forecaster_class(history=shared).history is shared
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from energy_network.config import OptimizationParameters
+from energy_network.monte_carlo import MonteCarloSweep, PerturbationSpec
+from energy_network.simulation import SimulationRunner
+from energy_network.simulation_runner import _default_region_configs
+
+DATA_ROOT = Path(__file__).resolve().parents[1] / "data"
+
+
+def _sweep():
+    runner = SimulationRunner(DATA_ROOT, _default_region_configs(), OptimizationParameters())
+    return MonteCarloSweep(runner, PerturbationSpec(severity_sigma=0.2, capacity_derating=0.95))
+
+
+def test_sweep_aggregates_statistics():
+    stats = _sweep().run("sample_transnational_event", samples=40, seed=7, workers=1, chunk_size=16)
+
+    assert stats.samples == 40
+    assert stats.unserved_mw["p50"] <= stats.unserved_mw["p90"] <= stats.unserved_mw["p99"]
+    assert stats.transferred_mw["mean"] > 0
+    assert set(stats.link_saturation) >= {"Korea->Japan", "EU->Japan"}
+    assert all(0.0 <= rate <= 1.0 for rate in stats.link_saturation.values())
+    assert any(rate > 0 for rate in stats.link_saturation.values())
+
+
+def test_sweep_is_reproducible_across_worker_counts():
+    sweep = _sweep()
+    serial = sweep.run("sample_transnational_event", samples=24, seed=3, workers=1, chunk_size=8)
+    parallel = sweep.run("sample_transnational_event", samples=24, seed=3, workers=2, chunk_size=8)
+
+    assert parallel.unserved_mw == pytest.approx(serial.unserved_mw)
+    assert parallel.transferred_mw == pytest.approx(serial.transferred_mw)
+    assert parallel.link_saturation == serial.link_saturation
+
+
+def test_multihop_sweep_reports_every_link():
+    runner = SimulationRunner(DATA_ROOT, _default_region_configs(), OptimizationParameters())
+    sweep = MonteCarloSweep(runner, PerturbationSpec(capacity_derating=0.95), mode="multihop")
+    stats = sweep.run("sample_transnational_event", samples=8, seed=1, workers=1, chunk_size=4)
+
+    assert stats.samples == 8
+    assert len(stats.link_saturation) == sum(len(c.grid_connections) for c in runner.region_configs.values())
+    assert all(0.0 <= rate <= 1.0 for rate in stats.link_saturation.values())
+
+
+def test_parallel_links_get_distinct_names():
+    from energy_network.config import GridConnection
+    from energy_network.monte_carlo import _link_names
+    from energy_network.topology import ConnectionIndex
+
+    link = GridConnection(target_region="A", capacity_mw=10, loss_factor=0.1)
+    index = ConnectionIndex.from_connection_map({"B": [link, link], "C": [link]})
+
+    assert _link_names(index) == ["A->B", "A->B#2", "A->C"]
@@ -0,0 +1,232 @@
+import numpy as np
+import pytest
+
+from energy_network.config import GridConnection, OptimizationParameters
+from energy_network.optimization import EnergyAllocationOptimizer
+
+
+def _stranded_surplus_case():
+    # "B" is the only exporter for "A" under greedy ordering, which then leaves
+    # nothing for "C"; the LP routes "A" through "D" instead.
+    supply = {"A": 0.0, "B": 1000.0, "C": 0.0, "D": 1000.0}
+    demand = {"A": 100.0, "B": 800.0, "C": 80.0, "D": 800.0}
+    connections = {
+        "A": [
+            GridConnection(target_region="B", capacity_mw=500, loss_factor=0.05),
+            GridConnection(target_region="D", capacity_mw=500, loss_factor=0.05),
+        ],
+        "C": [GridConnection(target_region="B", capacity_mw=500, loss_factor=0.05)],
+    }
+    return supply, demand, connections
+
+
+def test_lp_mode_serves_more_demand_than_greedy():
+    supply, demand, connections = _stranded_surplus_case()
+    params = OptimizationParameters(reserve_margin_fraction=0.1)
+
+    greedy = EnergyAllocationOptimizer(params, mode="greedy").optimise(supply, demand, connections)
+    lp = EnergyAllocationOptimizer(params, mode="lp").optimise(supply, demand, connections)
+
+    assert lp.total_transferred > greedy.total_transferred
+    assert lp.total_transferred == pytest.approx(180.0)
+
+
+def test_lp_mode_respects_limits():
+    supply, demand, connections = _stranded_surplus_case()
+    params = OptimizationParameters(reserve_margin_fraction=0.1, ramp_limit_mw=60.0)
+    plan = EnergyAllocationOptimizer(params, mode="lp").optimise(supply, demand, connections)
+
+    exported = {}
+    for dispatch in plan.dispatches:
+        injected = dispatch.transfer_mw + dispatch.loss_mw
+        assert injected <= params.ramp_limit_mw + 1e-6
+        assert dispatch.loss_mw == pytest.approx(injected * 0.05)
+        exported[dispatch.source] = exported.get(dispatch.source, 0.0) + injected
+    for region, amount in exported.items():
+        assert amount <= supply[region] - demand[region] * 1.1 + 1e-6
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        EnergyAllocationOptimizer(OptimizationParameters(), mode="quantum")
+
+
+def test_dispatch_plan_is_columnar_with_cached_totals():
+    from energy_network.optimization import EnergyDispatch, EnergyDispatchPlan
+
+    plan = EnergyDispatchPlan(
+        [
+            EnergyDispatch(source="A", target="B", transfer_mw=90.0, loss_mw=10.0),
+            EnergyDispatch(source="C", target="B", transfer_mw=45.0, loss_mw=5.0),
+        ]
+    )
+    assert plan.regions == ["A", "B", "C"]
+    assert plan.source.tolist() == [0, 2] and plan.target.tolist() == [1, 1]
+    assert (plan.total_transferred, plan.total_losses) == (135.0, 15.0)
+    assert plan.net_import_mw().tolist() == [-100.0, 135.0, -50.0]
+    assert plan.to_records()[1] == {
+        "source": "C",
+        "target": "B",
+        "transfer_mw": 45.0,
+        "loss_mw": 5.0,
+        "path": ["C", "B"],
+    }
+
+    subset = plan.select(plan.source == 2)
+    assert [d.source for d in subset.dispatches] == ["C"]
+    assert subset.total_transferred == 45.0
+
+
+def test_dispatch_plan_exports_json_and_arrow():
+    import json
+
+    from energy_network.optimization import EnergyDispatchPlan
+
+    plan = EnergyDispatchPlan.from_arrays(["A", "B"], [0], [1], [9.0], [1.0])
+    exported = json.loads(plan.to_json())
+    assert exported["transfer_mw"] == [9.0] and exported["regions"] == ["A", "B"]
+
+    pa = pytest.importorskip("pyarrow")
+    table = plan.to_arrow()
+    assert table.column("source").to_pylist() == ["A"]
+    assert table.column("loss_mw").type == pa.float64()
+
+
+def test_value_types_use_slots():
+    from energy_network.data_ingestion import DisasterEvent, EnergyStatus
+
+    for value in (
+        GridConnection(target_region="A", capacity_mw=1.0),
+        EnergyStatus(demand_mw=1.0, generation_mw=2.0, stored_mwh=0.0),
+        DisasterEvent("A", "none", 0.0, 0.0, ""),
+    ):
+        assert not hasattr(value, "__dict__")
+
+
+def _chain_case():
+    # Surplus sits at "A"; "C" can only be reached through the short region "B".
+    supply = {"A": 1000.0, "B": 100.0, "C": 0.0}
+    demand = {"A": 500.0, "B": 110.0, "C": 50.0}
+    connections = {
+        "B": [GridConnection(target_region="A", capacity_mw=300, loss_factor=0.05)],
+        "C": [GridConnection(target_region="B", capacity_mw=40, loss_factor=0.1)],
+    }
+    return supply, demand, connections
+
+
+def test_multihop_mode_reaches_deficits_two_hops_away():
+    supply, demand, connections = _chain_case()
+    params = OptimizationParameters()
+
+    direct = EnergyAllocationOptimizer(params, mode="greedy").optimise(supply, demand, connections)
+    assert {d.target for d in direct.dispatches} == {"B"}
+
+    plan = EnergyAllocationOptimizer(params, mode="multihop").optimise(supply, demand, connections)
+    by_target = {d.target: d for d in plan.dispatches}
+    assert by_target["B"].path == ("A", "B")
+    relayed = by_target["C"]
+    assert relayed.path == ("A", "B", "C")
+    # The B->C link carries at most 40 MW, so C receives 36 MW after its 10 % loss.
+    assert relayed.transfer_mw == pytest.approx(36.0)
+    injected = relayed.transfer_mw + relayed.loss_mw
+    assert relayed.transfer_mw == pytest.approx(injected * 0.95 * 0.9)
+    assert [r["path"] for r in plan.to_records() if r["target"] == "C"] == [["A", "B", "C"]]
+
+
+def test_multihop_routes_are_cached_per_topology_version():
+    from energy_network.routing import LossAwareRouter
+    from energy_network.topology import ConnectionIndex
+
+    _, _, connections = _chain_case()
+    index = ConnectionIndex.from_connection_map(connections)
+    router = LossAwareRouter()
+    target = index.positions["C"]
+
+    tree = router.routes_to(index, target)
+    assert router.routes_to(index, target) is tree
+    assert tree.path(index.positions["A"])[0] == [index.positions[r] for r in ("A", "B", "C")]
+    assert tree.path_efficiency(index.positions["A"]) == pytest.approx(0.95 * 0.9)
+
+    rebuilt = ConnectionIndex.from_connection_map(connections)
+    assert router.routes_to(rebuilt, target) is not tree
+
+
+def test_filtered_multihop_plan_keeps_paths():
+    supply, demand, connections = _chain_case()
+    plan = EnergyAllocationOptimizer(OptimizationParameters(), mode="multihop").optimise(
+        supply, demand, connections
+    )
+    relayed = plan.select(np.array([len(path) == 3 for path in plan.paths()]))
+    assert relayed.paths() == [("A", "B", "C")]
+
+
+def test_multihop_dispatchers_are_per_optimiser():
+    params = OptimizationParameters()
+    first = EnergyAllocationOptimizer(params, mode="multihop")
+    second = EnergyAllocationOptimizer(params, mode="multihop")
+    assert first.solver is not second.solver
+    assert first.solver.router is not second.solver.router
+
+
+def test_multihop_uses_lossy_direct_links():
+    supply = {"A": 500.0, "B": 0.0}
+    demand = {"A": 100.0, "B": 100.0}
+    connections = {"B": [GridConnection(target_region="A", capacity_mw=300, loss_factor=0.4)]}
+    params = OptimizationParameters()
+
+    lp = EnergyAllocationOptimizer(params, mode="lp").optimise(supply, demand, connections)
+    plan = EnergyAllocationOptimizer(params, mode="multihop").optimise(supply, demand, connections)
+    assert lp.dispatches and plan.dispatches
+    assert plan.dispatches[0].path == ("A", "B")
+
+
+def test_multihop_link_flows_charge_every_hop():
+    from energy_network.topology import ConnectionIndex
+
+    supply, demand, connections = _chain_case()
+    index = ConnectionIndex.from_connection_map(connections)
+    plan = EnergyAllocationOptimizer(OptimizationParameters(), mode="multihop").optimise(
+        supply, demand, index
+    )
+    a_to_b, b_to_c = index.span("B")[0], index.span("C")[0]
+    flows = plan.link_flow_mw(index)
+
+    injected = plan.transfer_mw + plan.loss_mw
+    assert flows[a_to_b] == pytest.approx(injected.sum())
+    # Only what survives the first hop's 5 % loss enters B->C, which is full.
+    assert flows[b_to_c] == pytest.approx(40.0)
+
+    is_relayed = np.array([len(path) == 3 for path in plan.paths()])
+    relayed = plan.select(is_relayed).link_flow_mw(index)
+    assert relayed[[a_to_b, b_to_c]] == pytest.approx([injected[is_relayed].sum(), 40.0])
+
+
+@pytest.mark.parametrize("mode", ["greedy", "lp"])
+def test_parallel_links_keep_separate_flows(mode):
+    from energy_network.topology import ConnectionIndex
+
+    supply = {"A": 1000.0, "B": 0.0}
+    demand = {"A": 100.0, "B": 150.0}
+    index = ConnectionIndex.from_connection_map(
+        {
+            "B": [
+                GridConnection(target_region="A", capacity_mw=100, loss_factor=0.05),
+                GridConnection(target_region="A", capacity_mw=100, loss_factor=0.1),
+            ]
+        }
+    )
+    plan = EnergyAllocationOptimizer(OptimizationParameters(), mode=mode).optimise(supply, demand, index)
+
+    flows = plan.link_flow_mw(index)
+    assert flows[0] == pytest.approx(100.0)
+    assert 0.0 < flows[1] < 100.0
+    assert flows.sum() == pytest.approx((plan.transfer_mw + plan.loss_mw).sum())
+
+
+def test_link_flows_need_recorded_edges():
+    from energy_network.optimization import EnergyDispatch, EnergyDispatchPlan
+    from energy_network.topology import ConnectionIndex
+
+    plan = EnergyDispatchPlan([EnergyDispatch(source="A", target="B", transfer_mw=9.0, loss_mw=1.0)])
+    with pytest.raises(ValueError):
+        plan.link_flow_mw(ConnectionIndex.from_connection_map({}))
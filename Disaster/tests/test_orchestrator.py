@@ -98,3 +98,22 @@ def test_simulation_runner_returns_serialisable_result(tmp_path: Path):
     result = runner.run("sample_transnational_event")
     assert result.dispatch_logs, "Simulation should produce dispatch records"
     assert {"source", "target", "transfer_mw", "loss_mw"} <= result.dispatch_logs[0].keys()
+
+
+def test_simulation_runner_streams_periods_and_carries_storage():
+    data_root = Path(__file__).resolve().parents[1] / "data"
+    runner = SimulationRunner(
+        data_root=data_root,
+        region_configs=_region_configs().values(),
+        optimization_params=OptimizationParameters(),
+    )
+    periods = runner.iter_periods("sample_typhoon_timeline", periods=8, step_minutes=15)
+    assert not isinstance(periods, list)
+
+    results = list(periods)
+    assert [period.step for period in results] == list(range(8))
+    assert results[-1].elapsed_minutes == 120
+    # Japan runs a deficit throughout, so its storage drains step after step.
+    japan = [period.stored_mwh["Japan"] for period in results]
+    assert japan == sorted(japan, reverse=True) and japan[0] > japan[-1]
+    assert all(period.plan.dispatches for period in results)
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "web_service"))
+
+from simulation_jobs import OptimizationParameters, SimulationJobs  # noqa: E402
+
+
+def wait(job, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while job.status == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return job
+
+
+def test_pool_is_lazy_and_replaced_after_a_worker_crash():
+    jobs = SimulationJobs(workers=1)
+    try:
+        assert jobs._executor is None
+
+        jobs.start()
+        crashed = jobs._executor
+        crash = crashed.submit(os._exit, 1)
+        assert crash.exception(timeout=30) is not None
+
+        job, cached = jobs.submit("sample_transnational_event", OptimizationParameters())
+        assert not cached
+        assert wait(job).status == "done"
+        assert jobs._executor is not crashed
+    finally:
+        jobs.shutdown()
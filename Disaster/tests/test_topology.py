@@ -0,0 +1,66 @@
+from energy_network.config import GridConnection, OptimizationParameters, RegionConfig
+from energy_network.optimization import EnergyAllocationOptimizer
+from energy_network.orchestrator import EnergyOrchestrator
+from energy_network.topology import ConnectionIndex
+
+
+def _configs():
+    return {
+        "A": RegionConfig(
+            name="A",
+            base_demand_mw=100,
+            base_generation_mw=100,
+            storage_capacity_mwh=0,
+            grid_connections=[GridConnection(target_region="B", capacity_mw=50, loss_factor=0.1)],
+        ),
+        "B": RegionConfig(
+            name="B",
+            base_demand_mw=100,
+            base_generation_mw=100,
+            storage_capacity_mwh=0,
+            grid_connections=[
+                GridConnection(target_region="A", capacity_mw=50, loss_factor=0.1),
+                GridConnection(target_region="C", capacity_mw=30, loss_factor=0.2),
+            ],
+        ),
+    }
+
+
+def test_connection_index_stores_reversed_adjacency():
+    index = ConnectionIndex.from_region_configs(_configs().values())
+
+    assert index.regions == ["A", "B", "C"]
+    assert index.edge_count == 3
+    start, stop = index.span("C")
+    assert [index.regions[i] for i in index.neighbours[start:stop]] == ["B"]
+    assert index.capacity_mw[start:stop].tolist() == [30]
+    assert index.loss_factor[start:stop].tolist() == [0.2]
+    assert index.span("missing") == (0, 0)
+
+
+def test_orchestrator_reuses_index_until_configs_change():
+    orchestrator = EnergyOrchestrator(_configs(), EnergyAllocationOptimizer(OptimizationParameters()))
+    index = orchestrator.connection_index
+    assert orchestrator.connection_index is index
+
+    orchestrator.region_configs = _configs()
+    rebuilt = orchestrator.connection_index
+    assert rebuilt is not index
+    assert rebuilt.version != index.version
+
+
+def test_index_and_connection_map_give_identical_plans():
+    supply = {"A": 200.0, "B": 40.0, "C": 0.0}
+    demand = {"A": 100.0, "B": 80.0, "C": 20.0}
+    connections = {
+        "B": [GridConnection(target_region="A", capacity_mw=50, loss_factor=0.1)],
+        "C": [GridConnection(target_region="B", capacity_mw=30, loss_factor=0.2)],
+        "A": [GridConnection(target_region="B", capacity_mw=50, loss_factor=0.1)],
+    }
+    optimizer = EnergyAllocationOptimizer(OptimizationParameters())
+
+    from_map = optimizer.optimise(supply, demand, connections)
+    from_index = optimizer.optimise(supply, demand, ConnectionIndex.from_connection_map(connections))
+
+    assert from_map.dispatches == from_index.dispatches
+    assert from_map.dispatches
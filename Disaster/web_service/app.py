@@ -12,6 +12,7 @@ from i18n import (
     normalize_language,
     translate,
 )
+from simulation_jobs import OptimizationParameters, SimulationJobs
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
@@ -43,6 +44,9 @@ def init_db():
 
 init_db()
 
+# The worker pool is spawned by the first /api/simulate request.
+simulation_jobs = SimulationJobs(workers=int(os.environ.get('SIMULATION_WORKERS', 0)) or None)
+
 
 def _get_locale():
     lang = session.get("lang")
@@ -145,78 +149,53 @@ def dashboard():
         js_translations=get_js_translations(lang),
     )
 
+def _simulation_payload(job):
+    return {
+        'success': True,
+        'status': job.status,
+        'message': translate('simulation_success', lang=_get_locale()),
+        'result': job.result,
+    }
+
 @app.route('/api/simulate', methods=['POST'])
 @login_required
 def simulate():
+    data = request.get_json(silent=True) or {}
+    scenario_file = data.get('scenario_file', 'sample_transnational_event')
     try:
-        data = request.get_json(silent=True) or {}
-        scenario_file = data.get('scenario_file', 'sample_transnational_event')
-        
-        # Import simulation runner
-        import sys
-        from pathlib import Path
-        base_dir = os.path.join(os.path.dirname(__file__), '..')
-        sys.path.insert(0, base_dir)
-        
-        from src.energy_network.simulation_runner import SimulationRunner, _default_region_configs
-        from src.energy_network.config import OptimizationParameters
-        
-        # Get absolute path to data directory
-        data_root = Path(base_dir) / 'data'
-        scenario_path = data_root / f'{scenario_file}.json'
-        
-        if not scenario_path.exists():
-            raise FileNotFoundError(
-                translate('error_scenario_missing', lang=_get_locale(), path=scenario_path)
-            )
-        
-        # Run simulation
-        runner = SimulationRunner(
-            data_root=data_root,
-            region_configs=_default_region_configs(),
-            optimization_params=OptimizationParameters(),
-        )
-        result = runner.run(scenario_file)
-        
-        # Convert result to dict for JSON serialization
-        # Handle dispatch_logs - check if it's a dict or object
-        dispatches = []
-        for d in result.dispatch_logs:
-            if isinstance(d, dict):
-                dispatches.append(d)
-            else:
-                # It's an object with attributes
-                dispatch_dict = {
-                    'region': getattr(d, 'region', ''),
-                    'target_region': getattr(d, 'target_region', ''),
-                    'energy_mw': getattr(d, 'energy_mw', 0),
-                }
-                # Handle timestamp
-                timestamp = getattr(d, 'timestamp', None)
-                if timestamp:
-                    if hasattr(timestamp, 'isoformat'):
-                        dispatch_dict['timestamp'] = timestamp.isoformat()
-                    else:
-                        dispatch_dict['timestamp'] = str(timestamp)
-                dispatches.append(dispatch_dict)
-        
-        result_dict = {
-            'scenario': result.scenario if hasattr(result, 'scenario') else str(result),
-            'dispatches': dispatches
-        }
-        
-        return jsonify({
-            'success': True,
-            'message': translate('simulation_success', lang=_get_locale()),
-            'result': result_dict
-        })
-    except Exception as e:
-        import traceback
+        params = OptimizationParameters(**data.get('parameters', {}))
+    except TypeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    try:
+        job, cached = simulation_jobs.submit(scenario_file, params)
+    except FileNotFoundError as e:
         return jsonify({
             'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }), 500
+            'error': translate('error_scenario_missing', lang=_get_locale(), path=e.args[0]),
+        }), 404
+
+    if cached or job.status == 'done':
+        payload = _simulation_payload(job)
+        payload['cached'] = cached
+        return jsonify(payload)
+    return jsonify({
+        'success': True,
+        'status': job.status,
+        'job_id': job.job_id,
+        'status_url': url_for('simulation_job', job_id=job.job_id),
+    }), 202
+
+@app.route('/api/simulate/jobs/<job_id>', methods=['GET'])
+@login_required
+def simulation_job(job_id):
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': translate('error_unknown', lang=_get_locale())}), 404
+    if job.status == 'failed':
+        return jsonify({'success': False, 'status': job.status, 'error': job.error}), 500
+    if job.status == 'running':
+        return jsonify({'success': True, 'status': job.status, 'job_id': job.job_id}), 202
+    return jsonify(_simulation_payload(job))
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5007))
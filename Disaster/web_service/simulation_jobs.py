@@ -0,0 +1,229 @@
+"""Warm worker pool, job registry and result cache for ``/api/simulate``."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_ROOT = BASE_DIR / 'data'
+
+if str(BASE_DIR / 'src') not in sys.path:
+    sys.path.insert(0, str(BASE_DIR / 'src'))
+
+from energy_network.config import OptimizationParameters  # noqa: E402
+
+# Per-process state populated once by ``_init_worker``.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(data_root: str) -> None:
+    """Import the simulation stack and build the default configs once per worker."""
+
+    from energy_network.simulation import SimulationRunner
+    from energy_network.simulation_runner import _default_region_configs
+
+    _WORKER['data_root'] = Path(data_root)
+    _WORKER['runner_class'] = SimulationRunner
+    _WORKER['region_configs'] = _default_region_configs()
+    _WORKER['runners'] = {}
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _run_simulation(scenario: str, parameters: Dict[str, float]) -> Dict[str, object]:
+    """Run ``scenario`` inside a worker, reusing one runner per parameter set."""
+
+    key = json.dumps(parameters, sort_keys=True)
+    runners = _WORKER['runners']
+    runner = runners.get(key)
+    if runner is None:
+        runner = _WORKER['runner_class'](
+            data_root=_WORKER['data_root'],
+            region_configs=_WORKER['region_configs'],
+            optimization_params=OptimizationParameters(**parameters),
+        )
+        runners[key] = runner
+    result = runner.run(scenario)
+    return {'scenario': result.scenario, 'dispatches': result.dispatch_logs}
+
+
+@dataclass
+class SimulationJob:
+    """A submitted simulation; ``future`` is dropped once the result is cached."""
+
+    job_id: str
+    cache_key: str
+    future: Optional[Future] = None
+    result: Optional[Dict[str, object]] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return 'failed'
+        if self.result is not None:
+            return 'done'
+        return 'running'
+
+
+class SimulationJobs:
+    """Submits simulations to a persistent process pool and caches the results.
+
+    Results are keyed by the SHA-256 of the scenario file contents plus the
+    optimisation parameters, so editing a scenario or changing a parameter
+    produces a fresh run while dashboard refreshes are answered from memory.
+    Identical requests that arrive while a run is in flight share its job.
+    The pool is spawned on first use and replaced if a worker crash breaks it.
+    """
+
+    def __init__(
+        self,
+        data_root: Path = DATA_ROOT,
+        workers: Optional[int] = None,
+        max_cached_results: int = 128,
+        job_ttl_seconds: float = 900.0,
+    ) -> None:
+        self.data_root = Path(data_root).resolve()
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_cached_results = max_cached_results
+        self.job_ttl_seconds = job_ttl_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._results: 'OrderedDict[str, Dict[str, object]]' = OrderedDict()
+        self._jobs: Dict[str, SimulationJob] = {}
+        self._inflight: Dict[str, str] = {}
+        self._digests: Dict[Path, Tuple[int, str]] = {}
+
+    def start(self) -> None:
+        """Spawn the worker pool and run each worker's initializer up front."""
+
+        with self._lock:
+            if self._executor is not None:
+                return
+            executor = self._pool()
+        try:
+            for _ in range(self.workers):
+                executor.submit(_warm_up)
+        except BrokenProcessPool:
+            pass  # replaced by the next submit
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Caller holds ``_lock``.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(str(self.data_root),),
+            )
+        return self._executor
+
+    def _submit(self, *args: object) -> Future:
+        # Caller holds ``_lock``. A worker that died (OOM kill, segfault)
+        # leaves the pool broken for good, so swap in a fresh one and retry once.
+        try:
+            return self._pool().submit(*args)
+        except BrokenProcessPool:
+            broken, self._executor = self._executor, None
+            broken.shutdown(wait=False, cancel_futures=True)
+            return self._pool().submit(*args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def scenario_path(self, scenario: str) -> Path:
+        """Resolve ``scenario`` inside the data root; raise if it does not exist."""
+
+        path = (self.data_root / f'{scenario}.json').resolve()
+        if path.parent != self.data_root or not path.is_file():
+            raise FileNotFoundError(path)
+        return path
+
+    def _digest(self, path: Path) -> str:
+        mtime = path.stat().st_mtime_ns
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._digests[path] = (mtime, digest)
+        return digest
+
+    def cache_key(self, scenario: str, params: OptimizationParameters) -> str:
+        digest = self._digest(self.scenario_path(scenario))
+        return f"{digest}:{json.dumps(params.to_dict(), sort_keys=True)}"
+
+    def cached(self, key: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def submit(self, scenario: str, params: OptimizationParameters) -> Tuple[SimulationJob, bool]:
+        """Return ``(job, cached)``; a cache hit yields an already finished job."""
+
+        key = self.cache_key(scenario, params)
+        result = self.cached(key)
+        if result is not None:
+            return SimulationJob(job_id='', cache_key=key, result=result, finished_at=time.monotonic()), True
+
+        self.start()
+        with self._lock:
+            self._expire()
+            job_id = self._inflight.get(key)
+            if job_id is not None:
+                return self._jobs[job_id], False
+            job = SimulationJob(job_id=uuid.uuid4().hex, cache_key=key)
+            job.future = self._submit(_run_simulation, scenario, params.to_dict())
+            self._jobs[job.job_id] = job
+            self._inflight[key] = job.job_id
+        job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+        return job, False
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _finish(self, job: SimulationJob, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as exc:  # surfaced through the poll endpoint
+            error, result = str(exc) or exc.__class__.__name__, None
+        else:
+            error = None
+        with self._lock:
+            job.result, job.error = result, error
+            job.finished_at = time.monotonic()
+            job.future = None
+            self._inflight.pop(job.cache_key, None)
+            if result is not None:
+                self._results[job.cache_key] = result
+                if len(self._results) > self.max_cached_results:
+                    self._results.popitem(last=False)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.job_ttl_seconds
+        stale = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
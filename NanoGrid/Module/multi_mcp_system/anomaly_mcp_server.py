@@ -5,6 +5,8 @@ MCP Server for Anomaly Detection Models.
 import asyncio
 import json
 import logging
+import os
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 import numpy as np
 import pandas as pd
@@ -17,10 +19,8 @@ from mcp.types import (
     ListToolsRequest, ListToolsResult, ReadResourceRequest, ReadResourceResult
 )
 
-# Import anomaly detection models
-from models.anomaly_detection.prophet_model import ProphetAnomalyDetector
-from models.anomaly_detection.hmm_model import HMMAnomalyDetector
-from utils.model_utils import ModelEvaluator, ModelManager, ModelSelector
+from utils.backends import BackendRegistry
+from utils.model_utils import ModelEvaluator, ModelManager, ModelSelector, ModelCache, load_server_config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,7 +32,21 @@ server = Server("anomaly-mcp-server")
 # Global variables for model management
 model_manager = ModelManager("anomaly_models")
 model_evaluator = ModelEvaluator()
-active_models = {}
+server_config = load_server_config(Path(__file__).parent / "config" / "anomaly_config.json")
+cache_config = server_config.get("model_cache", {})
+active_models = ModelCache(
+    model_manager, max_bytes=int(cache_config.get("max_memory_mb", 512)) * 1024 * 1024
+)
+
+# Background load of the configured preload_models; kept referenced so the
+# task is not garbage collected before it finishes.
+preload_task: Optional[asyncio.Task] = None
+
+# Anomaly models are imported on first use: Prophet and hmmlearn take
+# seconds, which every stdio spawn of this server would otherwise pay.
+backends = BackendRegistry()
+backends.register("prophet", "models.anomaly_detection.prophet_model", "ProphetAnomalyDetector")
+backends.register("hmm", "models.anomaly_detection.hmm_model", "HMMAnomalyDetector")
 
 
 @server.list_resources()
@@ -300,7 +314,7 @@ async def train_anomaly_model(arguments: Dict[str, Any]) -> List[TextContent]:
     
     # Initialize model
     if model_type == "prophet":
-        model = ProphetAnomalyDetector(
+        model = backends.get("prophet")(
             interval_width=model_params.get("interval_width", 0.99),
             changepoint_range=model_params.get("changepoint_range", 0.8),
             daily_seasonality=model_params.get("daily_seasonality", False),
@@ -309,7 +323,7 @@ async def train_anomaly_model(arguments: Dict[str, Any]) -> List[TextContent]:
             seasonality_mode=model_params.get("seasonality_mode", "multiplicative")
         )
     elif model_type == "hmm":
-        model = HMMAnomalyDetector(
+        model = backends.get("hmm")(
             n_components=model_params.get("n_components", 10),
             covariance_type=model_params.get("covariance_type", "diag"),
             n_iter=model_params.get("n_iter", 1000),
@@ -334,7 +348,7 @@ async def train_anomaly_model(arguments: Dict[str, Any]) -> List[TextContent]:
     }
     
     model_path = model_manager.save_model(model, model_name, metadata)
-    active_models[model_name] = model
+    active_models.put(model_name, model)
     
     # Detect anomalies on training data
     if model_type == "prophet":
@@ -362,12 +376,8 @@ async def detect_anomalies(arguments: Dict[str, Any]) -> List[TextContent]:
     timestamps_json = arguments.get("timestamps")
     threshold = arguments.get("threshold", 0.95)
     
-    # Load model if not active
-    if model_name not in active_models:
-        model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
-    
-    model = active_models[model_name]
+    model = active_models.get(model_name)
+    metadata = model_manager.load_metadata(model_name)
     model_type = metadata.get("model_type", "unknown")
     
     # Parse data
@@ -414,12 +424,8 @@ async def evaluate_anomaly_model(arguments: Dict[str, Any]) -> List[TextContent]
     test_labels_json = arguments["test_labels"]
     threshold = arguments.get("threshold", 0.95)
     
-    # Load model if not active
-    if model_name not in active_models:
-        model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
-    
-    model = active_models[model_name]
+    model = active_models.get(model_name)
+    metadata = model_manager.load_metadata(model_name)
     model_type = metadata.get("model_type", "unknown")
     
     # Parse test data
@@ -508,7 +514,7 @@ async def load_anomaly_model(arguments: Dict[str, Any]) -> List[TextContent]:
     
     try:
         model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
+        active_models.put(model_name, model, model_manager.model_size(model_name) or None)
         
         result = {
             "status": "success",
@@ -534,6 +540,8 @@ async def list_anomaly_models(arguments: Dict[str, Any]) -> List[TextContent]:
         "status": "success",
         "trained_models": trained_models,
         "active_models": active_model_names,
+        "model_cache": active_models.stats(),
+        "backends": backends.status(),
         "available_model_types": [
             "prophet", "hmm", "transformer", "temporal_fusion_transformer"
         ]
@@ -542,8 +550,31 @@ async def list_anomaly_models(arguments: Dict[str, Any]) -> List[TextContent]:
     return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
 
+def _log_preload(task: asyncio.Task) -> None:
+    """Report the outcome of the startup preload."""
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.error(f"Model preload failed: {task.exception()}")
+        return
+    for model_name, status in task.result().items():
+        if status in ("loaded", "cached"):
+            logger.info(f"Preloaded model {model_name} ({status})")
+        else:
+            logger.warning(f"Could not preload model {model_name}: {status}")
+
+
 async def main():
     """Main function to run the MCP server."""
+    global preload_task
+    warm_up = server_config.get("startup", {}).get("warm_up_backends", False)
+    if warm_up or os.getenv("MCP_WARM_UP") == "1":
+        backends.warm_up()
+    
+    if cache_config.get("preload_models"):
+        preload_task = asyncio.create_task(active_models.preload(cache_config["preload_models"]))
+        preload_task.add_done_callback(_log_preload)
+    
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
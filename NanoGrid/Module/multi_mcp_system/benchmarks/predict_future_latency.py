@@ -0,0 +1,87 @@
+"""
+Latency of multi-step forecasting: recursive predict_future vs the direct path.
+
+Trains small LSTM and CNN forecasters on a synthetic daily-seasonal series
+and times ``predict_future`` for a fixed horizon in three configurations:
+
+- recursive: prediction_length=1, one ``model.predict`` call per step
+- direct-1: prediction_length=1, compiled forward pass per step
+- direct-H: prediction_length=horizon, a single compiled forward pass
+
+Usage:
+    python benchmarks/predict_future_latency.py --horizon 168 --repeats 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.forecasting.lstm_model import LSTMForecaster
+from models.forecasting.cnn_model import CNNForecaster
+from utils.data_preprocessing import prepare_forecasting_data
+
+
+def synthetic_series(length: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    series = 10 + 3 * np.sin(2 * np.pi * t / 24) + np.sin(2 * np.pi * t / 168) + rng.normal(0, 0.3, length)
+    return series.reshape(-1, 1).astype(np.float32)
+
+
+def train(model_class, series: np.ndarray, sequence_length: int, prediction_length: int,
+          forecast_mode: str, epochs: int):
+    prepared = prepare_forecasting_data(series, sequence_length, prediction_length)
+    model = model_class(
+        sequence_length=sequence_length,
+        prediction_length=prediction_length,
+        forecast_mode=forecast_mode
+    )
+    model.fit(prepared["train_X"], prepared["train_y"], prepared["val_X"], prepared["val_y"],
+              epochs=epochs, batch_size=64, verbose=0)
+    return model, prepared["scaled_data"][-sequence_length:]
+
+
+def time_predict_future(model, last_sequence: np.ndarray, horizon: int, repeats: int) -> np.ndarray:
+    model.predict_future(last_sequence, horizon)  # warm-up / tracing
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_future(last_sequence, horizon)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--horizon", type=int, default=168)
+    parser.add_argument("--sequence-length", type=int, default=48)
+    parser.add_argument("--length", type=int, default=24 * 120)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    series = synthetic_series(args.length)
+    configs = [
+        ("recursive", 1, "recursive"),
+        ("direct-1", 1, "direct"),
+        (f"direct-{args.horizon}", args.horizon, "direct"),
+    ]
+
+    print(f"horizon={args.horizon} sequence_length={args.sequence_length} repeats={args.repeats}")
+    print(f"{'model':<6} {'mode':<12} {'median ms':>10} {'p95 ms':>10}")
+    for model_class in (LSTMForecaster, CNNForecaster):
+        name = model_class.__name__.replace("Forecaster", "")
+        for label, prediction_length, forecast_mode in configs:
+            model, last_sequence = train(model_class, series, args.sequence_length,
+                                         prediction_length, forecast_mode, args.epochs)
+            timings = time_predict_future(model, last_sequence, args.horizon, args.repeats)
+            print(f"{name:<6} {label:<12} {np.median(timings):>10.1f} {np.percentile(timings, 95):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import-time cost of the MCP servers and of each model backend.
+
+Each module is imported in a fresh interpreter so nothing is shared between
+measurements; the reported time is the median wall time of the import alone
+(interpreter start-up excluded).
+
+Usage:
+    python benchmarks/startup_latency.py --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    ("server", "forecasting_mcp_server"),
+    ("server", "anomaly_mcp_server"),
+    ("backend", "models.forecasting.lstm_model"),
+    ("backend", "models.forecasting.cnn_model"),
+    ("backend", "models.anomaly_detection.prophet_model"),
+    ("backend", "models.anomaly_detection.hmm_model"),
+]
+
+TIMER = (
+    "import importlib, sys, time\n"
+    "start = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def time_import(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER, module],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"repeats={args.repeats}")
+    print(f"{'kind':<8} {'module':<42} {'median ms':>10} {'max ms':>10}")
+    for kind, module in MODULES:
+        try:
+            timings = [time_import(module) * 1000 for _ in range(args.repeats)]
+        except RuntimeError as e:
+            print(f"{kind:<8} {module:<42} failed: {e}")
+            continue
+        print(f"{kind:<8} {module:<42} {statistics.median(timings):>10.1f} {max(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ MCP Server for Time Series Forecasting Models.
 import asyncio
 import json
 import logging
+import os
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 import numpy as np
 import pandas as pd
@@ -17,11 +19,9 @@ from mcp.types import (
     ListToolsRequest, ListToolsResult, ReadResourceRequest, ReadResourceResult
 )
 
-# Import forecasting models
-from models.forecasting.lstm_model import LSTMForecaster, MultiStepLSTMForecaster
-from models.forecasting.cnn_model import CNNForecaster, MultiStepCNNForecaster
+from utils.backends import BackendRegistry
 from utils.data_preprocessing import prepare_forecasting_data, prepare_multivariate_forecasting_data
-from utils.model_utils import ModelEvaluator, ModelManager, ModelSelector
+from utils.model_utils import ModelEvaluator, ModelManager, ModelSelector, ModelCache, load_server_config, batched_multi_horizon
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,7 +33,23 @@ server = Server("forecasting-mcp-server")
 # Global variables for model management
 model_manager = ModelManager("forecasting_models")
 model_evaluator = ModelEvaluator()
-active_models = {}
+server_config = load_server_config(Path(__file__).parent / "config" / "forecasting_config.json")
+cache_config = server_config.get("model_cache", {})
+active_models = ModelCache(
+    model_manager, max_bytes=int(cache_config.get("max_memory_mb", 512)) * 1024 * 1024
+)
+
+# Background load of the configured preload_models; kept referenced so the
+# task is not garbage collected before it finishes.
+preload_task: Optional[asyncio.Task] = None
+
+# Forecasting models are imported on first use: TensorFlow alone takes
+# seconds, which every stdio spawn of this server would otherwise pay.
+backends = BackendRegistry()
+backends.register("lstm", "models.forecasting.lstm_model", "LSTMForecaster")
+backends.register("cnn", "models.forecasting.cnn_model", "CNNForecaster")
+backends.register("multivariate_lstm", "models.forecasting.lstm_model", "MultiStepLSTMForecaster")
+backends.register("multivariate_cnn_lstm", "models.forecasting.cnn_model", "MultiStepCNNForecaster")
 
 
 @server.list_resources()
@@ -134,6 +150,12 @@ async def handle_list_tools() -> List[Tool]:
                         "default": 1,
                         "description": "Length of prediction sequences"
                     },
+                    "forecast_mode": {
+                        "type": "string",
+                        "enum": ["recursive", "direct"],
+                        "default": "recursive",
+                        "description": "Multi-step strategy: 'direct' forecasts prediction_length steps per forward pass"
+                    },
                     "epochs": {
                         "type": "integer",
                         "default": 100,
@@ -175,6 +197,51 @@ async def handle_list_tools() -> List[Tool]:
                 "required": ["model_name", "data"]
             }
         ),
+        Tool(
+            name="batch_predict",
+            description="Forecast many series at once with one batched model call per model",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "series": {
+                        "type": "array",
+                        "description": "Series to forecast; each gives its values inline or as a file reference",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "series_id": {
+                                    "type": "string",
+                                    "description": "Key of this series in the results"
+                                },
+                                "model_name": {
+                                    "type": "string",
+                                    "description": "Model for this series (defaults to the top-level model_name)"
+                                },
+                                "values": {
+                                    "type": "array",
+                                    "description": "Recent values, oldest first (at least sequence_length of them)"
+                                },
+                                "path": {
+                                    "type": "string",
+                                    "description": "Path to a .npy or CSV file with the values instead of inline values"
+                                }
+                            },
+                            "required": ["series_id"]
+                        }
+                    },
+                    "model_name": {
+                        "type": "string",
+                        "description": "Default model for series that do not name one"
+                    },
+                    "steps_ahead": {
+                        "type": "integer",
+                        "default": 1,
+                        "description": "Number of steps to predict ahead"
+                    }
+                },
+                "required": ["series"]
+            }
+        ),
         Tool(
             name="evaluate_forecasting_model",
             description="Evaluate a trained forecasting model",
@@ -256,6 +323,8 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
             return await train_forecasting_model(arguments)
         elif name == "predict_forecasting":
             return await predict_forecasting(arguments)
+        elif name == "batch_predict":
+            return await batch_predict(arguments)
         elif name == "evaluate_forecasting_model":
             return await evaluate_forecasting_model(arguments)
         elif name == "select_best_forecasting_model":
@@ -279,6 +348,7 @@ async def train_forecasting_model(arguments: Dict[str, Any]) -> List[TextContent
     model_name = arguments["model_name"]
     sequence_length = arguments.get("sequence_length", 30)
     prediction_length = arguments.get("prediction_length", 1)
+    forecast_mode = arguments.get("forecast_mode", "recursive")
     epochs = arguments.get("epochs", 100)
     batch_size = arguments.get("batch_size", 32)
     
@@ -302,28 +372,11 @@ async def train_forecasting_model(arguments: Dict[str, Any]) -> List[TextContent
         )
     
     # Initialize model
-    if model_type == "lstm":
-        model = LSTMForecaster(
-            sequence_length=sequence_length,
-            prediction_length=prediction_length
-        )
-    elif model_type == "cnn":
-        model = CNNForecaster(
-            sequence_length=sequence_length,
-            prediction_length=prediction_length
-        )
-    elif model_type == "multivariate_lstm":
-        model = MultiStepLSTMForecaster(
-            sequence_length=sequence_length,
-            prediction_length=prediction_length
-        )
-    elif model_type == "multivariate_cnn_lstm":
-        model = MultiStepCNNForecaster(
-            sequence_length=sequence_length,
-            prediction_length=prediction_length
-        )
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
+    model = backends.get(model_type)(
+        sequence_length=sequence_length,
+        prediction_length=prediction_length,
+        forecast_mode=forecast_mode
+    )
     
     # Train model
     history = model.fit(
@@ -341,12 +394,13 @@ async def train_forecasting_model(arguments: Dict[str, Any]) -> List[TextContent
         "model_type": model_type,
         "sequence_length": sequence_length,
         "prediction_length": prediction_length,
+        "forecast_mode": forecast_mode,
         "data_shape": data.shape,
         "training_history": history
     }
     
     model_path = model_manager.save_model(model, model_name, metadata)
-    active_models[model_name] = model
+    active_models.put(model_name, model)
     
     # Evaluate on test data
     test_predictions = model.predict(prepared_data["test_X"])
@@ -376,12 +430,7 @@ async def predict_forecasting(arguments: Dict[str, Any]) -> List[TextContent]:
     data_json = arguments["data"]
     steps_ahead = arguments.get("steps_ahead", 1)
     
-    # Load model if not active
-    if model_name not in active_models:
-        model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
-    
-    model = active_models[model_name]
+    model = active_models.get(model_name)
     
     # Parse data
     data = json.loads(data_json)
@@ -410,17 +459,117 @@ async def predict_forecasting(arguments: Dict[str, Any]) -> List[TextContent]:
     return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
 
+def _series_values(item: Dict[str, Any]) -> np.ndarray:
+    """Values of one batch_predict series as (length, features)."""
+    if "values" in item:
+        values = np.asarray(item["values"], dtype=np.float32)
+    elif "path" in item:
+        path = item["path"]
+        if path.endswith(".npy"):
+            values = np.load(path, allow_pickle=False).astype(np.float32)
+        else:
+            values = np.loadtxt(path, delimiter=",", dtype=np.float32)
+    else:
+        raise ValueError("Series needs 'values' or 'path'")
+    return values.reshape(len(values), -1)
+
+
+def _predict_group(model_name: str,
+                   members: List,
+                   steps_ahead: int,
+                   results: Dict[str, Any],
+                   errors: Dict[str, str]) -> int:
+    """
+    Forecast every series of one model with a single stacked batch.
+    
+    Series the model cannot take are recorded in ``errors``; forecasts go
+    into ``results`` only once the whole batch has succeeded.
+    
+    Returns:
+        Number of model calls made
+    """
+    model = active_models.get(model_name)
+    
+    # Stack the last sequence_length rows of every usable series.
+    window = model.sequence_length
+    features = members[0][1].shape[1]
+    usable = []
+    for series_id, values in members:
+        if len(values) < window:
+            errors[series_id] = f"Need at least {window} values, got {len(values)}"
+        elif values.shape[1] != features:
+            errors[series_id] = f"Expected {features} features, got {values.shape[1]}"
+        elif steps_ahead > 1 and features != 1:
+            errors[series_id] = "Multi-step forecasts need a univariate series"
+        else:
+            usable.append((series_id, values))
+    if not usable:
+        return 0
+    X = np.empty((len(usable), window, features), dtype=np.float32)
+    for row, (_, values) in enumerate(usable):
+        X[row] = values[-window:]
+    
+    if steps_ahead == 1:
+        predictions = model.predict(X)
+        model_calls = 1
+    else:
+        predictions = batched_multi_horizon(model.predict, X[:, :, 0], model.prediction_length, steps_ahead)
+        model_calls = int(np.ceil(steps_ahead / model.prediction_length))
+    
+    rows = np.asarray(predictions).reshape(len(usable), -1)
+    for (series_id, _), row in zip(usable, rows):
+        results[series_id] = {"model_name": model_name, "predictions": row.tolist()}
+    return model_calls
+
+
+async def batch_predict(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Forecast many series, stacking each model's series into one batch."""
+    steps_ahead = arguments.get("steps_ahead", 1)
+    default_model = arguments.get("model_name")
+    
+    results = {}
+    errors = {}
+    groups: Dict[str, List] = {}
+    for index, item in enumerate(arguments["series"]):
+        series_id = str(item.get("series_id", index))
+        model_name = item.get("model_name", default_model)
+        try:
+            if model_name is None:
+                raise ValueError("No model_name for this series")
+            groups.setdefault(model_name, []).append((series_id, _series_values(item)))
+        except (ValueError, OSError) as e:
+            errors[series_id] = str(e)
+    
+    model_calls = 0
+    for model_name, members in groups.items():
+        try:
+            model_calls += _predict_group(model_name, members, steps_ahead, results, errors)
+        except Exception as e:
+            # One bad model (or a batch it cannot handle) only fails its own series.
+            logger.warning(f"batch_predict failed for model {model_name}: {e}")
+            errors.update(
+                (series_id, f"{type(e).__name__}: {e}")
+                for series_id, _ in members
+                if series_id not in errors
+            )
+    
+    result = {
+        "status": "success" if results or not errors else "error",
+        "steps_ahead": steps_ahead,
+        "model_calls": model_calls,
+        "results": results,
+        "errors": errors
+    }
+    
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
 async def evaluate_forecasting_model(arguments: Dict[str, Any]) -> List[TextContent]:
     """Evaluate a trained model."""
     model_name = arguments["model_name"]
     test_data_json = arguments["test_data"]
     
-    # Load model if not active
-    if model_name not in active_models:
-        model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
-    
-    model = active_models[model_name]
+    model = active_models.get(model_name)
     
     # Parse test data
     test_data = json.loads(test_data_json)
@@ -497,7 +646,7 @@ async def load_forecasting_model(arguments: Dict[str, Any]) -> List[TextContent]
     
     try:
         model, metadata = model_manager.load_model(model_name)
-        active_models[model_name] = model
+        active_models.put(model_name, model, model_manager.model_size(model_name) or None)
         
         result = {
             "status": "success",
@@ -523,6 +672,8 @@ async def list_forecasting_models(arguments: Dict[str, Any]) -> List[TextContent
         "status": "success",
         "trained_models": trained_models,
         "active_models": active_model_names,
+        "model_cache": active_models.stats(),
+        "backends": backends.status(),
         "available_model_types": [
             "lstm", "cnn", "multivariate_lstm", "multivariate_cnn_lstm"
         ]
@@ -531,8 +682,31 @@ async def list_forecasting_models(arguments: Dict[str, Any]) -> List[TextContent
     return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
 
+def _log_preload(task: asyncio.Task) -> None:
+    """Report the outcome of the startup preload."""
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.error(f"Model preload failed: {task.exception()}")
+        return
+    for model_name, status in task.result().items():
+        if status in ("loaded", "cached"):
+            logger.info(f"Preloaded model {model_name} ({status})")
+        else:
+            logger.warning(f"Could not preload model {model_name}: {status}")
+
+
 async def main():
     """Main function to run the MCP server."""
+    global preload_task
+    warm_up = server_config.get("startup", {}).get("warm_up_backends", False)
+    if warm_up or os.getenv("MCP_WARM_UP") == "1":
+        backends.warm_up()
+    
+    if cache_config.get("preload_models"):
+        preload_task = asyncio.create_task(active_models.preload(cache_config["preload_models"]))
+        preload_task.add_done_callback(_log_preload)
+    
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
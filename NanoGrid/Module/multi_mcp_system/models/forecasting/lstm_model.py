@@ -4,12 +4,14 @@ LSTM model for time series forecasting.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Union
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+from utils.data_preprocessing import WindowBatches, as_keras_sequence, to_window_batches
+from utils.model_utils import FORECAST_MODES, direct_multi_horizon
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,7 +24,8 @@ class LSTMForecaster:
                  prediction_length: int = 1,
                  lstm_units: list = [64, 32],
                  dropout: float = 0.2,
-                 learning_rate: float = 0.001):
+                 learning_rate: float = 0.001,
+                 forecast_mode: str = 'recursive'):
         """
         Initialize LSTM forecaster.
         
@@ -32,15 +35,22 @@ class LSTMForecaster:
             lstm_units: List of LSTM units for each layer
             dropout: Dropout rate
             learning_rate: Learning rate for optimizer
+            forecast_mode: How predict_future forecasts several steps:
+                'recursive' (one predict call per step) or 'direct' (one
+                forward pass per prediction_length block, univariate only)
         """
         self.sequence_length = sequence_length
         self.prediction_length = prediction_length
         self.lstm_units = lstm_units
         self.dropout = dropout
         self.learning_rate = learning_rate
+        if forecast_mode not in FORECAST_MODES:
+            raise ValueError(f"forecast_mode must be one of {FORECAST_MODES}, got {forecast_mode!r}")
+        self.forecast_mode = forecast_mode
         self.model = None
         self.is_fitted = False
         self.history = None
+        self._forward = None
         
     def _build_model(self, input_shape: Tuple[int, int]) -> Sequential:
         """Build LSTM model architecture."""
@@ -78,9 +88,9 @@ class LSTMForecaster:
         return model
     
     def fit(self, 
-            X_train: np.ndarray, 
-            y_train: np.ndarray,
-            X_val: Optional[np.ndarray] = None,
+            X_train: Union[np.ndarray, WindowBatches], 
+            y_train: Optional[np.ndarray] = None,
+            X_val: Optional[Union[np.ndarray, WindowBatches]] = None,
             y_val: Optional[np.ndarray] = None,
             epochs: int = 100,
             batch_size: int = 32,
@@ -88,11 +98,14 @@ class LSTMForecaster:
         """
         Train the LSTM model.
         
+        Arrays are fed to Keras one batch at a time through ``WindowBatches``,
+        so X_train/X_val may be window views over a long series.
+        
         Args:
-            X_train: Training input sequences
-            y_train: Training target sequences
-            X_val: Validation input sequences
-            y_val: Validation target sequences
+            X_train: Training input sequences, or a WindowBatches of (X, y)
+            y_train: Training target sequences (omitted with WindowBatches)
+            X_val: Validation input sequences, or a WindowBatches
+            y_val: Validation target sequences (omitted with WindowBatches)
             epochs: Number of training epochs
             batch_size: Batch size
             verbose: Verbosity level
@@ -100,14 +113,19 @@ class LSTMForecaster:
         Returns:
             Training history
         """
+        train_batches = to_window_batches(X_train, y_train, batch_size)
+        val_batches = to_window_batches(X_val, y_val, batch_size)
+        
         # Build model
-        input_shape = (X_train.shape[1], X_train.shape[2])
+        input_shape = train_batches.input_shape[:2]
+        self._check_features(input_shape[1])
         self.model = self._build_model(input_shape)
+        self._forward = None
         
         # Prepare validation data
         validation_data = None
-        if X_val is not None and y_val is not None:
-            validation_data = (X_val, y_val)
+        if val_batches is not None:
+            validation_data = as_keras_sequence(val_batches)
         
         # Callbacks
         callbacks = [
@@ -120,12 +138,13 @@ class LSTMForecaster:
         
         # Train model
         self.history = self.model.fit(
-            X_train, y_train,
+            as_keras_sequence(train_batches),
             validation_data=validation_data,
             epochs=epochs,
-            batch_size=batch_size,
             callbacks=callbacks,
             verbose=verbose,
+            # Keras would otherwise shuffle batch order; window order is
+            # WindowBatches' job (shuffle=False keeps time order).
             shuffle=False
         )
         
@@ -157,18 +176,30 @@ class LSTMForecaster:
                       last_sequence: np.ndarray, 
                       steps: int) -> np.ndarray:
         """
-        Predict future values using recursive prediction.
+        Predict future values.
+        
+        In 'recursive' mode the model is called once per step; in 'direct'
+        mode the output head's prediction_length values come from one
+        compiled forward pass, so a model trained with prediction_length
+        equal to the horizon forecasts it in a single call.
         
         Args:
             last_sequence: Last known sequence
             steps: Number of steps to predict ahead
             
         Returns:
-            Future predictions
+            Future predictions ((steps, 1) in 'direct' mode)
         """
         if not self.is_fitted:
             raise ValueError("Model must be fitted before making predictions.")
         
+        if self.forecast_mode == 'direct':
+            self._check_features(np.shape(last_sequence)[-1] if np.ndim(last_sequence) > 1 else 1)
+            return direct_multi_horizon(
+                self._compiled_forward(), last_sequence,
+                self.sequence_length, self.prediction_length, steps
+            )
+        
         predictions = []
         current_sequence = last_sequence.copy()
         
@@ -194,6 +225,30 @@ class LSTMForecaster:
         
         return np.array(predictions)
     
+    def _compiled_forward(self):
+        """Inference-mode forward pass traced once per input shape."""
+        if self._forward is None:
+            model = self.model
+            self._forward = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+        return self._forward
+    
+    def _check_features(self, n_features: int) -> None:
+        # direct_multi_horizon feeds back a single column of history.
+        if self.forecast_mode == 'direct' and n_features > 1:
+            raise ValueError(f"forecast_mode='direct' needs univariate input, got {n_features} features")
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pickles from before forecast_mode existed forecast recursively.
+        state.setdefault('forecast_mode', 'recursive')
+        state.setdefault('_forward', None)
+        self.__dict__.update(state)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Traced functions cannot be pickled; they are rebuilt on first use.
+        state = self.__dict__.copy()
+        state['_forward'] = None
+        return state
+    
     def get_model_summary(self) -> str:
         """Get model architecture summary."""
         if self.model is None:
@@ -219,6 +274,7 @@ class LSTMForecaster:
     def load_model(self, filepath: str) -> None:
         """Load a pre-trained model."""
         self.model = tf.keras.models.load_model(filepath)
+        self._forward = None
         self.is_fitted = True
 
 
@@ -230,7 +286,8 @@ class MultiStepLSTMForecaster(LSTMForecaster):
                  prediction_length: int = 7,
                  lstm_units: list = [128, 64],
                  dropout: float = 0.2,
-                 learning_rate: float = 0.001):
+                 learning_rate: float = 0.001,
+                 forecast_mode: str = 'recursive'):
         """
         Initialize multi-step LSTM forecaster.
         
@@ -240,13 +297,15 @@ class MultiStepLSTMForecaster(LSTMForecaster):
             lstm_units: List of LSTM units for each layer
             dropout: Dropout rate
             learning_rate: Learning rate for optimizer
+            forecast_mode: 'recursive' or 'direct' (see LSTMForecaster)
         """
         super().__init__(
             sequence_length=sequence_length,
             prediction_length=prediction_length,
             lstm_units=lstm_units,
             dropout=dropout,
-            learning_rate=learning_rate
+            learning_rate=learning_rate,
+            forecast_mode=forecast_mode
         )
     
     def _build_model(self, input_shape: Tuple[int, int]) -> Sequential:
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+if str(PROJECT_PATH) not in sys.path:
+    sys.path.insert(0, str(PROJECT_PATH))
@@ -0,0 +1,81 @@
+import importlib
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import backends
+from utils.backends import BackendRegistry
+
+
+@pytest.fixture
+def imports(monkeypatch):
+    """Modules imported by the registry, in call order; each import is slowed down."""
+    calls = []
+
+    def import_module(name):
+        calls.append(name)
+        time.sleep(0.01)
+        return importlib.import_module(name)
+
+    monkeypatch.setattr(backends, "importlib", SimpleNamespace(import_module=import_module))
+    return calls
+
+
+def registry_with(**specs):
+    registry = BackendRegistry()
+    for name, (module, attribute) in specs.items():
+        registry.register(name, module, attribute)
+    return registry
+
+
+def test_register_does_not_import(imports):
+    registry = registry_with(fraction=("fractions", "Fraction"))
+
+    assert registry.names() == ["fraction"] and imports == []
+    assert registry.status() == {"fraction": {"loaded": False, "import_seconds": None}}
+
+
+def test_get_imports_once(imports):
+    registry = registry_with(fraction=("fractions", "Fraction"))
+
+    first = registry.get("fraction")
+    second = registry.get("fraction")
+
+    assert first is second and first.__name__ == "Fraction"
+    assert imports == ["fractions"]
+    assert registry.is_loaded("fraction") and registry.status()["fraction"]["import_seconds"] > 0
+
+
+def test_concurrent_gets_share_one_import(imports):
+    registry = registry_with(fraction=("fractions", "Fraction"))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("fraction"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and len(set(map(id, results))) == 1
+    assert imports == ["fractions"]
+
+
+def test_unknown_name_lists_registered_types(imports):
+    registry = registry_with(
+        lstm=("models.forecasting.lstm_model", "LSTMForecaster"),
+        cnn=("models.forecasting.cnn_model", "CNNForecaster"),
+    )
+
+    with pytest.raises(ValueError, match=r"Unsupported model type: 'gru'; expected one of \['cnn', 'lstm'\]"):
+        registry.get("gru")
+    assert imports == []
+
+
+def test_warm_up_loads_in_background_and_survives_failures(imports):
+    registry = registry_with(broken=("no_such_backend_module", "Model"), fraction=("fractions", "Fraction"))
+
+    registry.warm_up().join(timeout=10)
+
+    assert registry.is_loaded("fraction") and not registry.is_loaded("broken")
+    assert imports == ["no_such_backend_module", "fractions"]
@@ -0,0 +1,137 @@
+import asyncio
+import importlib
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mcp")
+
+
+class LastValueModel:
+    """Predicts ``scale`` times the last value of every window, recording its batches."""
+
+    def __init__(self, sequence_length=3, prediction_length=1, scale=1.0):
+        self.sequence_length = sequence_length
+        self.prediction_length = prediction_length
+        self.scale = scale
+        self.batches = []
+
+    def predict(self, X):
+        self.batches.append(np.array(X))
+        return np.repeat(X[:, -1:, 0] * self.scale, self.prediction_length, axis=1)
+
+
+class BrokenModel(LastValueModel):
+    def predict(self, X):
+        raise RuntimeError("graph exploded")
+
+
+class FakeCache:
+    def __init__(self, models):
+        self.models = models
+
+    def get(self, model_name):
+        if model_name not in self.models:
+            raise FileNotFoundError(f"Model {model_name} not found")
+        return self.models[model_name]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # The server creates its model directory relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("forecasting_mcp_server")
+
+
+def run(server, monkeypatch, models, arguments):
+    monkeypatch.setattr(server, "active_models", FakeCache(models))
+    [content] = asyncio.run(server.batch_predict(arguments))
+    return json.loads(content.text)
+
+
+def test_series_of_one_model_are_stacked_into_one_call(server, monkeypatch):
+    model = LastValueModel(scale=2.0)
+    result = run(server, monkeypatch, {"m": model}, {
+        "model_name": "m",
+        "series": [
+            {"series_id": "a", "values": [1, 2, 3]},
+            {"series_id": "b", "values": [9, 8, 7, 6, 5]},
+        ],
+    })
+
+    assert result["model_calls"] == 1 and len(model.batches) == 1
+    np.testing.assert_array_equal(model.batches[0][:, :, 0], [[1, 2, 3], [7, 6, 5]])
+    assert result["results"] == {
+        "a": {"model_name": "m", "predictions": [6.0]},
+        "b": {"model_name": "m", "predictions": [10.0]},
+    }
+    assert result["errors"] == {} and result["status"] == "success"
+
+
+def test_series_are_grouped_per_model(server, monkeypatch):
+    first, second = LastValueModel(), LastValueModel(sequence_length=2, scale=-1.0)
+    result = run(server, monkeypatch, {"first": first, "second": second}, {
+        "model_name": "first",
+        "series": [
+            {"series_id": "a", "values": [1, 2, 3]},
+            {"series_id": "b", "model_name": "second", "values": [4, 5]},
+            {"series_id": "c", "values": [[4], [5], [6]]},
+        ],
+    })
+
+    assert result["model_calls"] == 2
+    assert [len(batch) for batch in first.batches] == [2] and [len(batch) for batch in second.batches] == [1]
+    assert {key: value["predictions"] for key, value in result["results"].items()} == {
+        "a": [3.0], "b": [-5.0], "c": [6.0]
+    }
+
+
+def test_multi_step_forecasts_roll_the_whole_batch(server, monkeypatch):
+    model = LastValueModel(prediction_length=2)
+    result = run(server, monkeypatch, {"m": model}, {
+        "model_name": "m",
+        "steps_ahead": 3,
+        "series": [{"series_id": "a", "values": [1, 2, 3]}, {"series_id": "b", "values": [3, 2, 1]}],
+    })
+
+    assert result["model_calls"] == len(model.batches) == 2
+    assert result["results"]["a"]["predictions"] == [3.0, 3.0, 3.0]
+    assert result["results"]["b"]["predictions"] == [1.0, 1.0, 1.0]
+
+
+def test_bad_series_are_reported_one_by_one(server, monkeypatch):
+    result = run(server, monkeypatch, {"m": LastValueModel()}, {
+        "series": [
+            {"series_id": "ok", "model_name": "m", "values": [1, 2, 3]},
+            {"series_id": "short", "model_name": "m", "values": [1, 2]},
+            {"series_id": "wide", "model_name": "m", "values": [[1, 1], [2, 2], [3, 3]]},
+            {"series_id": "empty", "model_name": "m"},
+            {"series_id": "nameless", "values": [1, 2, 3]},
+            {"series_id": "unknown", "model_name": "nope", "values": [1, 2, 3]},
+        ],
+    })
+
+    assert list(result["results"]) == ["ok"]
+    errors = result["errors"]
+    assert errors["short"] == "Need at least 3 values, got 2"
+    assert errors["wide"] == "Expected 1 features, got 2"
+    assert errors["empty"] == "Series needs 'values' or 'path'"
+    assert errors["nameless"] == "No model_name for this series"
+    assert "Model nope not found" in errors["unknown"]
+
+
+def test_failing_model_only_fails_its_own_group(server, monkeypatch):
+    result = run(server, monkeypatch, {"good": LastValueModel(), "bad": BrokenModel()}, {
+        "series": [
+            {"series_id": "a", "model_name": "bad", "values": [1, 2, 3]},
+            {"series_id": "b", "model_name": "bad", "values": [1]},
+            {"series_id": "c", "model_name": "good", "values": [1, 2, 3]},
+        ],
+    })
+
+    assert result["status"] == "success" and list(result["results"]) == ["c"]
+    assert result["errors"] == {
+        "a": "RuntimeError: graph exploded",
+        "b": "Need at least 3 values, got 1",
+    }
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from utils.data_preprocessing import WindowBatches, sliding_windows, to_window_batches
+
+
+def series(length=103, features=2):
+    return np.arange(length * features, dtype=np.float32).reshape(length, features)
+
+
+def test_batches_cover_every_window_in_order():
+    X, y = sliding_windows(series(), 10, 3)
+    batches = WindowBatches(X, y, batch_size=16)
+
+    assert len(batches) == int(np.ceil(len(X) / 16)) == 6
+    stacked_X = np.concatenate([batch_X for batch_X, _ in batches])
+    stacked_y = np.concatenate([batch_y for _, batch_y in batches])
+    np.testing.assert_array_equal(stacked_X, X)
+    np.testing.assert_array_equal(stacked_y, y)
+    last_X, last_y = batches[-1]
+    assert len(last_X) == len(last_y) == len(X) - 5 * 16
+    assert last_X.flags.c_contiguous and last_X.flags.writeable
+
+
+def test_shuffled_batches_reshuffle_on_epoch_end():
+    batches = WindowBatches.from_series(series(), 10, 1, batch_size=8, shuffle=True, seed=0)
+    first = np.concatenate([batch_X[:, 0, 0] for batch_X, _ in batches])
+    batches.on_epoch_end()
+    second = np.concatenate([batch_X[:, 0, 0] for batch_X, _ in batches])
+
+    X, _ = sliding_windows(series(), 10, 1)
+    np.testing.assert_array_equal(np.sort(first), X[:, 0, 0])
+    np.testing.assert_array_equal(np.sort(second), X[:, 0, 0])
+    assert not np.array_equal(first, second)
+    # Targets stay aligned with their windows after shuffling.
+    for batch_X, batch_y in batches:
+        np.testing.assert_array_equal(batch_y[:, 0], batch_X[:, -1] + 2)
+
+
+def test_unshuffled_batches_keep_order_across_epochs():
+    batches = WindowBatches.from_series(series(), 10, 1, batch_size=8)
+    before = [batch_X.copy() for batch_X, _ in batches]
+    batches.on_epoch_end()
+    for expected, (batch_X, _) in zip(before, batches):
+        np.testing.assert_array_equal(batch_X, expected)
+
+
+def test_mismatched_inputs_are_rejected():
+    X, y = sliding_windows(series(), 10, 1)
+    with pytest.raises(ValueError, match="same length"):
+        WindowBatches(X, y[:-1])
+    with pytest.raises(ValueError, match="same length"):
+        to_window_batches(X[:5], y)
+    with pytest.raises(IndexError):
+        WindowBatches(X, y, batch_size=32)[4]
+
+
+def test_to_window_batches_passes_through_and_handles_missing_inputs():
+    X, y = sliding_windows(series(), 10, 1)
+    batches = WindowBatches(X, y)
+    assert to_window_batches(batches, None) is batches
+    assert to_window_batches(None, None) is None
+    assert to_window_batches(X, None) is None
+    assert to_window_batches(X, y, batch_size=7).batch_size == 7
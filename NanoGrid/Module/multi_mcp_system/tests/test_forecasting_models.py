@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from models.forecasting.cnn_model import CNNForecaster
+from models.forecasting.lstm_model import LSTMForecaster
+from utils.data_preprocessing import WindowBatches
+
+
+def wave(length=160):
+    t = np.arange(length)
+    return (0.5 + 0.4 * np.sin(2 * np.pi * t / 24)).reshape(-1, 1).astype(np.float32)
+
+
+class RecordingBatches(WindowBatches):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested = []
+
+    def __getitem__(self, index):
+        self.requested.append(index)
+        return super().__getitem__(index)
+
+
+@pytest.mark.parametrize("model_class", [LSTMForecaster, CNNForecaster])
+def test_fit_reads_batches_in_time_order(model_class):
+    batches = RecordingBatches.from_series(wave(), 30, 1, batch_size=16)
+    model = model_class(sequence_length=30, prediction_length=1)
+    model.fit(batches, epochs=2, verbose=0)
+
+    # Keras may peek at a batch before training; every epoch after that
+    # must read the batches front to back.
+    epochs = batches.requested[-2 * len(batches):]
+    assert epochs == list(range(len(batches))) * 2
+
+
+@pytest.mark.parametrize("model_class", [LSTMForecaster, CNNForecaster])
+def test_direct_and_recursive_forecasts_agree_for_single_step_heads(model_class):
+    series = wave()
+    model = model_class(sequence_length=30, prediction_length=1)
+    model.fit(WindowBatches.from_series(series, 30, 1, batch_size=32), epochs=1, verbose=0)
+    last_sequence = series[-30:]
+
+    recursive = model.predict_future(last_sequence, 5)
+    model.forecast_mode = "direct"
+    direct = model.predict_future(last_sequence, 5)
+
+    assert recursive.shape == direct.shape == (5, 1)
+    np.testing.assert_allclose(direct, recursive, rtol=1e-4, atol=1e-5)
+
+
+@pytest.mark.parametrize("model_class", [LSTMForecaster, CNNForecaster])
+def test_direct_mode_rejects_multivariate_input(model_class):
+    series = np.hstack([wave(), wave()])
+    model = model_class(sequence_length=30, prediction_length=1, forecast_mode="direct")
+
+    with pytest.raises(ValueError, match="univariate"):
+        model.fit(WindowBatches.from_series(series, 30, 1, batch_size=32), epochs=1, verbose=0)
+    assert model.model is None
+
+
+@pytest.mark.parametrize("model_class", [LSTMForecaster, CNNForecaster])
+def test_pickles_without_forecast_mode_default_to_recursive(model_class):
+    legacy = model_class()
+    del legacy.forecast_mode, legacy._forward
+
+    restored = pickle.loads(pickle.dumps(legacy))
+
+    assert restored.forecast_mode == "recursive" and restored._forward is None
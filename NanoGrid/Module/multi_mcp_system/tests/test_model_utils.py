@@ -0,0 +1,98 @@
+import asyncio
+import json
+import pickle
+
+import pytest
+
+from utils.model_utils import ModelCache, ModelManager
+
+
+class Blob:
+    """Picklable stand-in for a non-Keras model."""
+
+    def __init__(self, size):
+        self.payload = b"x" * size
+
+
+def test_legacy_pickles_are_indexed_on_first_run(tmp_path):
+    with open(tmp_path / "old.pkl", "wb") as f:
+        pickle.dump(Blob(10), f)
+    (tmp_path / "new.wrapper.pkl").write_bytes(b"")
+
+    manager = ModelManager(str(tmp_path))
+
+    assert manager.list_models() == ["old"]
+    index = json.loads((tmp_path / ModelManager.INDEX_FILE).read_text())
+    assert index["old"]["format"] == "pickle" and index["old"]["files"] == ["old.pkl"]
+    model, metadata = manager.load_model("old")
+    assert model.payload == b"x" * 10 and metadata == {}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    manager = ModelManager(str(tmp_path))
+    manager.save_model(Blob(100), "blob", {"model_type": "test"})
+
+    model, metadata = manager.load_model("blob")
+
+    assert model.payload == b"x" * 100
+    assert metadata["model_type"] == "test" and metadata["model_format"] == "pickle"
+    assert manager.model_size("blob") >= 100
+    with pytest.raises(FileNotFoundError):
+        manager.load_model("missing")
+
+
+def test_models_saved_by_another_manager_are_found(tmp_path):
+    reader = ModelManager(str(tmp_path))
+    writer = ModelManager(str(tmp_path))
+    reader.save_model(Blob(1), "first")
+
+    writer.save_model(Blob(2), "second")
+
+    model, _ = reader.load_model("second")
+    assert model.payload == b"xx"
+    assert sorted(reader.list_models()) == ["first", "second"]
+    assert sorted(json.loads((tmp_path / ModelManager.INDEX_FILE).read_text())) == ["first", "second"]
+
+
+def cache_with(tmp_path, sizes, max_bytes):
+    manager = ModelManager(str(tmp_path))
+    for name, size in sizes.items():
+        manager.save_model(Blob(size), name)
+    return ModelCache(manager, max_bytes=max_bytes)
+
+
+def test_cache_evicts_least_recently_used_beyond_budget(tmp_path):
+    cache = ModelCache(ModelManager(str(tmp_path)), max_bytes=250)
+    cache.put("a", Blob(0), size_bytes=100)
+    cache.put("b", Blob(0), size_bytes=100)
+    assert cache.get("a") is not None
+
+    cache.put("c", Blob(0), size_bytes=100)
+
+    assert cache.keys() == ["a", "c"] and "b" not in cache
+    assert cache.total_bytes == 200 and cache.evictions == 1
+    cache.put("huge", Blob(0), size_bytes=1000)
+    assert cache.keys() == ["huge"] and cache.total_bytes == 1000
+
+
+def test_cache_loads_misses_through_the_manager(tmp_path):
+    cache = cache_with(tmp_path, {"a": 10}, max_bytes=10_000)
+
+    first = cache.get("a")
+    second = cache.get("a")
+
+    assert first is second
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["models"]["a"]["hits"] == 1 and stats["total_bytes"] == cache.manager.model_size("a")
+
+
+def test_preload_reports_each_model(tmp_path):
+    cache = cache_with(tmp_path, {"a": 10, "b": 10}, max_bytes=10_000)
+    cache.get("a")
+
+    status = asyncio.run(cache.preload(["a", "b", "missing"]))
+
+    assert status["a"] == "cached" and status["b"] == "loaded"
+    assert "missing" in status["missing"]
+    assert sorted(cache.keys()) == ["a", "b"]
@@ -0,0 +1,110 @@
+"""
+Lazily imported model backends for the MCP servers.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackendRegistry:
+    """
+    Model classes registered by import path and imported on first use.
+
+    Importing TensorFlow, Prophet or hmmlearn takes seconds. Servers register
+    only where each model class lives, so tool schemas can be served as soon
+    as the process starts; the first tool call that needs a backend pays its
+    import (or a background warm-up pays it ahead of time).
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._specs: Dict[str, Tuple[str, str]] = {}
+        self._loaded: Dict[str, Any] = {}
+        self.import_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, module: str, attribute: str) -> None:
+        """
+        Register a model class without importing it.
+
+        Args:
+            name: Model type as used in tool arguments
+            module: Dotted module path of the class
+            attribute: Class name within the module
+        """
+        self._specs[name] = (module, attribute)
+
+    def names(self) -> List[str]:
+        """Registered model types."""
+        return list(self._specs)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def get(self, name: str) -> Any:
+        """
+        Return the model class for ``name``, importing its module if needed.
+
+        Args:
+            name: Registered model type
+
+        Returns:
+            The model class
+        """
+        model_class = self._loaded.get(name)
+        if model_class is not None:
+            return model_class
+        if name not in self._specs:
+            raise ValueError(f"Unsupported model type: {name!r}; expected one of {sorted(self._specs)}")
+
+        module_name, attribute = self._specs[name]
+        # Imports are serialised so a warm-up and a tool call never import
+        # the same backend twice; a caller arriving mid-import just waits.
+        with self._lock:
+            if name not in self._loaded:
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                self._loaded[name] = getattr(module, attribute)
+                self.import_seconds[name] = time.perf_counter() - start
+                logger.info(f"Loaded backend {name} from {module_name} in {self.import_seconds[name]:.2f}s")
+        return self._loaded[name]
+
+    def warm_up(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """
+        Import backends in a background thread.
+
+        Args:
+            names: Model types to import (all registered ones by default)
+
+        Returns:
+            The (daemon) warm-up thread
+        """
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            return self._warm_up_thread
+
+        def run():
+            for name in names or self.names():
+                try:
+                    self.get(name)
+                except Exception as e:
+                    logger.warning(f"Warm-up of backend {name} failed: {e}")
+
+        self._warm_up_thread = threading.Thread(target=run, name="backend-warm-up", daemon=True)
+        self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per backend: whether it is imported and how long the import took."""
+        return {
+            name: {
+                "loaded": self.is_loaded(name),
+                "import_seconds": round(self.import_seconds[name], 3) if name in self.import_seconds else None
+            }
+            for name in self._specs
+        }
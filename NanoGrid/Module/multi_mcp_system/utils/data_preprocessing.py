@@ -2,10 +2,11 @@
 Data preprocessing utilities for time series analysis.
 """
 
+import math
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Tuple, List, Optional, Union
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -20,6 +21,8 @@ class TimeSeriesPreprocessor:
         Args:
             scaler_type: Type of scaler ('minmax' or 'standard')
         """
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+        
         self.scaler_type = scaler_type
         self.scaler = MinMaxScaler() if scaler_type == 'minmax' else StandardScaler()
         self.is_fitted = False
@@ -51,6 +54,42 @@ class TimeSeriesPreprocessor:
         return self.scaler.inverse_transform(data)
 
 
+def sliding_windows(data: np.ndarray,
+                    sequence_length: int,
+                    prediction_length: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Create forecasting windows as read-only views of ``data``.
+    
+    No window is copied: ``X[i]`` is ``data[i:i + sequence_length]`` and
+    ``y[i]`` the ``prediction_length`` values that follow it, both sharing
+    memory with ``data``. Copy a window (or use ``WindowBatches``) before
+    writing to it or handing it to code that needs contiguous memory.
+    
+    Args:
+        data: Input time series data (samples,) or (samples, features)
+        sequence_length: Length of input sequences
+        prediction_length: Length of prediction sequences
+        
+    Returns:
+        Tuple of (X, y) views shaped (windows, sequence_length[, features])
+        and (windows, prediction_length[, features])
+    """
+    data = np.asarray(data)
+    n_windows = len(data) - sequence_length - prediction_length + 1
+    if n_windows <= 0:
+        return (np.empty((0, sequence_length) + data.shape[1:], dtype=data.dtype),
+                np.empty((0, prediction_length) + data.shape[1:], dtype=data.dtype))
+    
+    # sliding_window_view appends the window axis last; move it next to the
+    # sample axis so windows read (time, features) like the rows of data.
+    X = sliding_window_view(data, sequence_length, axis=0)[:n_windows]
+    y = sliding_window_view(data[sequence_length:], prediction_length, axis=0)[:n_windows]
+    if data.ndim > 1:
+        X = np.moveaxis(X, -1, 1)
+        y = np.moveaxis(y, -1, 1)
+    return X, y
+
+
 def create_sequences(data: np.ndarray, 
                     sequence_length: int, 
                     prediction_length: int = 1) -> Tuple[np.ndarray, np.ndarray]:
@@ -63,15 +102,10 @@ def create_sequences(data: np.ndarray,
         prediction_length: Length of prediction sequences
         
     Returns:
-        Tuple of (X, y) where X is input sequences and y is target sequences
+        Tuple of (X, y) where X is input sequences and y is target sequences,
+        as read-only views of data (see ``sliding_windows``)
     """
-    X, y = [], []
-    
-    for i in range(len(data) - sequence_length - prediction_length + 1):
-        X.append(data[i:i + sequence_length])
-        y.append(data[i + sequence_length:i + sequence_length + prediction_length])
-    
-    return np.array(X), np.array(y)
+    return sliding_windows(data, sequence_length, prediction_length)
 
 
 def create_multivariate_sequences(data: np.ndarray, 
@@ -86,15 +120,132 @@ def create_multivariate_sequences(data: np.ndarray,
         prediction_length: Length of prediction sequences
         
     Returns:
-        Tuple of (X, y) where X is input sequences and y is target sequences
+        Tuple of (X, y) where X is input sequences and y is target sequences,
+        as read-only views of data (see ``sliding_windows``)
     """
-    X, y = [], []
+    return sliding_windows(data, sequence_length, prediction_length)
+
+
+class WindowBatches:
+    """
+    Mini-batches over (X, y) windows, materialising one batch at a time.
+    
+    Implements the Keras ``Sequence`` protocol (``__len__``, ``__getitem__``,
+    ``on_epoch_end``) without importing TensorFlow; ``as_keras_sequence``
+    wraps it for ``model.fit``. Only the rows of the requested batch are
+    copied, so X and y can be views over a series far larger than memory
+    would allow as a 3-D tensor.
+    """
+    
+    def __init__(self,
+                 X: np.ndarray,
+                 y: np.ndarray,
+                 batch_size: int = 32,
+                 shuffle: bool = False,
+                 seed: Optional[int] = None):
+        """
+        Initialize batches.
+        
+        Args:
+            X: Input sequences (typically views from ``sliding_windows``)
+            y: Target sequences aligned with X
+            batch_size: Batch size
+            shuffle: Whether to shuffle window order every epoch
+            seed: Random seed for shuffling
+        """
+        if len(X) != len(y):
+            raise ValueError(f"X and y must have the same length, got {len(X)} and {len(y)}")
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        self._order = self._rng.permutation(len(X)) if shuffle else None
+    
+    @classmethod
+    def from_series(cls,
+                    data: np.ndarray,
+                    sequence_length: int,
+                    prediction_length: int = 1,
+                    batch_size: int = 32,
+                    shuffle: bool = False,
+                    seed: Optional[int] = None) -> 'WindowBatches':
+        """Batches over the sliding windows of a series."""
+        X, y = sliding_windows(data, sequence_length, prediction_length)
+        return cls(X, y, batch_size=batch_size, shuffle=shuffle, seed=seed)
+    
+    @property
+    def input_shape(self) -> Tuple[int, ...]:
+        """Shape of one input window."""
+        return tuple(self.X.shape[1:])
     
-    for i in range(len(data) - sequence_length - prediction_length + 1):
-        X.append(data[i:i + sequence_length])
-        y.append(data[i + sequence_length:i + sequence_length + prediction_length])
+    def __len__(self) -> int:
+        return math.ceil(len(self.X) / self.batch_size)
+    
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Batch {index} out of range for {len(self)} batches")
+        start = index * self.batch_size
+        stop = min(start + self.batch_size, len(self.X))
+        if self._order is None:
+            rows = slice(start, stop)
+        else:
+            # Sorted rows keep the gather close to sequential memory order.
+            rows = np.sort(self._order[start:stop])
+        return np.ascontiguousarray(self.X[rows]), np.ascontiguousarray(self.y[rows])
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    def on_epoch_end(self) -> None:
+        """Reshuffle window order between epochs."""
+        if self.shuffle:
+            self._order = self._rng.permutation(len(self.X))
+
+
+def to_window_batches(X: Optional[Union[np.ndarray, WindowBatches]],
+                      y: Optional[np.ndarray],
+                      batch_size: int = 32) -> Optional[WindowBatches]:
+    """Normalise model fit inputs to WindowBatches (None when X or y is missing)."""
+    if isinstance(X, WindowBatches):
+        return X
+    if X is None or y is None:
+        return None
+    return WindowBatches(X, y, batch_size=batch_size)
+
+
+_keras_sequence_class = None
+
+
+def as_keras_sequence(batches: WindowBatches):
+    """
+    Wrap ``batches`` in a ``tf.keras.utils.Sequence`` accepted by ``model.fit``.
     
-    return np.array(X), np.array(y)
+    TensorFlow is imported on first use only.
+    """
+    global _keras_sequence_class
+    if _keras_sequence_class is None:
+        import tensorflow as tf
+        
+        class KerasWindowBatches(tf.keras.utils.Sequence):
+            def __init__(self, batches: WindowBatches):
+                super().__init__()
+                self.batches = batches
+            
+            def __len__(self) -> int:
+                return len(self.batches)
+            
+            def __getitem__(self, index: int):
+                return self.batches[index]
+            
+            def on_epoch_end(self) -> None:
+                self.batches.on_epoch_end()
+        
+        _keras_sequence_class = KerasWindowBatches
+    return _keras_sequence_class(batches)
 
 
 def split_time_series(data: Union[np.ndarray, pd.DataFrame], 
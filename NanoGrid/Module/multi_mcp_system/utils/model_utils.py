@@ -5,13 +5,22 @@ Model utility functions for time series analysis.
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Union
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+import asyncio
+import copy
 import json
+import math
 import pickle
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 
+# predict_future strategies of the Keras forecasters
+FORECAST_MODES = ('recursive', 'direct')
+
+
 class ModelEvaluator:
     """Utility class for evaluating time series models."""
     
@@ -27,6 +36,8 @@ class ModelEvaluator:
         Returns:
             Dictionary of metrics
         """
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+        
         # Flatten arrays if needed
         y_true = y_true.flatten()
         y_pred = y_pred.flatten()
@@ -84,8 +95,39 @@ class ModelEvaluator:
         }
 
 
+def _keras_model(model: Any) -> Any:
+    """The Keras model wrapped by a forecaster, or None for other model types."""
+    inner = getattr(model, 'model', None)
+    module = type(inner).__module__
+    if hasattr(inner, 'save') and module.startswith(('keras', 'tensorflow', 'tf_keras')):
+        return inner
+    return None
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """Rough in-memory size of a model: weights for Keras, pickled size otherwise."""
+    keras_model = _keras_model(model)
+    if keras_model is not None:
+        return int(sum(np.prod(w.shape) * w.dtype.size for w in keras_model.get_weights()))
+    try:
+        return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
 class ModelManager:
-    """Utility class for managing model saving and loading."""
+    """
+    Utility class for managing model saving and loading.
+    
+    Keras forecasters are stored natively (``<name>.keras`` holding config
+    and weights) next to a pickle of the wrapper without its Keras objects;
+    other models (hmmlearn, Prophet wrappers) are pickled whole. ``index.json``
+    records every saved model so listing does not touch the model files. The
+    index is re-read before every change and whenever a name is missing, so
+    models saved by another process sharing ``model_dir`` become visible.
+    """
+    
+    INDEX_FILE = "index.json"
     
     def __init__(self, model_dir: str = "models"):
         """
@@ -96,6 +138,41 @@ class ModelManager:
         """
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+    
+    def _read_index(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        index_path = self.model_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return None
+        with open(index_path, 'r') as f:
+            return json.load(f)
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        index = self._read_index()
+        if index is not None:
+            return index
+        
+        # First run on an existing directory: register the legacy pickles.
+        index = {}
+        for model_path in self.model_dir.glob("*.pkl"):
+            if model_path.name.endswith(".wrapper.pkl"):
+                continue
+            index[model_path.stem] = {
+                'format': 'pickle',
+                'files': [model_path.name],
+                'size_bytes': model_path.stat().st_size,
+                'saved_at': model_path.stat().st_mtime
+            }
+        if index:
+            self._write_index(index)
+        return index
+    
+    def _write_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = self.model_dir / (self.INDEX_FILE + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.model_dir / self.INDEX_FILE)
     
     def save_model(self, model: Any, model_name: str, metadata: Dict[str, Any] = None) -> str:
         """
@@ -109,12 +186,30 @@ class ModelManager:
         Returns:
             Path to saved model
         """
-        model_path = self.model_dir / f"{model_name}.pkl"
         metadata_path = self.model_dir / f"{model_name}_metadata.json"
+        keras_model = _keras_model(model)
+        
+        if keras_model is not None:
+            model_path = self.model_dir / f"{model_name}.keras"
+            wrapper_path = self.model_dir / f"{model_name}.wrapper.pkl"
+            keras_model.save(model_path)
+            
+            # The training History keeps a reference to the Keras model.
+            wrapper = copy.copy(model)
+            wrapper.model = None
+            if hasattr(wrapper, 'history'):
+                wrapper.history = None
+            with open(wrapper_path, 'wb') as f:
+                pickle.dump(wrapper, f)
+            entry = {'format': 'keras', 'files': [model_path.name, wrapper_path.name]}
+        else:
+            model_path = self.model_dir / f"{model_name}.pkl"
+            with open(model_path, 'wb') as f:
+                pickle.dump(model, f)
+            entry = {'format': 'pickle', 'files': [model_path.name]}
         
-        # Save model
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
+        entry['size_bytes'] = estimate_model_bytes(model)
+        entry['saved_at'] = time.time()
         
         # Save metadata
         if metadata is None:
@@ -122,9 +217,15 @@ class ModelManager:
         
         metadata['model_name'] = model_name
         metadata['model_path'] = str(model_path)
+        metadata['model_format'] = entry['format']
         
         with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+            json.dump(metadata, f, indent=2, default=str)
+        
+        with self._lock:
+            self.index = self._read_index() or self.index
+            self.index[model_name] = entry
+            self._write_index(self.index)
         
         return str(model_path)
     
@@ -138,23 +239,47 @@ class ModelManager:
         Returns:
             Tuple of (model, metadata)
         """
-        model_path = self.model_dir / f"{model_name}.pkl"
-        metadata_path = self.model_dir / f"{model_name}_metadata.json"
-        
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model {model_name} not found at {model_path}")
+        entry = self._entry(model_name)
+        if entry is None:
+            raise FileNotFoundError(f"Model {model_name} not found in {self.model_dir}")
         
-        # Load model
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        files = [self.model_dir / name for name in entry['files']]
+        missing = [str(path) for path in files if not path.exists()]
+        if missing:
+            raise FileNotFoundError(f"Model {model_name} is missing {', '.join(missing)}")
         
-        # Load metadata
-        metadata = {}
-        if metadata_path.exists():
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+        if entry['format'] == 'keras':
+            from tensorflow import keras
+            
+            with open(files[1], 'rb') as f:
+                model = pickle.load(f)
+            model.model = keras.models.load_model(files[0])
+        else:
+            with open(files[0], 'rb') as f:
+                model = pickle.load(f)
         
-        return model, metadata
+        return model, self.load_metadata(model_name)
+    
+    def _entry(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Index entry of a model, re-reading index.json if it is not known yet."""
+        with self._lock:
+            entry = self.index.get(model_name)
+            if entry is None:
+                self.index = self._read_index() or self.index
+                entry = self.index.get(model_name)
+            return entry
+    
+    def load_metadata(self, model_name: str) -> Dict[str, Any]:
+        """Metadata saved with a model ({} if there is none)."""
+        metadata_path = self.model_dir / f"{model_name}_metadata.json"
+        if not metadata_path.exists():
+            return {}
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    
+    def model_size(self, model_name: str) -> int:
+        """Estimated in-memory size recorded when the model was saved."""
+        return int((self._entry(model_name) or {}).get('size_bytes', 0))
     
     def list_models(self) -> List[str]:
         """
@@ -163,8 +288,129 @@ class ModelManager:
         Returns:
             List of model names
         """
-        model_files = list(self.model_dir.glob("*.pkl"))
-        return [f.stem for f in model_files]
+        with self._lock:
+            self.index = self._read_index() or self.index
+            return list(self.index)
+
+
+class ModelCache:
+    """
+    LRU cache of loaded models in front of a ModelManager, capped by memory.
+    
+    Model sizes are estimates (Keras weight bytes, pickled size otherwise).
+    When the total exceeds ``max_bytes`` the least recently used models are
+    evicted, except the one just added. Supports ``name in cache`` and
+    ``cache.keys()`` like the plain dict it replaces.
+    """
+    
+    def __init__(self, manager: ModelManager, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize model cache.
+        
+        Args:
+            manager: Model manager to load misses from
+            max_bytes: Memory budget for cached models
+        """
+        self.manager = manager
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._hit_counts: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def __contains__(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name in self._models
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+    
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._models)
+    
+    def get(self, model_name: str) -> Any:
+        """Return a model, loading it through the manager on a miss."""
+        with self._lock:
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                self.hits += 1
+                self._hit_counts[model_name] = self._hit_counts.get(model_name, 0) + 1
+                return self._models[model_name]
+            self.misses += 1
+        
+        model, _ = self.manager.load_model(model_name)
+        self.put(model_name, model, self.manager.model_size(model_name) or None)
+        return model
+    
+    def put(self, model_name: str, model: Any, size_bytes: Optional[int] = None) -> None:
+        """Add or replace a model, evicting cold models beyond the budget."""
+        if size_bytes is None:
+            size_bytes = estimate_model_bytes(model)
+        with self._lock:
+            self.discard(model_name)
+            self._models[model_name] = model
+            self._sizes[model_name] = size_bytes
+            self._hit_counts.setdefault(model_name, 0)
+            self.total_bytes += size_bytes
+            while self.total_bytes > self.max_bytes and len(self._models) > 1:
+                evicted, _ = self._models.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+    
+    def discard(self, model_name: str) -> None:
+        with self._lock:
+            if self._models.pop(model_name, None) is not None:
+                self.total_bytes -= self._sizes.pop(model_name)
+    
+    async def preload(self, model_names: List[str]) -> Dict[str, str]:
+        """
+        Load models in a worker thread without blocking the event loop.
+        
+        Returns:
+            Status per model: 'loaded', 'cached' or the error message
+        """
+        status = {}
+        for model_name in model_names:
+            if model_name in self:
+                status[model_name] = 'cached'
+                continue
+            try:
+                await asyncio.to_thread(self.get, model_name)
+                status[model_name] = 'loaded'
+            except Exception as e:
+                status[model_name] = str(e)
+        return status
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache totals and per-model size and hit counts, hottest first."""
+        with self._lock:
+            models = {
+                name: {'size_bytes': self._sizes[name], 'hits': self._hit_counts.get(name, 0)}
+                for name in reversed(self._models)
+            }
+            return {
+                'models': models,
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+def load_server_config(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """A server's JSON config ({} if unreadable)."""
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
 class ModelSelector:
@@ -233,6 +479,67 @@ class ModelSelector:
             return "hmm"
 
 
+def direct_multi_horizon(forward,
+                         last_sequence: np.ndarray,
+                         sequence_length: int,
+                         block_length: int,
+                         steps: int) -> np.ndarray:
+    """
+    Multi-horizon forecast from a model with a ``block_length``-wide output head.
+    
+    Each forward pass yields ``block_length`` future values, so a model
+    trained with ``prediction_length >= steps`` answers in one pass; longer
+    horizons feed whole blocks back through a buffer allocated once up front.
+    
+    Args:
+        forward: Callable mapping a (1, sequence_length, 1) float32 array to
+            (1, block_length) predictions
+        last_sequence: Last known values (univariate)
+        sequence_length: Model input length
+        block_length: Values produced per forward pass (the model's prediction_length)
+        steps: Number of steps to predict ahead
+        
+    Returns:
+        Predictions of shape (steps, 1)
+    """
+    history = np.asarray(last_sequence, dtype=np.float32).reshape(-1)
+    if len(history) < sequence_length:
+        raise ValueError(f"Need at least {sequence_length} values, got {len(history)}")
+    
+    windows = history[-sequence_length:].reshape(1, sequence_length)
+    return batched_multi_horizon(forward, windows, block_length, steps).reshape(steps, 1)
+
+
+def batched_multi_horizon(forward,
+                          windows: np.ndarray,
+                          block_length: int,
+                          steps: int) -> np.ndarray:
+    """
+    Roll many univariate series forward together, one forward pass per block.
+    
+    Args:
+        forward: Callable mapping a (n, sequence_length, 1) float32 array to
+            (n, block_length) predictions
+        windows: Last sequence_length values of each series, shape (n, sequence_length)
+        block_length: Values produced per forward pass (the model's prediction_length)
+        steps: Number of steps to predict ahead
+        
+    Returns:
+        Predictions of shape (n, steps)
+    """
+    n_series, sequence_length = windows.shape
+    blocks = math.ceil(steps / block_length)
+    buffer = np.empty((n_series, sequence_length + blocks * block_length), dtype=np.float32)
+    buffer[:, :sequence_length] = windows
+    for block in range(blocks):
+        start = block * block_length
+        window = buffer[:, start:start + sequence_length, np.newaxis]
+        output = np.asarray(forward(window)).reshape(n_series, -1)
+        buffer[:, sequence_length + start:sequence_length + start + block_length] = output[:, :block_length]
+    
+    return buffer[:, sequence_length:sequence_length + steps].copy()
+
+
 def create_model_config(model_type: str, 
                        data_shape: tuple,
                        **kwargs) -> Dict[str, Any]:
@@ -2,7 +2,10 @@ from fastapi import FastAPI
 import os, httpx
 from datetime import datetime
 
-app = FastAPI(title="NanoGrid Gateway")
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
 
 DT = os.getenv("DT_URL","http://dt:8001")
 EOP = os.getenv("EOP_URL","http://eop:8002")
@@ -10,12 +13,96 @@ FORECAST = os.getenv("FORECAST_URL","http://forecast:8003")
 MON = os.getenv("MON_URL","http://monitoring:8004")
 ENG = os.getenv("ENG_URL","http://engagement:8005")
 
+# Per-upstream request timeout in seconds, overridable as e.g. DT_TIMEOUT=1.5
+UPSTREAMS = {
+    "dt": (DT, float(os.getenv("DT_TIMEOUT", "2"))),
+    "eop": (EOP, float(os.getenv("EOP_TIMEOUT", "5"))),
+    "forecast": (FORECAST, float(os.getenv("FORECAST_TIMEOUT", "3"))),
+    "monitoring": (MON, float(os.getenv("MON_TIMEOUT", "2"))),
+    "engagement": (ENG, float(os.getenv("ENG_TIMEOUT", "2"))),
+}
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+    keepalive_expiry=30,
+)
+
+CLIENTS: dict[str, httpx.AsyncClient] = {}
+INFLIGHT: dict[tuple, asyncio.Task] = {}
+# Only calls that are safe to answer with another caller's response are shared.
+COALESCED_METHODS = {"GET", "HEAD"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for name, (url, timeout) in UPSTREAMS.items():
+        CLIENTS[name] = httpx.AsyncClient(base_url=url, timeout=timeout, limits=POOL_LIMITS)
+    try:
+        yield
+    finally:
+        clients = list(CLIENTS.values())
+        CLIENTS.clear()
+        await asyncio.gather(*(c.aclose() for c in clients))
+
+app = FastAPI(title="NanoGrid Gateway", lifespan=lifespan)
+
 @app.get("/health")
 def health():
     return {"service":"gateway","status":"ok","ts": datetime.utcnow().isoformat()}
 
+async def _send(upstream: str, method: str, path: str, params=None, body=None):
+    r = await CLIENTS[upstream].request(method, path, params=params, json=body)
+    r.raise_for_status()
+    return r.json()
+
+async def call(upstream: str, method: str, path: str, params=None, body=None):
+    """Call an upstream over its pooled client; identical in-flight GETs share one request."""
+    if method.upper() not in COALESCED_METHODS:
+        return await _send(upstream, method, path, params, body)
+    key = (upstream, method, path, json.dumps(params, sort_keys=True), json.dumps(body, sort_keys=True, default=str))
+    task = INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_send(upstream, method, path, params, body))
+        INFLIGHT[key] = task
+        task.add_done_callback(lambda _: INFLIGHT.pop(key, None))
+    # shield: one caller going away must not cancel the request for the others
+    return await asyncio.shield(task)
+
+async def _part(name: str, coro):
+    try:
+        return name, await coro, None
+    except httpx.TimeoutException:
+        return name, None, "timeout"
+    except httpx.HTTPStatusError as e:
+        return name, None, f"upstream returned {e.response.status_code}"
+    except (httpx.HTTPError, ValueError) as e:
+        return name, None, str(e) or e.__class__.__name__
+
 @app.get("/probe")
 async def probe():
-    async with httpx.AsyncClient(timeout=3) as client:
-        r = await client.get(f"{DT}/health")
-        return {"dt": r.json()}
+    parts = await asyncio.gather(*(_part(name, call(name, "GET", "/health")) for name in UPSTREAMS))
+    return {name: data if error is None else {"status": "down", "error": error} for name, data, error in parts}
+
+@app.get("/sites/{siteId}/overview")
+async def site_overview(siteId: str, window: str = "PT1H", horizon: str = "PT24H", granularityMin: int = 60):
+    forecast_req = {"siteId": siteId, "horizon": horizon, "granularityMin": granularityMin, "features": {}}
+    parts = await asyncio.gather(
+        _part("topology", call("dt", "GET", f"/topology/{siteId}")),
+        _part("load", call("forecast", "POST", "/forecast/load", body=forecast_req)),
+        _part("pv", call("forecast", "POST", "/forecast/pv", body=forecast_req)),
+        _part("kpis", call("monitoring", "GET", "/kpis", params={"siteId": siteId, "window": window})),
+        _part("nudges", call("engagement", "GET", "/nudges", params={"siteId": siteId})),
+    )
+    results = {name: data for name, data, _ in parts}
+    errors = {name: error for name, _, error in parts if error is not None}
+    if len(errors) == len(parts):
+        raise HTTPException(status_code=502, detail={"siteId": siteId, "errors": errors})
+    return {
+        "siteId": siteId,
+        "topology": results["topology"],
+        "forecast": {"load": results["load"], "pv": results["pv"]},
+        "kpis": results["kpis"],
+        "nudges": results["nudges"],
+        "partial": bool(errors),
+        "errors": errors,
+    }
@@ -0,0 +1,148 @@
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+# Every service's app module is named main; load this one under its own name.
+_spec = importlib.util.spec_from_file_location("gateway_main", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+
+class Upstream:
+    """Mock transport that records requests and holds them until released."""
+
+    def __init__(self, respond=None):
+        self.requests = []
+        self.release = asyncio.Event()
+        self.respond = respond or (lambda request: httpx.Response(200, json={"path": request.url.path}))
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        await self.release.wait()
+        return self.respond(request)
+
+
+def mock_client(name, upstream):
+    url, timeout = main.UPSTREAMS[name]
+    return httpx.AsyncClient(base_url=url, timeout=timeout, transport=httpx.MockTransport(upstream))
+
+
+async def concurrent_calls(method, body=None, callers=5):
+    upstream = Upstream()
+    main.CLIENTS["dt"] = mock_client("dt", upstream)
+    try:
+        calls = [asyncio.ensure_future(main.call("dt", method, "/topology/s1", body=body)) for _ in range(callers)]
+        await asyncio.sleep(0.01)
+        upstream.release.set()
+        return upstream, await asyncio.gather(*calls)
+    finally:
+        await main.CLIENTS.pop("dt").aclose()
+
+
+def test_concurrent_identical_gets_share_one_upstream_call():
+    upstream, results = asyncio.run(concurrent_calls("GET"))
+
+    assert len(upstream.requests) == 1
+    assert results == [{"path": "/topology/s1"}] * 5
+    assert main.INFLIGHT == {}
+
+
+def test_posts_are_never_coalesced():
+    upstream, results = asyncio.run(concurrent_calls("POST", body={"siteId": "s1"}))
+
+    assert len(upstream.requests) == 5
+    assert all(json.loads(request.content) == {"siteId": "s1"} for request in upstream.requests)
+    assert results == [{"path": "/topology/s1"}] * 5
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def scenario():
+        upstream = Upstream()
+        main.CLIENTS["dt"] = mock_client("dt", upstream)
+        try:
+            first = asyncio.ensure_future(main.call("dt", "GET", "/health"))
+            second = asyncio.ensure_future(main.call("dt", "GET", "/health"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            upstream.release.set()
+            return upstream, await second
+        finally:
+            await main.CLIENTS.pop("dt").aclose()
+
+    upstream, result = asyncio.run(scenario())
+
+    assert len(upstream.requests) == 1 and result == {"path": "/health"}
+
+
+def test_lifespan_opens_one_pooled_client_per_upstream():
+    with TestClient(main.app):
+        clients = dict(main.CLIENTS)
+        assert set(clients) == set(main.UPSTREAMS)
+        for name, client in clients.items():
+            url, timeout = main.UPSTREAMS[name]
+            assert str(client.base_url).rstrip("/") == url
+            assert client.timeout.read == timeout
+    assert main.CLIENTS == {} and all(client.is_closed for client in clients.values())
+
+
+def overview_responses(failing=()):
+    def respond(request):
+        host = request.url.host
+        if host in failing:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"host": host, "path": request.url.path, "query": str(request.url.query, "ascii")})
+
+    return respond
+
+
+def get_overview(monkeypatch, respond):
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.url.host, request.url.path))
+        return respond(request)
+
+    client_class = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    with TestClient(main.app) as client:
+        response = client.get("/sites/s1/overview", params={"window": "PT15M"})
+    return response, sorted(seen)
+
+
+def test_overview_fans_out_to_every_upstream(monkeypatch):
+    response, seen = get_overview(monkeypatch, overview_responses())
+
+    assert response.status_code == 200
+    assert seen == [
+        ("GET", "dt", "/topology/s1"),
+        ("GET", "engagement", "/nudges"),
+        ("GET", "monitoring", "/kpis"),
+        ("POST", "forecast", "/forecast/load"),
+        ("POST", "forecast", "/forecast/pv"),
+    ]
+    body = response.json()
+    assert body["partial"] is False and body["errors"] == {}
+    assert body["kpis"]["query"] == "siteId=s1&window=PT15M"
+    assert body["forecast"]["pv"]["path"] == "/forecast/pv"
+
+
+def test_overview_reports_failed_parts(monkeypatch):
+    response, _ = get_overview(monkeypatch, overview_responses(failing={"engagement", "monitoring"}))
+
+    body = response.json()
+    assert body["partial"] is True
+    assert body["errors"] == {"kpis": "upstream returned 503", "nudges": "upstream returned 503"}
+    assert body["kpis"] is None and body["topology"]["path"] == "/topology/s1"
+
+
+def test_overview_fails_when_every_upstream_fails(monkeypatch):
+    response, _ = get_overview(monkeypatch, overview_responses(failing=set(main.UPSTREAMS)))
+
+    assert response.status_code == 502
+    assert set(response.json()["detail"]["errors"]) == {"topology", "load", "pv", "kpis", "nudges"}
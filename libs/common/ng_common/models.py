@@ -1,12 +1,106 @@
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime, timedelta
+import json
+
+try:  # optional fast codecs, see the "fast" extra
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
 
 class TimePoint(BaseModel):
     t: datetime
     y: float
     pi: Optional[List[float]] = None
 
+def _check_lengths(y: list, pi: Optional[list]) -> None:
+    if pi is not None and len(pi) != len(y):
+        raise ValueError(f"pi has {len(pi)} rows for {len(y)} values")
+
+class TimeSeries(BaseModel):
+    """A regular series as columns: point ``i`` is at ``start + i * step`` seconds.
+
+    ``pi`` is either absent or holds one interval row per point, as in
+    ``TimePoint.pi``. Use this instead of ``list[TimePoint]`` for long series.
+    ``ValueError`` is raised when ``pi`` and ``y`` differ in length.
+    """
+    start: datetime
+    step: float
+    y: List[float]
+    pi: Optional[List[List[float]]] = None
+
+    @model_validator(mode="after")
+    def _matching_lengths(self) -> "TimeSeries":
+        _check_lengths(self.y, self.pi)
+        return self
+
+    @classmethod
+    def from_arrays(cls, start: datetime, step: float, y, pi=None) -> "TimeSeries":
+        """Build from trusted lists or NumPy arrays, only checking their lengths."""
+        y = y.tolist() if hasattr(y, "tolist") else list(y)
+        if pi is not None:
+            pi = pi.tolist() if hasattr(pi, "tolist") else [list(row) for row in pi]
+        _check_lengths(y, pi)
+        return cls.model_construct(start=start, step=float(step), y=y, pi=pi)
+
+    @classmethod
+    def from_points(cls, points: List[TimePoint]) -> "TimeSeries":
+        """Columnar copy of ``points``; they must be evenly spaced and all or none carry ``pi``."""
+        points = [p if isinstance(p, TimePoint) else TimePoint.model_validate(p) for p in points]
+        if not points:
+            raise ValueError("Cannot build a TimeSeries from no points")
+        # Compare offsets in whole microseconds: float seconds are not exact
+        # for sub-second steps.
+        micro = timedelta(microseconds=1)
+        start = points[0].t
+        step_us = (points[1].t - start) // micro if len(points) > 1 else 0
+        step = step_us / 1e6
+        for i, p in enumerate(points):
+            if (p.t - start) // micro != i * step_us:
+                raise ValueError(f"Point {i} at {p.t.isoformat()} breaks the {step}s spacing")
+        with_pi = sum(p.pi is not None for p in points)
+        if with_pi not in (0, len(points)):
+            raise ValueError("Either every point or no point must carry pi")
+        return cls.from_arrays(start, step, [p.y for p in points], [p.pi for p in points] if with_pi else None)
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def times(self) -> List[datetime]:
+        return [self.start + timedelta(seconds=i * self.step) for i in range(len(self.y))]
+
+    def to_points(self) -> List[TimePoint]:
+        pis = self.pi if self.pi is not None else [None] * len(self.y)
+        return [TimePoint.model_construct(t=t, y=y, pi=pi) for t, y, pi in zip(self.times(), self.y, pis)]
+
+    def to_wire(self) -> dict:
+        return {"start": self.start.isoformat(), "step": self.step, "y": self.y, "pi": self.pi}
+
+    def to_json(self) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(self.to_wire())
+        return json.dumps(self.to_wire(), separators=(",", ":")).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "TimeSeries":
+        return cls.model_validate(orjson.loads(data) if orjson is not None else json.loads(data))
+
+    def to_msgpack(self) -> bytes:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed; install ng-common[fast]")
+        return msgpack.packb(self.to_wire(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "TimeSeries":
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed; install ng-common[fast]")
+        return cls.model_validate(msgpack.unpackb(data, raw=False))
+
 class ForecastRequest(BaseModel):
     siteId: str
     horizon: str
@@ -17,6 +111,7 @@ class PlanConstraints(BaseModel):
     contractDemandKw: float | None = None
     ess: Optional[dict] = None
     hvac: Optional[dict] = None
+    ev: Optional[dict] = None
 
 class DRProgram(BaseModel):
     eventId: str
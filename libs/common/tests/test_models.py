@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ng_common.models import TimePoint, TimeSeries
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def points(step, count, pi=True):
+    return [
+        TimePoint(t=START + i * step, y=float(i), pi=[i - 1.0, i + 1.0] if pi else None)
+        for i in range(count)
+    ]
+
+
+def test_from_points_round_trips():
+    series = TimeSeries.from_points(points(timedelta(minutes=15), 4))
+
+    assert series.step == 900.0 and series.y == [0.0, 1.0, 2.0, 3.0]
+    assert series.to_points() == points(timedelta(minutes=15), 4)
+
+
+def test_from_points_accepts_sub_second_spacing():
+    step = timedelta(milliseconds=100)
+    series = TimeSeries.from_points(points(step, 50, pi=False))
+
+    assert series.step == 0.1 and series.pi is None
+    assert series.times() == [START + i * step for i in range(50)]
+
+
+def test_from_points_rejects_uneven_spacing_and_partial_pi():
+    uneven = points(timedelta(seconds=1), 3)
+    uneven[2] = TimePoint(t=START + timedelta(seconds=2, microseconds=1), y=2.0, pi=[1.0, 3.0])
+    partial = points(timedelta(seconds=1), 3)
+    partial[1] = TimePoint(t=partial[1].t, y=1.0)
+
+    with pytest.raises(ValueError, match="spacing"):
+        TimeSeries.from_points(uneven)
+    with pytest.raises(ValueError, match="pi"):
+        TimeSeries.from_points(partial)
+    with pytest.raises(ValueError, match="no points"):
+        TimeSeries.from_points([])
+
+
+def test_pi_must_match_y_in_length():
+    with pytest.raises(ValueError, match="2 rows for 3 values"):
+        TimeSeries(start=START, step=60.0, y=[1.0, 2.0, 3.0], pi=[[0.0, 1.0], [1.0, 2.0]])
+    with pytest.raises(ValueError, match="1 rows for 2 values"):
+        TimeSeries.from_arrays(START, 60.0, [1.0, 2.0], [[0.0, 1.0]])
+
+    assert len(TimeSeries(start=START, step=60.0, y=[1.0, 2.0])) == 2
+
+
+def test_json_round_trip():
+    series = TimeSeries.from_arrays(START, 60.0, [1.5, 2.5], [[1.0, 2.0], [2.0, 3.0]])
+
+    assert TimeSeries.from_json(series.to_json()) == series
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    series = TimeSeries.from_arrays(START, 0.5, [1.5, 2.5])
+
+    assert TimeSeries.from_msgpack(series.to_msgpack()) == series
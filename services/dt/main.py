@@ -1,38 +1,109 @@
 from fastapi import FastAPI
-    from datetime import datetime
-    from typing import List
-    from pydantic import BaseModel
-    from ng_common.models import *
-    import os
+from datetime import datetime, timezone
+from typing import List
+from pydantic import BaseModel
+from ng_common.models import *
+import os
 
-    app = FastAPI(title="NanoGrid Dt Service")
+app = FastAPI(title="NanoGrid Dt Service")
 
-    @app.get("/health")
-    def health():
-        return {"service":"dt","status":"ok","ts": datetime.utcnow().isoformat()}
+@app.get("/health")
+def health():
+    return {"service":"dt","status":"ok","ts": datetime.utcnow().isoformat()}
 
 
-from fastapi import Body
-ASSETS = {}
+from fastapi import Body, HTTPException, Request, Response
+from registry import AssetRegistry, UnknownAsset
+from state import AssetStateStore
+
+REGISTRY = AssetRegistry()
+STATES = AssetStateStore(history_size=int(os.getenv("STATE_HISTORY_SIZE", "256")))
 CONSTRAINTS = {}
 
+class TopologyEdge(BaseModel):
+    source: str
+    target: str
+    kind: str = "electrical"
+    meta: dict = {}
+
 @app.post("/assets", response_model=Asset)
 def create_asset(a: Asset):
-    ASSETS[a.assetId] = a.model_dump()
+    REGISTRY.upsert(a.model_dump())
     return a
 
+@app.delete("/assets/{asset_id}")
+def delete_asset(asset_id: str):
+    try:
+        REGISTRY.remove(asset_id)
+    except UnknownAsset:
+        raise HTTPException(status_code=404, detail=f"Unknown asset {asset_id}")
+    STATES.remove(asset_id)
+    return {"ok": True}
+
+@app.get("/sites/{siteId}/assets", response_model=list[Asset])
+def site_assets(siteId: str, type: str | None = None):
+    return REGISTRY.site_assets(siteId, type)
+
+def _state_row(s: AssetState, asset_id: str) -> dict:
+    row = s.model_dump(exclude_none=True)
+    # Naive timestamps are UTC, not server-local time.
+    ts = s.ts if s.ts.tzinfo else s.ts.replace(tzinfo=timezone.utc)
+    row["assetId"], row["ts"] = asset_id, ts.timestamp()
+    return row
+
 @app.patch("/assets/{asset_id}/state")
 def patch_state(asset_id: str, s: AssetState):
-    return {"ok": True, "assetId": asset_id, "state": s.model_dump()}
+    if REGISTRY.get(asset_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown asset {asset_id}")
+    applied = STATES.update_many([_state_row(s, asset_id)])
+    return {"ok": True, "assetId": asset_id, "applied": bool(applied), "state": s.model_dump()}
+
+@app.post("/assets/state")
+def bulk_state(states: list[AssetState]):
+    known = [s for s in states if REGISTRY.get(s.assetId) is not None]
+    applied = STATES.update_many([_state_row(s, s.assetId) for s in known])
+    unknown = sorted({s.assetId for s in states} - {s.assetId for s in known})
+    return {"ok": True, "applied": applied, "stale": len(known) - applied, "unknown": unknown}
+
+@app.get("/assets/{asset_id}/history")
+def state_history(asset_id: str, limit: int | None = None):
+    if REGISTRY.get(asset_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown asset {asset_id}")
+    return {"assetId": asset_id, **STATES.recent(asset_id, limit)}
+
+@app.get("/sites/{siteId}/state")
+def site_state(siteId: str, type: str | None = None):
+    assets = REGISTRY.site_assets(siteId, type)
+    ids = [a["assetId"] for a in assets]
+    return {"siteId": siteId, "assetId": ids, "type": [a["type"] for a in assets], **STATES.current(ids)}
+
+@app.post("/topology/edges")
+def add_edge(e: TopologyEdge):
+    try:
+        return REGISTRY.connect(e.source, e.target, kind=e.kind, meta=e.meta)
+    except UnknownAsset as err:
+        raise HTTPException(status_code=404, detail=f"Unknown asset {err.args[0]}")
+    except ValueError as err:
+        raise HTTPException(status_code=422, detail=str(err))
+
+@app.delete("/topology/edges")
+def remove_edge(source: str, target: str):
+    try:
+        REGISTRY.disconnect(source, target)
+    except UnknownAsset as err:
+        raise HTTPException(status_code=404, detail=f"Unknown edge or asset {err.args[0]}")
+    return {"ok": True}
 
 @app.get("/topology/{siteId}")
-def topology(siteId: str):
-    nodes = [v for v in ASSETS.values() if v["siteId"] == siteId]
-    return {"siteId": siteId, "nodes": nodes, "edges": []}
+def topology(siteId: str, request: Request, response: Response):
+    etag, snapshot = REGISTRY.topology(siteId)
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return snapshot
 
 @app.post("/constraints")
 def update_constraints(payload: dict = Body(...)):
     site = payload.get("siteId","default")
     CONSTRAINTS[site] = payload
     return {"ok": True}
-
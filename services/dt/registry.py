@@ -0,0 +1,128 @@
+"""Site-indexed asset registry with a versioned electrical topology."""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Distinguishes ETags issued by different processes sharing a version number.
+_EPOCH = uuid.uuid4().hex[:8]
+
+EdgeKey = Tuple[str, str]
+
+
+class UnknownAsset(KeyError):
+    pass
+
+
+class AssetRegistry:
+    """Assets indexed by site and by ``(site, type)``, plus per-site edge lists.
+
+    Every change to a site's assets or edges bumps that site's version; the
+    topology snapshot (and its ETag) is rebuilt lazily on the next read, so
+    repeated reads of an unchanged site cost one dict lookup.
+    """
+
+    def __init__(self) -> None:
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self._by_site: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_type: Dict[Tuple[str, str], Dict[str, None]] = defaultdict(dict)
+        self._edges: Dict[str, Dict[EdgeKey, Dict[str, Any]]] = defaultdict(dict)
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._snapshots: Dict[str, Tuple[int, str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    def _touch(self, site_id: str) -> None:
+        self._versions[site_id] += 1
+
+    def upsert(self, asset: Dict[str, Any]) -> None:
+        with self._lock:
+            asset_id = asset["assetId"]
+            previous = self.assets.get(asset_id)
+            if previous is not None:
+                self._unindex(previous)
+                if previous["siteId"] != asset["siteId"]:
+                    # Edges never cross sites, so a moved asset loses its connections.
+                    self._drop_edges(previous)
+            self.assets[asset_id] = asset
+            self._by_site[asset["siteId"]][asset_id] = None
+            self._by_type[(asset["siteId"], asset["type"])][asset_id] = None
+            self._touch(asset["siteId"])
+
+    def remove(self, asset_id: str) -> Dict[str, Any]:
+        with self._lock:
+            asset = self.assets.pop(asset_id, None)
+            if asset is None:
+                raise UnknownAsset(asset_id)
+            self._unindex(asset)
+            self._drop_edges(asset)
+            return asset
+
+    def _unindex(self, asset: Dict[str, Any]) -> None:
+        site_id, asset_id = asset["siteId"], asset["assetId"]
+        self._by_site[site_id].pop(asset_id, None)
+        self._by_type[(site_id, asset["type"])].pop(asset_id, None)
+        self._touch(site_id)
+
+    def _drop_edges(self, asset: Dict[str, Any]) -> None:
+        site_id, asset_id = asset["siteId"], asset["assetId"]
+        edges = self._edges.get(site_id)
+        if edges:
+            for key in [key for key in edges if asset_id in key]:
+                del edges[key]
+        self._touch(site_id)
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        return self.assets.get(asset_id)
+
+    def site_assets(self, site_id: str, asset_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = self._by_site.get(site_id, {}) if asset_type is None else self._by_type.get((site_id, asset_type), {})
+            return [self.assets[asset_id] for asset_id in ids]
+
+    def site_of(self, asset_id: str) -> str:
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            raise UnknownAsset(asset_id)
+        return asset["siteId"]
+
+    def connect(self, source: str, target: str, **attributes: Any) -> Dict[str, Any]:
+        """Add (or replace) the edge ``source -> target``; both must share a site."""
+
+        with self._lock:
+            site_id = self.site_of(source)
+            if self.site_of(target) != site_id:
+                raise ValueError(f"{source} and {target} belong to different sites")
+            edge = {"source": source, "target": target, **attributes}
+            self._edges[site_id][(source, target)] = edge
+            self._touch(site_id)
+            return edge
+
+    def disconnect(self, source: str, target: str) -> None:
+        with self._lock:
+            site_id = self.site_of(source)
+            if self._edges[site_id].pop((source, target), None) is None:
+                raise UnknownAsset(f"{source}->{target}")
+            self._touch(site_id)
+
+    def topology(self, site_id: str) -> Tuple[str, Dict[str, Any]]:
+        """Return ``(etag, snapshot)`` for ``site_id``'s current version."""
+
+        with self._lock:
+            version = self._versions.get(site_id, 0)
+            cached = self._snapshots.get(site_id)
+            if cached is not None and cached[0] == version:
+                return cached[1], cached[2]
+            snapshot = {
+                "siteId": site_id,
+                "version": version,
+                "nodes": self.site_assets(site_id),
+                "edges": list(self._edges.get(site_id, {}).values()),
+            }
+            digest = hashlib.blake2s(json.dumps(snapshot, sort_keys=True, default=str).encode(), digest_size=8)
+            etag = f'"{_EPOCH}-{version}-{digest.hexdigest()}"'
+            self._snapshots[site_id] = (version, etag, snapshot)
+            return etag, snapshot
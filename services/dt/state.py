@@ -0,0 +1,164 @@
+"""Last-value cache and fixed-size history for high-frequency asset state."""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+FIELDS = ("soc", "p", "temp", "on")
+
+
+def _cell(value: Any) -> float:
+    if value is None:
+        return math.nan
+    return float(value)
+
+
+class AssetStateStore:
+    """Per-asset state held in row-aligned NumPy arrays.
+
+    ``last`` keeps the latest known value of every field (a missing field in
+    an update leaves the previous value in place) and ``history`` keeps the
+    last ``history_size`` raw updates per asset in a ring, NaN marking fields
+    the update did not carry. Updates older than the newest one already held
+    for an asset are dropped, so the ring stays in time order. Rows of removed
+    assets are reused by new ones.
+    """
+
+    def __init__(self, history_size: int = 256) -> None:
+        self.history_size = history_size
+        self.rows: Dict[str, int] = {}
+        self.last = np.full((0, len(FIELDS)), np.nan)
+        self.last_ts = np.full(0, -np.inf)
+        self.history = np.full((0, history_size, len(FIELDS)), np.nan)
+        self.history_ts = np.full((0, history_size), np.nan)
+        self.cursor = np.zeros(0, dtype=np.int64)
+        self.count = np.zeros(0, dtype=np.int64)
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+
+    def _rows_for(self, asset_ids: Sequence[str]) -> np.ndarray:
+        rows = self.rows
+        for asset_id in asset_ids:
+            if asset_id not in rows:
+                rows[asset_id] = self._free.pop() if self._free else len(rows)
+        if len(rows) > len(self.last):
+            extra = max(len(rows), 2 * len(self.last), 64) - len(self.last)
+            self.last = np.vstack([self.last, np.full((extra, len(FIELDS)), np.nan)])
+            self.last_ts = np.concatenate([self.last_ts, np.full(extra, -np.inf)])
+            self.history = np.concatenate(
+                [self.history, np.full((extra, self.history_size, len(FIELDS)), np.nan)]
+            )
+            self.history_ts = np.vstack([self.history_ts, np.full((extra, self.history_size), np.nan)])
+            self.cursor = np.concatenate([self.cursor, np.zeros(extra, dtype=np.int64)])
+            self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        return np.fromiter((rows[asset_id] for asset_id in asset_ids), np.int64, len(asset_ids))
+
+    def update_many(self, states: Sequence[Dict[str, Any]]) -> int:
+        """Apply state dicts (``assetId``, ``ts`` as epoch seconds, optional fields).
+
+        Returns how many updates were applied; stale ones are dropped.
+        """
+
+        if not states:
+            return 0
+        ts = np.fromiter((state["ts"] for state in states), float, len(states))
+        values = np.array([[_cell(state.get(name)) for name in FIELDS] for state in states], dtype=float)
+        with self._lock:
+            rows = self._rows_for([state["assetId"] for state in states])
+            # Group updates per asset in time order, keeping only those not
+            # older than what the asset already holds; ``rank`` is each
+            # update's position within its asset's group.
+            order = np.lexsort((ts, rows))
+            rows, ts, values = rows[order], ts[order], values[order]
+            fresh = ts >= self.last_ts[rows]
+            rows, ts, values = rows[fresh], ts[fresh], values[fresh]
+            if not len(rows):
+                return 0
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            sizes = np.diff(np.r_[starts, len(rows)])
+            rank = np.arange(len(rows)) - np.repeat(starts, sizes)
+
+            # History: a group longer than the ring only keeps its newest updates.
+            keep = rank >= np.repeat(sizes, sizes) - self.history_size
+            slots = (self.cursor[rows] + rank) % self.history_size
+            self.history[rows[keep], slots[keep]] = values[keep]
+            self.history_ts[rows[keep], slots[keep]] = ts[keep]
+            group_rows = rows[starts]
+            self.cursor[group_rows] = (self.cursor[group_rows] + sizes) % self.history_size
+            self.count[group_rows] = np.minimum(self.count[group_rows] + sizes, self.history_size)
+
+            # Last values: per asset and field, the newest update that carries the field.
+            for column in range(len(FIELDS)):
+                self._assign_latest(rows, ~np.isnan(values[:, column]), values[:, column], column)
+            latest = starts + sizes - 1
+            self.last_ts[rows[latest]] = ts[latest]
+        return len(rows)
+
+    def remove(self, asset_id: str) -> None:
+        """Forget everything known about ``asset_id``; unknown ids are ignored."""
+
+        with self._lock:
+            row = self.rows.pop(asset_id, None)
+            if row is None:
+                return
+            self.last[row] = np.nan
+            self.last_ts[row] = -np.inf
+            self.history[row] = np.nan
+            self.history_ts[row] = np.nan
+            self.cursor[row] = 0
+            self.count[row] = 0
+            self._free.append(row)
+
+    def _assign_latest(self, rows: np.ndarray, mask: np.ndarray, values: np.ndarray, column: int) -> None:
+        latest = _last_per_group(rows, np.flatnonzero(mask))
+        self.last[rows[latest], column] = values[latest]
+
+    def current(self, asset_ids: Sequence[str]) -> Dict[str, List[Optional[float]]]:
+        """Latest state of ``asset_ids`` as columns; ``None`` where nothing is known."""
+
+        with self._lock:
+            known = [asset_id in self.rows for asset_id in asset_ids]
+            rows = np.fromiter((self.rows.get(asset_id, 0) for asset_id in asset_ids), np.int64, len(asset_ids))
+            values = self.last[rows] if len(self.last) else np.full((len(rows), len(FIELDS)), np.nan)
+            ts = self.last_ts[rows] if len(self.last) else np.full(len(rows), -np.inf)
+            mask = np.asarray(known, dtype=bool)
+            values[~mask] = np.nan
+            ts = np.where(mask & np.isfinite(ts), ts, np.nan)
+        columns: Dict[str, List[Optional[float]]] = {"ts": _nullable(ts)}
+        for column, name in enumerate(FIELDS):
+            columns[name] = _nullable(values[:, column])
+        columns["on"] = [None if value is None else bool(value) for value in columns["on"]]
+        return columns
+
+    def recent(self, asset_id: str, limit: Optional[int] = None) -> Dict[str, List[Optional[float]]]:
+        """Up to ``limit`` most recent updates of one asset, oldest first."""
+
+        with self._lock:
+            row = self.rows.get(asset_id)
+            count = 0 if row is None else int(self.count[row])
+            if limit is not None:
+                count = min(count, max(limit, 0))
+            if not count:
+                return {"ts": [], **{name: [] for name in FIELDS}}
+            slots = (self.cursor[row] - count + np.arange(count)) % self.history_size
+            ts = self.history_ts[row, slots]
+            values = self.history[row, slots]
+        columns: Dict[str, List[Optional[float]]] = {"ts": ts.tolist()}
+        for column, name in enumerate(FIELDS):
+            columns[name] = _nullable(values[:, column])
+        columns["on"] = [None if value is None else bool(value) for value in columns["on"]]
+        return columns
+
+
+def _last_per_group(rows: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Of ``candidates`` (indices into ``rows`` sorted by row), the last one per row."""
+
+    grouped = rows[candidates]
+    return candidates[np.r_[grouped[1:] != grouped[:-1], True]] if len(candidates) else candidates
+
+
+def _nullable(values: np.ndarray) -> List[Optional[float]]:
+    return [None if math.isnan(value) else value for value in values.tolist()]
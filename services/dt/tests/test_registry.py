@@ -0,0 +1,49 @@
+import pytest
+
+from registry import AssetRegistry, UnknownAsset
+
+
+def asset(asset_id, site_id="s1", asset_type="ESS", **meta):
+    return {"assetId": asset_id, "siteId": site_id, "type": asset_type, "meta": meta}
+
+
+def registry_with_edge():
+    registry = AssetRegistry()
+    registry.upsert(asset("a"))
+    registry.upsert(asset("b", asset_type="PV"))
+    registry.connect("a", "b", kind="ac")
+    return registry
+
+
+def test_reupsert_on_same_site_keeps_edges_and_bumps_version():
+    registry = registry_with_edge()
+    etag, before = registry.topology("s1")
+
+    registry.upsert(asset("a", asset_type="EV", note="updated"))
+    new_etag, after = registry.topology("s1")
+
+    assert new_etag != etag and after["version"] > before["version"]
+    assert after["edges"] == [{"source": "a", "target": "b", "kind": "ac"}]
+    assert [a["assetId"] for a in registry.site_assets("s1", "EV")] == ["a"]
+    assert registry.site_assets("s1", "ESS") == []
+
+
+def test_moving_an_asset_to_another_site_drops_its_edges():
+    registry = registry_with_edge()
+    registry.upsert(asset("a", site_id="s2"))
+
+    assert registry.topology("s1")[1]["edges"] == []
+    assert [a["assetId"] for a in registry.site_assets("s1")] == ["b"]
+    assert [a["assetId"] for a in registry.site_assets("s2")] == ["a"]
+
+
+def test_remove_drops_edges_and_unknown_assets_raise():
+    registry = registry_with_edge()
+    registry.remove("b")
+
+    assert registry.topology("s1")[1]["edges"] == []
+    with pytest.raises(UnknownAsset):
+        registry.remove("b")
+    registry.upsert(asset("c", site_id="s2"))
+    with pytest.raises(ValueError):
+        registry.connect("a", "c")
@@ -0,0 +1,101 @@
+import importlib.util
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from state import AssetStateStore
+
+# Every service's app module is named main; load this one under its own name.
+_spec = importlib.util.spec_from_file_location("dt_main", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+
+def test_missing_fields_keep_last_known_value():
+    store = AssetStateStore(history_size=4)
+    store.update_many([{"assetId": "a", "ts": 10.0, "soc": 0.5, "p": 3.0}])
+    store.update_many([{"assetId": "a", "ts": 20.0, "p": 4.0, "on": True}])
+
+    current = store.current(["a", "unknown"])
+
+    assert current == {
+        "ts": [20.0, None],
+        "soc": [0.5, None],
+        "p": [4.0, None],
+        "temp": [None, None],
+        "on": [True, None],
+    }
+
+
+def test_batch_is_applied_in_time_order_per_asset():
+    store = AssetStateStore(history_size=4)
+    applied = store.update_many(
+        [
+            {"assetId": "a", "ts": 30.0, "p": 3.0},
+            {"assetId": "b", "ts": 5.0, "p": 9.0},
+            {"assetId": "a", "ts": 10.0, "p": 1.0, "soc": 0.1},
+            {"assetId": "a", "ts": 20.0, "p": 2.0},
+        ]
+    )
+
+    assert applied == 4
+    assert store.recent("a")["ts"] == [10.0, 20.0, 30.0]
+    assert store.recent("a")["p"] == [1.0, 2.0, 3.0]
+    assert store.current(["a", "b"])["p"] == [3.0, 9.0]
+    assert store.current(["a"])["soc"] == [0.1]
+
+
+def test_stale_updates_are_dropped():
+    store = AssetStateStore(history_size=4)
+    store.update_many([{"assetId": "a", "ts": 20.0, "p": 2.0}])
+
+    applied = store.update_many([{"assetId": "a", "ts": 10.0, "p": 1.0, "soc": 0.9}, {"assetId": "a", "ts": 30.0, "p": 3.0}])
+
+    assert applied == 1
+    assert store.recent("a") == {"ts": [20.0, 30.0], "soc": [None, None], "p": [2.0, 3.0], "temp": [None, None], "on": [None, None]}
+    assert store.current(["a"])["soc"] == [None]
+
+
+def test_history_ring_keeps_newest_updates():
+    store = AssetStateStore(history_size=3)
+    store.update_many([{"assetId": "a", "ts": float(t), "p": float(t)} for t in range(5)])
+    store.update_many([{"assetId": "a", "ts": 5.0, "p": 5.0}])
+
+    assert store.recent("a")["ts"] == [3.0, 4.0, 5.0]
+    assert store.recent("a", limit=2)["p"] == [4.0, 5.0]
+    assert store.recent("a", limit=0)["ts"] == []
+
+
+def test_removed_asset_is_forgotten_and_its_row_reused():
+    store = AssetStateStore(history_size=2)
+    store.update_many([{"assetId": "a", "ts": 10.0, "soc": 0.5}, {"assetId": "b", "ts": 10.0, "soc": 0.7}])
+
+    store.remove("a")
+    store.remove("missing")
+    store.update_many([{"assetId": "c", "ts": 1.0, "p": 1.0}])
+
+    assert sorted(store.rows.values()) == [0, 1]
+    assert store.current(["a", "b", "c"])["soc"] == [None, 0.7, None]
+    assert store.recent("c")["ts"] == [1.0]
+    # A re-added asset starts from scratch, so older timestamps are accepted.
+    assert store.update_many([{"assetId": "a", "ts": 5.0, "p": 2.0}]) == 1
+    assert store.recent("a")["ts"] == [5.0]
+
+
+def test_state_endpoints_use_utc_and_forget_deleted_assets():
+    client = TestClient(main.app)
+    client.post("/assets", json={"assetId": "dt-a", "siteId": "dt-s", "type": "ESS"})
+
+    naive = client.patch("/assets/dt-a/state", json={"assetId": "dt-a", "ts": "2024-01-01T00:00:00", "soc": 0.4})
+    stale = client.post("/assets/state", json=[{"assetId": "dt-a", "ts": "2023-12-31T23:00:00Z", "soc": 0.1}])
+    history = client.get("/assets/dt-a/history").json()
+
+    assert naive.json()["applied"] is True
+    assert stale.json() == {"ok": True, "applied": 0, "stale": 1, "unknown": []}
+    assert history["ts"] == [1704067200.0] and history["soc"] == [0.4]
+
+    assert client.delete("/assets/dt-a").json() == {"ok": True}
+    client.post("/assets", json={"assetId": "dt-a", "siteId": "dt-s", "type": "ESS"})
+    state = client.get("/sites/dt-s/state").json()
+    assert state["soc"] == [None] and state["ts"] == [None]
+    assert client.get("/assets/dt-a/history").json()["ts"] == []
@@ -1,28 +1,81 @@
 from fastapi import FastAPI
-    from datetime import datetime
-    from typing import List
-    from pydantic import BaseModel
-    from ng_common.models import *
-    import os
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from ng_common.models import *
+import os
 
-    app = FastAPI(title="NanoGrid Engagement Service")
+app = FastAPI(title="NanoGrid Engagement Service")
 
-    @app.get("/health")
-    def health():
-        return {"service":"engagement","status":"ok","ts": datetime.utcnow().isoformat()}
+@app.get("/health")
+def health():
+    return {"service":"engagement","status":"ok","ts": datetime.utcnow().isoformat()}
 
 
 from uuid import uuid4
 NUDGES = {}
+NUDGE_SITES = {}
 
 @app.post("/nudges", response_model=Nudge)
-def create_nudge(n: Nudge):
+def create_nudge(n: Nudge, siteId: str | None = None):
     nid = n.nudgeId or uuid4().hex[:8]
     nudge = n.model_copy(update={"nudgeId": nid})
     NUDGES[nid] = nudge.model_dump()
+    if siteId:
+        NUDGE_SITES.setdefault(siteId, []).append(nid)
     return nudge
 
+@app.get("/nudges", response_model=list[Nudge])
+def list_nudges(siteId: str | None = None, limit: int = 50):
+    ids = NUDGE_SITES.get(siteId, []) if siteId else list(NUDGES)
+    return [NUDGES[nid] for nid in ids[-limit:] if nid in NUDGES]
+
 @app.post("/actions/confirm")
 def confirm(nudgeId: str, accepted: bool):
     return {"nudgeId": nudgeId, "accepted": accepted}
 
+
+import time
+from fastapi import HTTPException
+from targeting import FatigueLedger, build_nudges, target
+
+FATIGUE = FatigueLedger(
+    max_per_user=int(os.getenv("NUDGE_MAX_PER_USER", "2")),
+    window_s=float(os.getenv("NUDGE_FATIGUE_HOURS", "24")) * 3600,
+)
+
+class TargetingRequest(BaseModel):
+    event: DRProgram
+    # list of {userId, siteId, flexKw, discomfort?, acceptance?, reward?} or the same as columns
+    candidates: list[dict] | dict[str, list]
+    perSite: int = 3
+    discomfortWeight: float = 0.5
+    title: str = "Demand response event"
+    message: str = "Shift flexible load during the event to save about {saving} (+{reward} reward)"
+
+@app.post("/nudges/target")
+def target_nudges(req: TargetingRequest):
+    """Score all candidates for a DR event and bulk-create the top nudges per site."""
+    now = time.time()
+    try:
+        picked = target(
+            req.candidates, req.event.price, req.event.durMin, req.perSite, FATIGUE, now,
+            discomfort_weight=req.discomfortWeight,
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid candidates: {e}")
+    nudges = build_nudges(picked, req.event.eventId, req.title, req.message)
+    created = {}
+    for site, nudge in zip(picked.sites, nudges):
+        NUDGES[nudge["nudgeId"]] = nudge
+        created.setdefault(site, []).append(nudge["nudgeId"])
+    for site, ids in created.items():
+        NUDGE_SITES.setdefault(site, []).extend(ids)
+    return {
+        "eventId": req.event.eventId,
+        "considered": picked.considered,
+        "fatigued": picked.fatigued,
+        "created": len(nudges),
+        "estSaving": round(float(picked.est_saving.sum()), 2),
+        "sites": created,
+    }
@@ -0,0 +1,181 @@
+"""Vectorised DR nudge targeting: score candidates, cap per user and pick the top K per site."""
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Sequence
+
+import numpy as np
+
+COLUMNS = ("userId", "siteId", "flexKw", "discomfort", "acceptance", "reward")
+DEFAULTS = {"discomfort": 0.0, "acceptance": 0.5, "reward": 0.0}
+
+
+class FatigueLedger:
+    """Recent nudge times per user; a user may get ``max_per_user`` nudges per ``window_s``.
+
+    Hold ``lock`` across ``remaining`` and ``record`` to reserve budget atomically.
+    """
+
+    def __init__(self, max_per_user: int = 2, window_s: float = 24 * 3600) -> None:
+        self.max_per_user = max_per_user
+        self.window_s = window_s
+        self._sent: Dict[str, Deque[float]] = defaultdict(deque)
+        self.lock = threading.RLock()
+
+    def remaining(self, users: Sequence[str], now: float) -> np.ndarray:
+        """Nudges each user in ``users`` may still receive at ``now``."""
+
+        horizon = now - self.window_s
+        with self.lock:
+            counts = np.zeros(len(users), dtype=np.int64)
+            for row, user in enumerate(users):
+                sent = self._sent.get(user)
+                if sent:
+                    while sent and sent[0] <= horizon:
+                        sent.popleft()
+                    counts[row] = len(sent)
+        return np.maximum(self.max_per_user - counts, 0)
+
+    def record(self, users: Sequence[str], now: float) -> None:
+        with self.lock:
+            for user in users:
+                self._sent[user].append(now)
+
+
+@dataclass
+class Targeting:
+    users: List[str]
+    sites: List[str]
+    rows: np.ndarray  # candidate rows selected, grouped by site
+    est_saving: np.ndarray
+    discomfort: np.ndarray
+    reward: np.ndarray
+    score: np.ndarray
+    considered: int
+    fatigued: int
+
+
+def _columns(candidates: Any) -> Dict[str, Any]:
+    if isinstance(candidates, dict):
+        return candidates
+    try:
+        return {name: [c.get(name, DEFAULTS.get(name)) for c in candidates] for name in COLUMNS}
+    except AttributeError:
+        raise ValueError("Every candidate must be an object") from None
+
+
+def _factorize(values: Sequence[Any]) -> tuple[List[Any], np.ndarray]:
+    labels: Dict[Any, int] = {}
+    codes = np.fromiter((labels.setdefault(value, len(labels)) for value in values), np.int64, len(values))
+    return list(labels), codes
+
+
+def target(
+    candidates: Any,
+    price: float,
+    dur_min: float,
+    per_site: int,
+    ledger: FatigueLedger,
+    now: float,
+    discomfort_weight: float = 0.5,
+) -> Targeting:
+    """Choose which candidates to nudge for one DR event.
+
+    ``candidates`` is a list of records or a dict of columns (``userId``,
+    ``siteId``, ``flexKw``, optional ``discomfort`` 0..1, ``acceptance``
+    probability and ``reward`` cost per nudge). A candidate's expected saving
+    is ``acceptance * flexKw * hours * price``; its score discounts that by
+    discomfort and subtracts the expected reward payout. Each user is
+    considered once (their best candidate), users out of fatigue budget are
+    dropped, and the ``per_site`` best positive scores per site are kept.
+    The chosen users are recorded in ``ledger`` under the same lock that
+    checked their budget, so concurrent events cannot overspend it.
+    """
+
+    columns = _columns(candidates)
+    users, user_code = _factorize(columns["userId"])
+    sites, site_code = _factorize(columns["siteId"])
+    size = len(user_code)
+    if len(site_code) != size:
+        raise ValueError(f"Column 'siteId' must have {size} values")
+
+    def column(name: str) -> np.ndarray:
+        values = columns.get(name)
+        if values is None:
+            return np.full(size, DEFAULTS[name])
+        array = np.asarray(values, dtype=float)
+        if array.shape != (size,):
+            raise ValueError(f"Column {name!r} must have {size} values")
+        return array
+
+    flex = column("flexKw")
+    discomfort = np.clip(column("discomfort"), 0.0, 1.0)
+    acceptance = np.clip(column("acceptance"), 0.0, 1.0)
+    reward = column("reward")
+    est_saving = flex * (dur_min / 60.0) * price
+    score = acceptance * (est_saving * (1.0 - discomfort_weight * discomfort) - reward)
+    eligible = np.isfinite(score) & (score > 0)
+
+    # One nudge per user: keep the best-scoring candidate of each user.
+    order = np.lexsort((-score, user_code))
+    first = np.r_[True, user_code[order][1:] != user_code[order][:-1]]
+    best = np.zeros(size, dtype=bool)
+    best[order[first]] = True
+    eligible &= best
+
+    with ledger.lock:
+        budget = ledger.remaining(users, now)
+        fatigued = eligible & (budget[user_code] == 0)
+        eligible &= ~fatigued
+
+        # Top ``per_site`` per site: rank within each site by descending score.
+        candidates_idx = np.flatnonzero(eligible)
+        order = candidates_idx[np.lexsort((-score[candidates_idx], site_code[candidates_idx]))]
+        grouped = site_code[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]]) if len(order) else np.zeros(0, dtype=np.int64)
+        sizes = np.diff(np.r_[starts, len(order)])
+        rank = np.arange(len(order)) - np.repeat(starts, sizes)
+        chosen = order[rank < per_site]
+        chosen_users = [users[code] for code in user_code[chosen]]
+        ledger.record(chosen_users, now)
+
+    return Targeting(
+        users=chosen_users,
+        sites=[sites[code] for code in site_code[chosen]],
+        rows=chosen,
+        est_saving=est_saving[chosen],
+        discomfort=discomfort[chosen],
+        reward=reward[chosen],
+        score=score[chosen],
+        considered=size,
+        fatigued=int(fatigued.sum()),
+    )
+
+
+def _render(message: str, saving: float, reward: float) -> str:
+    # Plain substitution: the template comes from the client, so str.format's
+    # field lookups (and its errors on unknown fields) are kept out of reach.
+    return message.replace("{saving}", str(saving)).replace("{reward}", str(reward))
+
+
+def build_nudges(targeting: Targeting, event_id: str, title: str, message: str) -> List[Dict[str, Any]]:
+    """Nudge dicts (``Nudge`` fields) for the selected candidates, in site order."""
+
+    prefix = uuid.uuid4().hex[:6]
+    savings = np.round(targeting.est_saving, 2).tolist()
+    discomforts = np.round(targeting.discomfort, 3).tolist()
+    rewards = np.round(targeting.reward, 2).tolist()
+    return [
+        {
+            "nudgeId": f"{event_id}-{prefix}-{index}",
+            "title": title,
+            "message": _render(message, saving, reward),
+            "est_saving": saving,
+            "discomfort": discomfort,
+            "rewards": {"eventId": event_id, "userId": user, "amount": reward},
+        }
+        for index, (user, saving, discomfort, reward) in enumerate(zip(targeting.users, savings, discomforts, rewards))
+    ]
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from targeting import FatigueLedger, build_nudges, target
+
+CANDIDATES = [
+    {"userId": "u1", "siteId": "s1", "flexKw": 4.0, "acceptance": 0.9},
+    {"userId": "u1", "siteId": "s1", "flexKw": 2.0, "acceptance": 0.9},
+    {"userId": "u2", "siteId": "s1", "flexKw": 3.0, "acceptance": 0.5},
+    {"userId": "u3", "siteId": "s2", "flexKw": 1.0, "discomfort": 1.0, "reward": 0.3},
+]
+
+
+def test_best_candidate_per_user_and_top_k_per_site():
+    picked = target(CANDIDATES, price=0.5, dur_min=60, per_site=1, ledger=FatigueLedger(), now=0.0)
+
+    assert picked.users == ["u1"] and picked.sites == ["s1"]
+    assert picked.rows.tolist() == [0]
+    assert picked.considered == 4
+
+
+def test_mismatched_columns_raise_value_error():
+    with pytest.raises(ValueError, match="siteId"):
+        target({"userId": ["u1", "u2"], "siteId": ["s1"], "flexKw": [1.0, 2.0]}, 0.5, 60, 3, FatigueLedger(), 0.0)
+    with pytest.raises(ValueError, match="flexKw"):
+        target({"userId": ["u1", "u2"], "siteId": ["s1", "s1"], "flexKw": [1.0]}, 0.5, 60, 3, FatigueLedger(), 0.0)
+    with pytest.raises(KeyError):
+        target({"userId": ["u1"], "flexKw": [1.0]}, 0.5, 60, 3, FatigueLedger(), 0.0)
+    with pytest.raises(ValueError, match="object"):
+        target(["u1"], 0.5, 60, 3, FatigueLedger(), 0.0)
+
+
+def test_message_template_is_not_formatted():
+    picked = target(CANDIDATES, price=0.5, dur_min=60, per_site=1, ledger=FatigueLedger(), now=0.0)
+    for message in ("Save {amount}", "{saving.__class__.__mro__}", "{", "{0}"):
+        assert build_nudges(picked, "E1", "DR", message)[0]["message"] == message
+    assert build_nudges(picked, "E1", "DR", "Save {saving} +{reward}")[0]["message"] == "Save 2.0 +0.0"
+
+
+def test_fatigue_budget_is_reserved_across_concurrent_events():
+    ledger = FatigueLedger(max_per_user=1)
+    candidates = {"userId": [f"u{i}" for i in range(500)], "siteId": ["s1"] * 500, "flexKw": [1.0] * 500}
+    results = []
+    barrier = threading.Barrier(8)
+
+    def run():
+        barrier.wait()
+        results.append(target(candidates, 0.5, 60, 500, ledger, now=0.0))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    chosen = [user for result in results for user in result.users]
+    assert len(chosen) == len(set(chosen)) == 500
+    assert target(candidates, 0.5, 60, 500, ledger, now=1.0).fatigued == 500
@@ -1,38 +1,56 @@
 from fastapi import FastAPI
-    from datetime import datetime
-    from typing import List
-    from pydantic import BaseModel
-    from ng_common.models import *
-    import os
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from ng_common.models import *
+import os
 
-    app = FastAPI(title="NanoGrid Eop Service")
+app = FastAPI(title="NanoGrid Eop Service")
 
-    @app.get("/health")
-    def health():
-        return {"service":"eop","status":"ok","ts": datetime.utcnow().isoformat()}
+@app.get("/health")
+def health():
+    return {"service":"eop","status":"ok","ts": datetime.utcnow().isoformat()}
 
 
 from uuid import uuid4
-from fastapi import Body
+from fastapi import Body, HTTPException
+from pydantic import ValidationError
+from planner import HorizonPlanner, build_problem, describe, plan_start
+
+PLANNER = HorizonPlanner(max_sites=int(os.getenv("PLANNER_MAX_SITES", "256")))
 
 @app.post("/plan/optimize", response_model=PlanResponse)
 def optimize(req: PlanOptimizeRequest):
-    # Dummy plan: simple DR-aware setpoints
-    sp = []
-    # Create two setpoints as example
-    now = datetime.utcnow().replace(second=0, microsecond=0)
-    sp.append(Setpoint(t=now, essP=150.0, hvacSet=25.0, evKw=0))
-    sp.append(Setpoint(t=now, essP=200.0, hvacSet=25.5, evKw=0))
-    plan = PlanResponse(
-        planId=f"PLAN_{now.strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}",
-        objective={"cost": 421300, "carbonKg": 182.4, "reward": 55000},
-        setpoints=sp,
-        explanations=["DR window: discharge ESS + relax HVAC setpoint"]
+    programs = dict(req.programs or {})
+    try:
+        # DR events arrive as programs["dr"]: a list of DRProgram objects
+        programs["dr"] = [DRProgram.model_validate(e).model_dump() for e in programs.get("dr") or []]
+        # A forecast may also arrive as a columnar TimeSeries (the forecast
+        # service's format="series"); the planner only needs its values.
+        forecasts = {
+            name: TimeSeries.model_validate(value).y if isinstance(value, dict) else value
+            for name, value in req.forecasts.items()
+        }
+        start = plan_start(req.granularityMin)
+        problem = build_problem(
+            start, req.granularityMin, req.horizon, forecasts,
+            req.constraints.model_dump(), programs, req.preferences,
+        )
+        solution = PLANNER.solve(req.siteId, problem)
+    except (ValidationError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid plan request: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    objective, setpoints, explanations = describe(solution)
+    objective["status"] = solution.status
+    return PlanResponse(
+        planId=f"PLAN_{start.strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}",
+        objective=objective,
+        setpoints=[Setpoint(**s) for s in setpoints],
+        explanations=explanations,
     )
-    return plan
 
 @app.post("/plan/apply")
 def apply_plan(payload: dict = Body(...)):
     # In real impl: dispatch to BAS/EMS adapters
     return {"ok": True, "dispatched": True, "targets": ["ESS","HVAC"]}
-
@@ -0,0 +1,369 @@
+"""Horizon dispatch optimiser for a single site, formulated as a sparse QP.
+
+Per time step the plan chooses ESS charge/discharge power, an HVAC setpoint
+offset, EV charging power and grid import/export. Energy prices (raised
+during DR events), a soft ``contractDemandKw`` peak limit, battery
+degradation and HVAC discomfort make up the objective. OSQP solves the
+problem; one solver is kept per site so that re-planning reuses its
+factorisation and warm-starts from the previous plan shifted in time.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import osqp
+from scipy import sparse
+
+BLOCKS = ("charge", "discharge", "soc", "hvac", "ev", "grid_import", "grid_export", "excess")
+
+DEFAULT_PRICE = 0.15  # per kWh
+DEFAULT_CARBON = 0.45  # kg CO2 per kWh imported
+PEAK_PENALTY = 10.0  # per kWh above the contract demand
+DEGRADATION_COST = 0.01  # per kWh through the battery
+COMFORT_WEIGHT = 0.05  # per (degC)^2 per step
+REGULARISATION = 1e-6
+
+_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?$")
+
+
+def horizon_minutes(horizon: str) -> int:
+    match = _DURATION.match(horizon)
+    if not match or not any(match.groups()):
+        raise ValueError(f"Unsupported horizon {horizon!r}; expected an ISO 8601 duration like PT24H")
+    days, hours, minutes = (int(value or 0) for value in match.groups())
+    return days * 1440 + hours * 60 + minutes
+
+
+def _series(raw: Any, steps: int, default: float) -> np.ndarray:
+    """Forecast values as ``steps`` floats from a list of numbers / TimePoints;
+    short series repeat their last value."""
+
+    values = [point.get("y", default) if isinstance(point, dict) else point for point in raw or []]
+    if not values:
+        return np.full(steps, default)
+    array = np.asarray(values[:steps], dtype=float)
+    if len(array) < steps:
+        array = np.concatenate([array, np.full(steps - len(array), array[-1])])
+    return array
+
+
+def _as_utc(value: Any) -> datetime:
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class SiteProblem:
+    """Numeric data of one optimisation: ``min 1/2 x'Px + q'x  s.t.  l <= Ax <= u``."""
+
+    start: datetime
+    step_hours: float
+    steps: int
+    P: sparse.csc_matrix
+    q: np.ndarray
+    A: sparse.csc_matrix
+    l: np.ndarray
+    u: np.ndarray
+    net_load: np.ndarray
+    price: np.ndarray
+    dr_price: np.ndarray
+    carbon: np.ndarray
+    hvac_base: float
+    contract_kw: Optional[float]
+    dr_events: List[Tuple[str, int, int]]
+
+    def block(self, x: np.ndarray, name: str) -> np.ndarray:
+        offset = BLOCKS.index(name) * self.steps
+        return x[offset : offset + self.steps]
+
+
+def build_problem(
+    start: datetime,
+    granularity_min: int,
+    horizon: str,
+    forecasts: Dict[str, Any],
+    constraints: Dict[str, Any],
+    programs: Optional[Dict[str, Any]] = None,
+    preferences: Optional[Dict[str, Any]] = None,
+) -> SiteProblem:
+    if granularity_min <= 0:
+        raise ValueError("granularityMin must be positive")
+    steps = max(1, horizon_minutes(horizon) // granularity_min)
+    dt = granularity_min / 60.0
+    preferences = preferences or {}
+    ess = constraints.get("ess") or {}
+    hvac = constraints.get("hvac") or {}
+    ev = constraints.get("ev") or {}
+
+    load = _series(forecasts.get("load"), steps, 0.0)
+    pv = _series(forecasts.get("pv"), steps, 0.0)
+    price = _series(forecasts.get("price"), steps, DEFAULT_PRICE)
+    carbon = _series(forecasts.get("carbon"), steps, DEFAULT_CARBON)
+
+    # DR events pay their price for every kWh of import avoided in the window.
+    dr_price = np.zeros(steps)
+    dr_events: List[Tuple[str, int, int]] = []
+    for event in (programs or {}).get("dr", []) or []:
+        offset = (_as_utc(event["start"]) - start).total_seconds() / 60.0
+        first = max(0, int(np.floor(offset / granularity_min)))
+        stop = min(steps, int(np.ceil((offset + event["durMin"]) / granularity_min)))
+        if first < stop:
+            dr_price[first:stop] += float(event["price"])
+            dr_events.append((str(event.get("eventId", "")), first, stop))
+
+    capacity = float(ess.get("capacityKwh", 0.0))
+    charge_kw = float(ess.get("maxChargeKw", ess.get("powerKw", 0.0))) if capacity else 0.0
+    discharge_kw = float(ess.get("maxDischargeKw", ess.get("powerKw", 0.0))) if capacity else 0.0
+    eta = float(ess.get("efficiency", 0.95))
+    eta_c = eta_d = np.sqrt(eta)
+    soc_min = float(ess.get("socMin", 0.1)) * capacity
+    soc_max = float(ess.get("socMax", 0.9)) * capacity
+    soc0 = min(max(float(ess.get("soc", 0.5)) * capacity, soc_min), soc_max)
+    terminal = min(max(float(preferences.get("terminalSoc", ess.get("soc", 0.5))) * capacity, soc_min), soc_max)
+
+    hvac_base = float(hvac.get("setpoint", 24.0))
+    hvac_kw = float(hvac.get("kwPerDegree", 0.0))
+    hvac_lo = float(hvac.get("min", hvac_base)) - hvac_base
+    hvac_hi = float(hvac.get("max", hvac_base)) - hvac_base
+
+    ev_kw = float(ev.get("maxKw", 0.0))
+    ev_steps = steps
+    if ev.get("departure") is not None:
+        ev_steps = int(np.clip((_as_utc(ev["departure"]) - start).total_seconds() / 60.0 // granularity_min, 0, steps))
+    ev_energy = min(float(ev.get("energyKwh", 0.0)), ev_kw * ev_steps * dt)
+    ev_window = (np.arange(steps) < ev_steps).astype(float)
+
+    contract = constraints.get("contractDemandKw")
+    export_kw = float(preferences.get("exportLimitKw", np.inf))
+    export_price = float(preferences.get("exportPrice", 0.0))
+    if not np.isfinite(export_kw) and np.any(export_price > price + dr_price):
+        # Importing to export would earn money without limit.
+        raise ValueError("exportPrice exceeds the import price; set preferences.exportLimitKw to bound export")
+
+    eye = sparse.identity(steps, format="csc")
+    zero = sparse.csc_matrix((steps, steps))
+    difference = sparse.identity(steps, format="csc") - sparse.eye(steps, k=-1, format="csc")
+    balance = sparse.hstack([-eye, eye, zero, hvac_kw * eye, -eye, eye, -eye, zero])
+    soc_rows = sparse.hstack([-eta_c * dt * eye, (dt / eta_d) * eye, difference, zero, zero, zero, zero, zero])
+    peak_rows = sparse.hstack([zero, zero, zero, zero, zero, eye, zero, -eye])
+    # The EV energy row spans the whole horizon (charging after departure is
+    # bounded to zero below), so the sparsity pattern of A, and with it the
+    # cached factorisation, does not depend on the departure time.
+    ev_columns = np.r_[np.zeros(4 * steps, dtype=np.int32), np.arange(steps + 1), np.full(3 * steps, steps)]
+    ev_row = sparse.csc_matrix(
+        (np.full(steps, dt), np.zeros(steps, dtype=np.int32), ev_columns), shape=(1, len(BLOCKS) * steps)
+    )
+    size = len(BLOCKS) * steps
+    A = sparse.vstack([balance, soc_rows, peak_rows, ev_row, sparse.identity(size)], format="csc")
+    A.sum_duplicates()
+
+    lower_bounds = np.concatenate(
+        [
+            np.zeros(2 * steps),
+            np.full(steps, soc_min),
+            np.full(steps, hvac_lo),
+            np.zeros(4 * steps),
+        ]
+    )
+    upper_bounds = np.concatenate(
+        [
+            np.full(steps, charge_kw),
+            np.full(steps, discharge_kw),
+            np.full(steps, soc_max),
+            np.full(steps, hvac_hi),
+            ev_kw * ev_window,
+            np.full(steps, np.inf),
+            np.full(steps, export_kw),
+            np.full(steps, np.inf),
+        ]
+    )
+    lower_bounds[3 * steps - 1] = terminal
+    net_load = load - pv
+    soc_rhs = np.zeros(steps)
+    soc_rhs[0] = soc0
+    peak_limit = np.full(steps, np.inf if contract is None else float(contract))
+    l = np.concatenate([net_load, soc_rhs, np.full(steps, -np.inf), [ev_energy], lower_bounds])
+    u = np.concatenate([net_load, soc_rhs, peak_limit, [np.inf], upper_bounds])
+
+    degradation = float(preferences.get("degradationCost", DEGRADATION_COST))
+    q = np.concatenate(
+        [
+            np.full(steps, degradation * dt),
+            np.full(steps, degradation * dt),
+            np.zeros(3 * steps),
+            (price + dr_price) * dt,
+            np.full(steps, -export_price * dt),
+            np.full(steps, float(preferences.get("peakPenalty", PEAK_PENALTY)) * dt),
+        ]
+    )
+    diagonal = np.full(size, REGULARISATION)
+    diagonal[3 * steps : 4 * steps] = float(preferences.get("comfortWeight", COMFORT_WEIGHT))
+    index = np.arange(size)
+    P = sparse.csc_matrix((diagonal, index, np.r_[index, size]), shape=(size, size))
+
+    return SiteProblem(
+        start=start,
+        step_hours=dt,
+        steps=steps,
+        P=P,
+        q=q,
+        A=A,
+        l=l,
+        u=u,
+        net_load=net_load,
+        price=price,
+        dr_price=dr_price,
+        carbon=carbon,
+        hvac_base=hvac_base,
+        contract_kw=None if contract is None else float(contract),
+        dr_events=dr_events,
+    )
+
+
+@dataclass
+class _SiteSolver:
+    solver: Any
+    pattern: Tuple[bytes, bytes, Tuple[int, int]]
+    start: datetime
+    step_hours: float
+    x: np.ndarray
+    y: np.ndarray
+    lock: threading.Lock
+
+
+def _pattern(P: sparse.csc_matrix, A: sparse.csc_matrix) -> Tuple[bytes, bytes, Tuple[int, int]]:
+    return P.indices.tobytes() + A.indices.tobytes(), P.indptr.tobytes() + A.indptr.tobytes(), A.shape
+
+
+def _shift(values: np.ndarray, blocks: int, steps: int, shift: int) -> np.ndarray:
+    """Advance every per-step block by ``shift`` steps, repeating the final step."""
+
+    if shift <= 0:
+        return values
+    head, tail = values[: blocks * steps].reshape(blocks, steps), values[blocks * steps :]
+    shifted = np.concatenate([head[:, shift:], np.repeat(head[:, -1:], min(shift, steps), axis=1)], axis=1)
+    return np.concatenate([shifted[:, :steps].reshape(-1), tail])
+
+
+@dataclass
+class Solution:
+    problem: SiteProblem
+    x: np.ndarray
+    status: str
+    solve_ms: float
+    warm: bool
+
+
+class HorizonPlanner:
+    """Solves :class:`SiteProblem` instances, keeping one warm solver per site."""
+
+    def __init__(self, max_sites: int = 256) -> None:
+        self.max_sites = max_sites
+        self._sites: "OrderedDict[str, _SiteSolver]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def solve(self, site_id: str, problem: SiteProblem) -> Solution:
+        with self._lock:
+            cached = self._sites.get(site_id)
+            if cached is not None:
+                self._sites.move_to_end(site_id)
+        pattern = _pattern(problem.P, problem.A)
+        if cached is None or cached.pattern != pattern or cached.step_hours != problem.step_hours:
+            return self._cold(site_id, problem, pattern)
+
+        with cached.lock:
+            started = time.perf_counter()
+            cached.solver.update(q=problem.q, l=problem.l, u=problem.u, Px=problem.P.data, Ax=problem.A.data)
+            elapsed = (problem.start - cached.start).total_seconds() / 3600.0
+            shift = max(0, int(round(elapsed / problem.step_hours)))
+            rows = problem.A.shape[0] - len(problem.q)
+            cached.solver.warm_start(
+                x=_shift(cached.x, len(BLOCKS), problem.steps, shift),
+                y=np.concatenate(
+                    [_shift(cached.y[:rows], 3, problem.steps, shift), _shift(cached.y[rows:], len(BLOCKS), problem.steps, shift)]
+                ),
+            )
+            result = cached.solver.solve()
+            solution = self._finish(problem, result, started, warm=True)
+            cached.x, cached.y, cached.start = result.x, result.y, problem.start
+        return solution
+
+    def _cold(self, site_id: str, problem: SiteProblem, pattern) -> Solution:
+        started = time.perf_counter()
+        solver = osqp.OSQP()
+        solver.setup(
+            problem.P, problem.q, problem.A, problem.l, problem.u,
+            warm_starting=True, polishing=True, verbose=False, eps_abs=1e-5, eps_rel=1e-5, max_iter=20000,
+        )
+        result = solver.solve()
+        solution = self._finish(problem, result, started, warm=False)
+        entry = _SiteSolver(solver, pattern, problem.start, problem.step_hours, result.x, result.y, threading.Lock())
+        with self._lock:
+            self._sites[site_id] = entry
+            if len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+        return solution
+
+    @staticmethod
+    def _finish(problem: SiteProblem, result: Any, started: float, warm: bool) -> Solution:
+        status = str(result.info.status)
+        if not status.startswith("solved") or result.x is None:
+            raise ValueError(f"Plan optimisation failed: {status}")
+        return Solution(problem, result.x, status, (time.perf_counter() - started) * 1000.0, warm)
+
+
+def describe(solution: Solution) -> Tuple[Dict[str, float], List[Dict[str, Any]], List[str]]:
+    """Return ``(objective, setpoints, explanations)`` for a solved plan."""
+
+    problem, x = solution.problem, solution.x
+    dt = problem.step_hours
+    charge = problem.block(x, "charge")
+    discharge = problem.block(x, "discharge")
+    hvac = problem.block(x, "hvac")
+    ev = problem.block(x, "ev")
+    grid = np.maximum(problem.block(x, "grid_import"), 0.0)
+    baseline = np.maximum(problem.net_load, 0.0)
+
+    objective = {
+        "cost": round(float(np.sum(problem.price * grid) * dt), 4),
+        "carbonKg": round(float(np.sum(problem.carbon * grid) * dt), 4),
+        "reward": round(float(np.sum(problem.dr_price * (baseline - grid)) * dt), 4),
+        "peakKw": round(float(grid.max(initial=0.0)), 3),
+        "solveMs": round(solution.solve_ms, 3),
+        "warmStart": solution.warm,
+    }
+    times = [problem.start + timedelta(hours=dt * step) for step in range(problem.steps)]
+    setpoints = [
+        {"t": t, "essP": round(float(d - c), 3), "hvacSet": round(problem.hvac_base + float(h), 2), "evKw": round(float(e), 3)}
+        for t, c, d, h, e in zip(times, charge, discharge, hvac, ev)
+    ]
+
+    explanations: List[str] = []
+    for event_id, first, stop in problem.dr_events:
+        explanations.append(
+            f"DR event {event_id}: grid import {float(grid[first:stop].mean()):.1f} kW vs "
+            f"{float(baseline[first:stop].mean()):.1f} kW baseline, ESS {float((discharge - charge)[first:stop].mean()):+.1f} kW, "
+            f"HVAC setpoint up to {float(hvac[first:stop].max()):+.1f} degC"
+        )
+    if problem.contract_kw is not None and grid.max(initial=0.0) > problem.contract_kw + 1e-3:
+        explanations.append(f"Contract demand {problem.contract_kw:.0f} kW exceeded (peak {grid.max():.1f} kW)")
+    elif problem.contract_kw is not None:
+        explanations.append(f"Grid import kept under contract demand {problem.contract_kw:.0f} kW")
+    if charge.sum() > 1e-3:
+        cheapest = int(np.argmin(problem.price + problem.dr_price))
+        explanations.append(f"ESS charges {float(charge.sum() * dt):.1f} kWh, cheapest step at {times[cheapest].isoformat()}")
+    return objective, setpoints, explanations
+
+
+def plan_start(granularity_min: int, now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    floored = now.replace(second=0, microsecond=0)
+    return floored - timedelta(minutes=floored.minute % granularity_min if granularity_min <= 60 else floored.minute)
+
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from planner import HorizonPlanner, build_problem
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+FORECASTS = {
+    "load": [30.0 + 10.0 * np.sin(step / 8.0) for step in range(96)],
+    "price": [0.1 if step < 48 else 0.3 for step in range(96)],
+}
+CONSTRAINTS = {
+    "ess": {"capacityKwh": 100.0, "powerKw": 25.0, "soc": 0.5},
+    "hvac": {"setpoint": 24.0, "min": 22.0, "max": 26.0, "kwPerDegree": 3.0},
+    "ev": {"maxKw": 7.0, "energyKwh": 20.0, "departure": (START + timedelta(hours=8)).isoformat()},
+}
+
+
+def problem(start=START, constraints=CONSTRAINTS, preferences=None):
+    return build_problem(start, 15, "PT24H", FORECASTS, constraints, preferences=preferences)
+
+
+def hvac_offsets(solution):
+    return solution.problem.block(solution.x, "hvac")
+
+
+def test_warm_replan_uses_updated_comfort_weight():
+    planner = HorizonPlanner()
+    planner.solve("site", problem())
+    warm = planner.solve("site", problem(preferences={"comfortWeight": 1000.0}))
+    cold = HorizonPlanner().solve("site", problem(preferences={"comfortWeight": 1000.0}))
+
+    assert warm.warm and not cold.warm
+    assert np.abs(hvac_offsets(warm)).max() < 0.05
+    np.testing.assert_allclose(hvac_offsets(warm), hvac_offsets(cold), atol=0.05)
+
+
+def test_replan_with_new_ev_departure_stays_warm():
+    planner = HorizonPlanner()
+    planner.solve("site", problem())
+    for hours in (4, 6, 12):
+        ev = dict(CONSTRAINTS["ev"], departure=(START + timedelta(hours=hours)).isoformat())
+        solution = planner.solve("site", problem(constraints=dict(CONSTRAINTS, ev=ev)))
+        charged = solution.problem.block(solution.x, "ev")
+        assert solution.warm
+        assert np.abs(charged[hours * 4 :]).max() < 1e-3
+        assert charged.sum() * 0.25 == pytest.approx(20.0, abs=0.05)
+
+
+def test_shifted_replan_stays_warm():
+    planner = HorizonPlanner()
+    planner.solve("site", problem())
+    assert planner.solve("site", problem(start=START + timedelta(minutes=15))).warm
+
+
+def test_export_price_above_import_price_needs_export_limit():
+    with pytest.raises(ValueError, match="exportLimitKw"):
+        problem(preferences={"exportPrice": 0.5})
+
+    solution = HorizonPlanner().solve("site", problem(preferences={"exportPrice": 0.5, "exportLimitKw": 10.0}))
+    assert solution.problem.block(solution.x, "grid_export").max() <= 10.0 + 1e-3
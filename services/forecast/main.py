@@ -1,30 +1,78 @@
 from fastapi import FastAPI
-    from datetime import datetime
-    from typing import List
-    from pydantic import BaseModel
-    from ng_common.models import *
-    import os
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from ng_common.models import *
+import os
 
-    app = FastAPI(title="NanoGrid Forecast Service")
+app = FastAPI(title="NanoGrid Forecast Service")
 
-    @app.get("/health")
-    def health():
-        return {"service":"forecast","status":"ok","ts": datetime.utcnow().isoformat()}
+@app.get("/health")
+def health():
+    return {"service":"forecast","status":"ok","ts": datetime.utcnow().isoformat()}
 
 
+from typing import Literal
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from forecasters import ForecastJob, ModelCache, check_features, horizon_steps, predict_batch
+
+try:
+    import msgpack
+except ImportError:  # msgpack responses are optional
+    msgpack = None
+
+MODELS = ModelCache(max_bytes=int(os.getenv("MODEL_CACHE_MB", "64")) * 1024 * 1024)
+MAX_BATCH = int(os.getenv("FORECAST_MAX_BATCH", "5000"))
+
+class BatchItem(BaseModel):
+    siteId: str
+    kind: Literal["load","pv","price"]
+    horizon: str = "PT24H"
+    granularityMin: int = 60
+    features: dict = {}
+
+class BatchForecastRequest(BaseModel):
+    requests: List[BatchItem]
+    # "series": one columnar TimeSeries per result instead of a TimePoint list
+    format: Literal["points","series"] = "points"
+
+def _job(siteId: str, kind: str, horizon: str, granularityMin: int, features: dict) -> ForecastJob:
+    try:
+        check_features(features)
+        return ForecastJob(siteId, kind, horizon_steps(horizon, granularityMin), granularityMin, features)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _single(kind: str, req: ForecastRequest):
+    return predict_batch(MODELS, [_job(req.siteId, kind, req.horizon, req.granularityMin, req.features)])[0]["points"]
+
 @app.post("/forecast/load", response_model=list[TimePoint])
 def forecast_load(req: ForecastRequest):
-    # Dummy: 24 points flat
-    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-    return [TimePoint(t=now, y=123.4).model_dump() for _ in range(24)]
+    return _single("load", req)
 
 @app.post("/forecast/pv", response_model=list[TimePoint])
 def forecast_pv(req: ForecastRequest):
-    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-    return [TimePoint(t=now, y=62.1).model_dump() for _ in range(24)]
+    return _single("pv", req)
 
 @app.post("/forecast/price", response_model=list[TimePoint])
 def forecast_price(req: ForecastRequest):
-    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-    return [TimePoint(t=now, y=110.0).model_dump() for _ in range(24)]
+    return _single("price", req)
+
+@app.post("/forecast/batch", response_class=ORJSONResponse)
+def forecast_batch(req: BatchForecastRequest, request: Request):
+    """Forecast many (siteId, kind) pairs; results come back in request order.
+
+    Send ``Accept: application/msgpack`` for a msgpack body."""
+    if len(req.requests) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} forecasts per batch")
+    jobs = [_job(r.siteId, r.kind, r.horizon, r.granularityMin, r.features) for r in req.requests]
+    body = {"results": predict_batch(MODELS, jobs, columnar=req.format == "series"), "cache": MODELS.stats()}
+    if "application/msgpack" in request.headers.get("accept", "") and msgpack is not None:
+        return Response(msgpack.packb(body, use_bin_type=True), media_type="application/msgpack")
+    # Built as plain dicts and serialised by orjson; validating ~100k TimePoints costs seconds
+    return ORJSONResponse(body)
 
+@app.get("/forecast/models")
+def model_cache():
+    return MODELS.stats()
@@ -0,0 +1,96 @@
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+import msgpack
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from forecasters import SLOTS, ModelCache, check_features, fingerprint
+
+# Every service's app module is named main; load this one under its own name.
+_spec = importlib.util.spec_from_file_location("forecast_main", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+END = datetime(2025, 1, 1, 12, 0)
+HISTORY = {"history": [float(i % 24) for i in range(96)], "historyStepMin": 15}
+
+
+def test_cache_hits_until_history_step_or_end_changes():
+    cache = ModelCache()
+    first = cache.get("load", "s1", HISTORY, END)
+    assert cache.get("load", "s1", HISTORY, END) is first
+    assert cache.get("load", "s1", {}, END) is first  # no history: reuse the last fit
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert cache.get("load", "s1", dict(HISTORY, historyStepMin=60), END) is not first
+    assert cache.get("load", "s1", HISTORY, END.replace(hour=13)) is not first
+    assert cache.misses == 3 and len(cache) == 1
+
+
+def test_fingerprint_covers_step_and_end_minute():
+    base = fingerprint(HISTORY, END)
+    assert base == fingerprint(dict(HISTORY), END.replace(day=2))
+    assert base != fingerprint(dict(HISTORY, historyStepMin=30), END)
+    assert base != fingerprint(HISTORY, END.replace(minute=15))
+    assert fingerprint({}, END) == ""
+
+
+def test_cache_evicts_least_recently_used_models_by_bytes():
+    model_bytes = 2 * SLOTS * 8
+    cache = ModelCache(max_bytes=2 * model_bytes)
+    for site in ("s1", "s2"):
+        cache.get("pv", site, {}, END)
+    cache.get("pv", "s1", {}, END)
+    cache.get("pv", "s3", {}, END)
+
+    assert cache.stats()["models"] == 2 and cache.bytes == 2 * model_bytes
+    hits = cache.hits
+    cache.get("pv", "s1", {}, END)
+    assert cache.hits == hits + 1
+    cache.get("pv", "s2", {}, END)
+    assert cache.hits == hits + 1  # s2 was evicted and refitted
+
+
+@pytest.mark.parametrize(
+    "features",
+    [{"history": ["a", "b"]}, {"history": [[1.0], [2.0, 3.0]]}, {"history": [1.0], "historyStepMin": 0},
+     {"historyStepMin": "15"}],
+)
+def test_invalid_features_are_rejected(features):
+    with pytest.raises(ValueError):
+        check_features(features)
+
+
+def batch(client, requests, **kwargs):
+    return client.post("/forecast/batch", json={"requests": requests, **kwargs.pop("body", {})}, **kwargs)
+
+
+def test_batch_endpoint_formats_and_errors():
+    client = TestClient(main.app)
+    requests = [
+        {"siteId": "a", "kind": "load", "horizon": "PT2H", "granularityMin": 15, "features": HISTORY},
+        {"siteId": "b", "kind": "price", "horizon": "PT3H", "granularityMin": 60},
+    ]
+
+    points = batch(client, requests)
+    assert points.status_code == 200
+    results = points.json()["results"]
+    assert [(r["siteId"], len(r["points"])) for r in results] == [("a", 8), ("b", 3)]
+    low, high = results[0]["points"][0]["pi"]
+    assert low <= results[0]["points"][0]["y"] <= high
+
+    series = batch(client, requests, body={"format": "series"})
+    first = series.json()["results"][0]["series"]
+    assert first["step"] == 900.0
+    assert first["y"] == [p["y"] for p in results[0]["points"]]
+
+    packed = batch(client, requests, headers={"accept": "application/msgpack"})
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert len(msgpack.unpackb(packed.content)["results"]) == 2
+
+    bad = batch(client, [{"siteId": "a", "kind": "load", "features": {"history": ["x"]}}])
+    assert bad.status_code == 422 and "history" in bad.json()["detail"]
+    assert batch(client, [{"siteId": "a", "kind": "load", "horizon": "1 day"}]).status_code == 422
@@ -0,0 +1,339 @@
+"""Bulk telemetry ingest: batch decoding, vectorised validation and a bounded write buffer."""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from telemetry import METRICS, TelemetryStore
+
+try:  # optional accelerators / formats
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pa_ipc = None
+
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/vnd.apache.arrow.file": ARROW,
+}
+
+# Rejected row indices echoed back to the client.
+MAX_REPORTED_ERRORS = 100
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedFormat(Exception):
+    """The content type is unknown or its decoder is not installed."""
+
+
+class BufferFull(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Write buffer full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ReadingBatch:
+    """Validated readings as aligned columns.
+
+    Site and asset ids are factorised: row ``i`` belongs to
+    ``sites[site_code[i]]`` and to ``assets[asset_code[i]]``, or to no asset
+    when ``asset_code[i]`` is ``-1``.
+    """
+
+    sites: List[str]
+    site_code: np.ndarray
+    assets: List[str]
+    asset_code: np.ndarray
+    ts: np.ndarray
+    values: np.ndarray
+    rejected: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+@dataclass
+class _Factorized:
+    labels: List[Any]
+    codes: np.ndarray
+
+
+def media_type(content_type: Optional[str]) -> str:
+    base = (content_type or "").split(";")[0].strip().lower()
+    return _ALIASES.get(base, base)
+
+
+def _factorize(values: Any) -> _Factorized:
+    if isinstance(values, _Factorized):
+        return values
+    labels: Dict[Any, int] = {}
+    try:
+        codes = np.fromiter((labels.setdefault(value, len(labels)) for value in values), np.int64, len(values))
+    except TypeError:
+        raise ValueError("siteId and assetId must be strings") from None
+    return _Factorized(list(labels), codes)
+
+
+def _column_from_records(records: Sequence[Dict[str, Any]], key: str, default: Any = None) -> List[Any]:
+    try:
+        return [record.get(key, default) for record in records]
+    except AttributeError:
+        raise ValueError("Every reading must be an object") from None
+
+
+def _columns_from_records(records: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    # A missing metric counts as zero; an explicit null is rejected later.
+    columns = {key: _column_from_records(records, key) for key in ("siteId", "assetId", "ts")}
+    columns.update((metric, _column_from_records(records, metric, 0.0)) for metric in METRICS)
+    return columns
+
+
+def _decode_ndjson(body: bytes) -> Dict[str, List[Any]]:
+    lines = body.strip()
+    if not lines:
+        return {}
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        records = loads(b"[" + lines.replace(b"\n", b",") + b"]")
+    except ValueError:
+        # Slow path for blank lines between readings.
+        records = loads(b"[" + b",".join(line for line in lines.splitlines() if line.strip()) + b"]")
+    return _columns_from_records(records)
+
+
+def _decode_msgpack(body: bytes) -> Dict[str, List[Any]]:
+    if msgpack is None:
+        raise UnsupportedFormat("msgpack is not installed on this server")
+    payload = msgpack.unpackb(body, raw=False)
+    if isinstance(payload, dict):  # already column-oriented
+        return _checked_columns(payload)
+    if not isinstance(payload, list):
+        raise ValueError("A msgpack body must be a list of readings or a map of columns")
+    return _columns_from_records(payload)
+
+
+def _checked_columns(columns: Dict[str, Any]) -> Dict[str, List[Any]]:
+    # A scalar where a column belongs would otherwise be iterated (a string
+    # id character by character) or broadcast, so insist on equal-length lists.
+    sizes = set()
+    for name, values in columns.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Column {name!r} must be a list of values")
+        sizes.add(len(values))
+    if len(sizes) > 1:
+        raise ValueError("All columns must have the same length")
+    return columns
+
+
+def _decode_arrow(body: bytes) -> Dict[str, Any]:
+    if pa is None:
+        raise UnsupportedFormat("pyarrow is not installed on this server")
+    try:
+        table = pa_ipc.open_stream(pa.py_buffer(body)).read_all()
+    except pa.ArrowInvalid:
+        table = pa_ipc.open_file(pa.py_buffer(body)).read_all()
+    columns: Dict[str, Any] = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_timestamp(column.type):
+            column = column.cast(pa.timestamp("us")).cast(pa.int64())
+            columns[name] = column.to_numpy(zero_copy_only=False) / 1e6
+        elif pa.types.is_floating(column.type) or pa.types.is_integer(column.type):
+            columns[name] = column.to_numpy(zero_copy_only=False)
+        elif name in ("siteId", "assetId"):
+            encoded = column.combine_chunks().dictionary_encode()
+            labels = encoded.dictionary.to_pylist()
+            codes = encoded.indices.fill_null(len(labels)).to_numpy(zero_copy_only=False)
+            columns[name] = _Factorized(labels + [None], codes.astype(np.int64))
+        else:
+            columns[name] = column.to_pylist()
+    return columns
+
+
+_DECODERS = {NDJSON: _decode_ndjson, MSGPACK: _decode_msgpack, ARROW: _decode_arrow}
+
+
+def _float_column(values: Any, size: int, default: float) -> np.ndarray:
+    if values is None:
+        return np.full(size, default)
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.fromiter((_to_float(value, default) for value in values), float, size)
+
+
+def _to_float(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _timestamp_column(values: Any, size: int, now: float) -> np.ndarray:
+    """Epoch seconds; ISO 8601 strings take a per-row slow path."""
+
+    if values is None:
+        return np.full(size, now)
+    try:
+        parsed = np.asarray(values, dtype=float)
+        # NaN may stand for a missing timestamp, which defaults to ``now``.
+        if not np.isnan(parsed).any():
+            return parsed
+    except (TypeError, ValueError):
+        pass
+    parsed = np.empty(size)
+    for row, value in enumerate(values):
+        if value is None:
+            parsed[row] = now
+        elif isinstance(value, str):
+            try:
+                parsed[row] = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                parsed[row] = math.nan
+        else:
+            parsed[row] = _to_float(value, now)
+    return parsed
+
+
+def decode_batch(body: bytes, content_type: Optional[str], now: Optional[float] = None) -> ReadingBatch:
+    """Decode ``body`` and keep only rows with a site, a finite timestamp and finite metrics."""
+
+    decoder = _DECODERS.get(media_type(content_type))
+    if decoder is None:
+        raise UnsupportedFormat(f"Unsupported content type {content_type!r}; use {', '.join(_DECODERS)}")
+    columns = decoder(body)
+    now = time.time() if now is None else now
+
+    sites = _factorize(columns.get("siteId", []))
+    size = len(sites.codes)
+    assets = columns.get("assetId")
+    assets = _factorize(assets if assets is not None else [None] * size)
+    ts = _timestamp_column(columns.get("ts"), size, now)
+    values = np.zeros((size, len(METRICS)))
+    for column, metric in enumerate(METRICS):
+        values[:, column] = _float_column(columns.get(metric), size, 0.0)
+
+    if not (len(assets.codes) == len(ts) == size):
+        raise ValueError("All columns must have the same length")
+    # Ids are checked once per distinct label, then broadcast to the rows.
+    good_site = np.array([isinstance(label, str) and bool(label) for label in sites.labels], dtype=bool)
+    good_asset = np.array([label is None or isinstance(label, str) for label in assets.labels], dtype=bool)
+    valid = np.isfinite(ts) & np.isfinite(values).all(axis=1) & good_site[sites.codes] & good_asset[assets.codes]
+
+    # Re-code assets so that "no asset" is -1 and labels are strings only.
+    asset_labels: List[str] = []
+    remap = np.full(len(assets.labels), -1, dtype=np.int64)
+    for code, label in enumerate(assets.labels):
+        if isinstance(label, str):
+            remap[code] = len(asset_labels)
+            asset_labels.append(label)
+    return ReadingBatch(
+        sites=sites.labels,
+        site_code=sites.codes[valid],
+        assets=asset_labels,
+        asset_code=remap[assets.codes[valid]],
+        ts=ts[valid],
+        values=values[valid],
+        rejected=np.flatnonzero(~valid),
+    )
+
+
+class BulkWriter:
+    """Bounded buffer between the ingest endpoint and the telemetry store.
+
+    Each accepted batch gets the next sequence number and is applied by a
+    background thread in order; ``committed_seq`` is the last applied one.
+    Batches that would push the buffer past ``capacity`` readings are refused
+    with :class:`BufferFull`, whose ``retry_after`` is estimated from the
+    recent drain rate. A batch the store fails to apply is logged, counted in
+    ``failed_batches`` and skipped.
+    """
+
+    def __init__(self, store: TelemetryStore, capacity: int = 1_000_000) -> None:
+        self.store = store
+        self.capacity = capacity
+        self.buffered = 0
+        self.next_seq = 1
+        self.committed_seq = 0
+        self.failed_batches = 0
+        self._queue: Deque = deque()
+        self._cond = threading.Condition()
+        self._drain_rate = float(capacity)  # readings per second, smoothed
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, batch: ReadingBatch) -> int:
+        with self._cond:
+            if self.buffered and self.buffered + len(batch) > self.capacity:
+                raise BufferFull(max(1, math.ceil(self.buffered / max(self._drain_rate, 1.0))))
+            seq = self.next_seq
+            self.next_seq += 1
+            self.buffered += len(batch)
+            self._queue.append((seq, batch))
+            self._ensure_thread()
+            self._cond.notify()
+        return seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted batch is applied."""
+
+        with self._cond:
+            target = self.next_seq - 1
+            return self._cond.wait_for(lambda: self.committed_seq >= target, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                seq, batch = self._queue.popleft()
+            started = time.perf_counter()
+            try:
+                self.store.add_many(
+                    batch.sites, batch.site_code, batch.assets, batch.asset_code, batch.ts, batch.values
+                )
+            except Exception:
+                # A bad batch must not stop the thread with later ones queued.
+                logger.exception("Dropped telemetry batch %d (%d readings)", seq, len(batch))
+                with self._cond:
+                    self.failed_batches += 1
+            finally:
+                elapsed = max(time.perf_counter() - started, 1e-6)
+                with self._cond:
+                    self.buffered -= len(batch)
+                    self.committed_seq = seq
+                    self._drain_rate = 0.8 * self._drain_rate + 0.2 * (len(batch) / elapsed)
+                    self._cond.notify_all()
@@ -1,29 +1,71 @@
 from fastapi import FastAPI
-    from datetime import datetime
-    from typing import List
-    from pydantic import BaseModel
-    from ng_common.models import *
-    import os
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from ng_common.models import *
+import os
 
-    app = FastAPI(title="NanoGrid Monitoring Service")
+app = FastAPI(title="NanoGrid Monitoring Service")
 
-    @app.get("/health")
-    def health():
-        return {"service":"monitoring","status":"ok","ts": datetime.utcnow().isoformat()}
+@app.get("/health")
+def health():
+    return {"service":"monitoring","status":"ok","ts": datetime.utcnow().isoformat()}
 
 
-from fastapi import Body
-from statistics import mean
+import time
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from bulk import BufferFull, BulkWriter, UnsupportedFormat, MAX_REPORTED_ERRORS, decode_batch
+from telemetry import METRICS, TelemetryStore, parse_window
 
-TELEMETRY = []
+STORE = TelemetryStore(max_series=int(os.getenv("TELEMETRY_MAX_SERIES", "1024")))
+WRITER = BulkWriter(STORE, capacity=int(os.getenv("TELEMETRY_BUFFER_POINTS", "1000000")))
+
+class TelemetryReading(BaseModel):
+    siteId: str
+    assetId: str | None = None
+    ts: datetime | None = None
+    energy_kwh: float = 0.0
+    cost: float = 0.0
+    carbon_kg: float = 0.0
 
 @app.post("/ingest")
-def ingest(payload: dict = Body(...)):
-    TELEMETRY.append(payload)
+def ingest(reading: TelemetryReading):
+    ts = reading.ts.timestamp() if reading.ts else time.time()
+    STORE.add(reading.siteId, reading.assetId, [ts], [[getattr(reading, m) for m in METRICS]])
     return {"ok": True}
 
-@app.get("/kpis", response_model=KPIResponse)
-def kpis(siteId: str, window: str = "PT1H"):
-    # Dummy values
-    return KPIResponse(window=window, energy_kwh=123.0, cost=4567.0, carbon_kg=89.0)
+@app.post("/ingest/bulk", status_code=202)
+async def ingest_bulk(request: Request):
+    body = await request.body()
+    try:
+        batch = await run_in_threadpool(decode_batch, body, request.headers.get("content-type"))
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        seq = WRITER.submit(batch)
+    except BufferFull as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e), "committedSeq": WRITER.committed_seq},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return {
+        "seq": seq,
+        "accepted": len(batch),
+        "rejected": len(batch.rejected),
+        "rejectedRows": batch.rejected[:MAX_REPORTED_ERRORS].tolist(),
+        "committedSeq": WRITER.committed_seq,
+    }
 
+@app.get("/kpis", response_model=KPIResponse)
+def kpis(siteId: str, window: str = "PT1H", assetId: str | None = None, end: datetime | None = None):
+    try:
+        seconds = parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    now = end.timestamp() if end else time.time()
+    return KPIResponse(window=window, **STORE.kpis(siteId, seconds, now, asset_id=assetId))
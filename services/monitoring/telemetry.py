@@ -0,0 +1,217 @@
+"""In-process telemetry store: fixed-size NumPy rollup rings per series."""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ("energy_kwh", "cost", "carbon_kg")
+
+# Rollup resolution in seconds -> number of buckets kept (24 h, 7 d, 90 d).
+ROLLUPS: Dict[int, int] = {60: 1440, 900: 672, 3600: 2160}
+
+_DURATION = re.compile(
+    r"^P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+_UNIT_SECONDS = {"weeks": 604800, "days": 86400, "hours": 3600, "minutes": 60, "seconds": 1}
+
+SeriesKey = Tuple[str, Optional[str]]
+
+
+def parse_window(window: str) -> int:
+    """Return an ISO 8601 duration such as ``PT15M`` or ``P7D`` in seconds."""
+
+    match = _DURATION.match(window)
+    if not match or window in ("P", "PT") or window.endswith("T"):
+        raise ValueError(f"Unsupported window {window!r}; expected an ISO 8601 duration like PT1H")
+    seconds = sum(int(v) * _UNIT_SECONDS[k] for k, v in match.groupdict().items() if v)
+    if seconds <= 0:
+        raise ValueError(f"Window {window!r} must be positive")
+    return seconds
+
+
+class Rollup:
+    """Ring of fixed-width time buckets holding per-metric sums and counts."""
+
+    def __init__(self, resolution: int, buckets: int, width: int) -> None:
+        self.resolution = resolution
+        self.buckets = buckets
+        self.start = np.full(buckets, -1, dtype=np.int64)
+        self.sums = np.zeros((buckets, width))
+        self.counts = np.zeros(buckets, dtype=np.int64)
+
+    @property
+    def retention(self) -> int:
+        return self.resolution * self.buckets
+
+    def add(self, ts: np.ndarray, values: np.ndarray) -> None:
+        keys = np.floor_divide(ts, self.resolution).astype(np.int64)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.column_stack(
+            [np.bincount(inverse, weights=values[:, column], minlength=len(unique)) for column in range(values.shape[1])]
+        )
+        counts = np.bincount(inverse, minlength=len(unique))
+
+        # A batch wider than the ring only keeps its newest buckets.
+        keep = unique > unique[-1] - self.buckets
+        unique, sums, counts = unique[keep], sums[keep], counts[keep]
+        slots = unique % self.buckets
+        current = self.start[slots]
+        fresh = unique > current
+        self.start[slots[fresh]] = unique[fresh]
+        self.sums[slots[fresh]] = 0.0
+        self.counts[slots[fresh]] = 0
+        # Points older than the bucket now occupying their slot have expired.
+        live = unique >= current
+        self.sums[slots[live]] += sums[live]
+        self.counts[slots[live]] += counts[live]
+
+    def total(self, first: int, stop: int) -> np.ndarray:
+        """Sum the buckets covering ``[first, stop)`` (bucket numbers, not seconds)."""
+
+        if stop <= first:
+            return np.zeros(self.sums.shape[1])
+        keys = np.arange(max(first, stop - self.buckets), stop, dtype=np.int64)
+        slots = keys % self.buckets
+        valid = self.start[slots] == keys
+        return self.sums[slots[valid]].sum(axis=0)
+
+
+class Series:
+    """Rollups of one site's or asset's readings.
+
+    Only the rollup buckets are kept; KPI queries never need raw points.
+    """
+
+    def __init__(self, width: int = len(METRICS)) -> None:
+        self.width = width
+        self.rollups = [Rollup(resolution, buckets, width) for resolution, buckets in sorted(ROLLUPS.items())]
+
+    def extend(self, ts: np.ndarray, values: np.ndarray) -> None:
+        if not len(ts):
+            return
+        for rollup in self.rollups:
+            rollup.add(ts, values)
+
+    def window_total(self, start: int, end: int) -> np.ndarray:
+        """Sum of every metric over ``[start, end)``; both bounds are whole minutes."""
+
+        total = np.zeros(self.width)
+        pending = [(start, end)]
+        # Cover the range with the coarsest buckets that fit, then fill the
+        # ragged edges with progressively finer ones.
+        for rollup in reversed(self.rollups):
+            resolution = rollup.resolution
+            remaining = []
+            for lo, hi in pending:
+                first, stop = -(-lo // resolution), hi // resolution
+                if first >= stop:
+                    remaining.append((lo, hi))
+                    continue
+                total += rollup.total(first, stop)
+                for span in ((lo, first * resolution), (stop * resolution, hi)):
+                    if span[0] < span[1]:
+                        remaining.append(span)
+            pending = remaining
+        return total
+
+
+def _groups(codes: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield ``(code, rows)`` for each distinct code, rows in their original order."""
+
+    order = np.argsort(codes, kind="stable")
+    ordered = codes[order]
+    bounds = np.flatnonzero(np.diff(ordered)) + 1
+    for rows in np.split(order, bounds):
+        if len(rows):
+            yield int(codes[rows[0]]), rows
+
+
+class TelemetryStore:
+    """Per-site and per-asset series with bounded memory.
+
+    Every reading updates its asset series (when it names an asset) and its
+    site series, so site KPIs never need to combine assets at query time. At
+    most ``max_series`` series are kept; the least recently written one is
+    dropped to make room for a new one. With the default rollups each series
+    costs about 170 KiB.
+    """
+
+    def __init__(self, max_series: int = 1024) -> None:
+        self.max_series = max_series
+        self._series: "OrderedDict[SeriesKey, Series]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _series_for(self, key: SeriesKey) -> Series:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = Series()
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def add(self, site_id: str, asset_id: Optional[str], ts: Sequence[float], values: np.ndarray) -> None:
+        """Append readings for one site/asset; ``values`` has one column per metric."""
+
+        ts = np.asarray(ts, dtype=float)
+        values = np.asarray(values, dtype=float).reshape(len(ts), len(METRICS))
+        with self._lock:
+            if asset_id is not None:
+                self._series_for((site_id, asset_id)).extend(ts, values)
+            self._series_for((site_id, None)).extend(ts, values)
+
+    def add_many(
+        self,
+        sites: Sequence[str],
+        site_codes: np.ndarray,
+        assets: Sequence[str],
+        asset_codes: np.ndarray,
+        ts: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        """Append readings for many series at once.
+
+        Row ``i`` belongs to ``sites[site_codes[i]]`` and, unless
+        ``asset_codes[i]`` is negative, to ``assets[asset_codes[i]]``.
+        """
+
+        if not len(ts):
+            return
+        with self._lock:
+            for code, rows in _groups(site_codes):
+                self._series_for((sites[code], None)).extend(ts[rows], values[rows])
+            asset_rows = np.flatnonzero(asset_codes >= 0)
+            pairs = site_codes[asset_rows] * len(assets) + asset_codes[asset_rows]
+            for code, rows in _groups(pairs):
+                site, asset = divmod(code, len(assets))
+                selected = asset_rows[rows]
+                self._series_for((sites[site], assets[asset])).extend(ts[selected], values[selected])
+
+    def kpis(self, site_id: str, window_seconds: int, now: float, asset_id: Optional[str] = None) -> Dict[str, float]:
+        """Metric totals over the ``window_seconds`` ending at ``now``.
+
+        The window is resolved to whole minutes and ends with the minute that
+        contains ``now``. A window starting beyond a rollup's retention is
+        widened to that rollup's next coarser bucket boundary.
+        """
+
+        end = (int(now) // 60 + 1) * 60
+        start = end - -(-window_seconds // 60) * 60
+        with self._lock:
+            series = self._series.get((site_id, asset_id))
+            if series is None:
+                return dict.fromkeys(METRICS, 0.0)
+            for finer, coarser in zip(series.rollups, series.rollups[1:]):
+                if end - start > finer.retention:
+                    start = start // coarser.resolution * coarser.resolution
+            total = series.window_total(start, end)
+        return dict(zip(METRICS, total.tolist()))
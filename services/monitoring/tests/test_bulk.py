@@ -0,0 +1,146 @@
+import importlib.util
+import io
+import threading
+from pathlib import Path
+
+import msgpack
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from bulk import ARROW, MSGPACK, NDJSON, BufferFull, BulkWriter, UnsupportedFormat, decode_batch
+from telemetry import TelemetryStore
+
+# Every service's app module is named main; load this one under its own name.
+_spec = importlib.util.spec_from_file_location("monitoring_main", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+READINGS = [
+    {"siteId": "s1", "assetId": "m1", "ts": 60.0, "energy_kwh": 1.0, "cost": 0.2},
+    {"siteId": "s1", "ts": "1970-01-01T00:02:00Z", "energy_kwh": 2.0},
+    {"siteId": "s2", "assetId": "m2", "ts": 180.0, "energy_kwh": None},
+    {"siteId": "", "ts": 240.0, "energy_kwh": 4.0},
+]
+
+
+def ndjson(records):
+    import json
+
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def test_ndjson_rows_are_validated_per_row():
+    batch = decode_batch(ndjson(READINGS) + b"\n\n", NDJSON)
+
+    assert batch.rejected.tolist() == [2, 3]
+    assert [batch.sites[code] for code in batch.site_code] == ["s1", "s1"]
+    assert batch.asset_code.tolist() == [batch.assets.index("m1"), -1]
+    assert batch.ts.tolist() == [60.0, 120.0]
+    assert batch.values[:, 0].tolist() == [1.0, 2.0]
+
+
+def test_msgpack_records_and_columns_decode_alike():
+    records = decode_batch(msgpack.packb(READINGS[:2]), MSGPACK)
+    columns = decode_batch(
+        msgpack.packb({"siteId": ["s1", "s1"], "assetId": ["m1", None], "ts": [60.0, 120.0],
+                       "energy_kwh": [1.0, 2.0], "cost": [0.2, 0.0]}),
+        "application/x-msgpack",
+    )
+    for name in ("ts", "values", "site_code", "asset_code"):
+        np.testing.assert_array_equal(getattr(records, name), getattr(columns, name))
+
+
+def test_arrow_stream_decodes_timestamps_and_dictionary_ids():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc as ipc
+
+    table = pa.table({
+        "siteId": ["s1", "s2", None],
+        "ts": pa.array([60_000_000, 120_000_000, 180_000_000], pa.timestamp("us")),
+        "energy_kwh": [1.0, 2.0, 3.0],
+    })
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    batch = decode_batch(sink.getvalue(), ARROW)
+
+    assert batch.ts.tolist() == [60.0, 120.0]
+    assert [batch.sites[code] for code in batch.site_code] == ["s1", "s2"]
+    assert batch.rejected.tolist() == [2]
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (msgpack.packb({"siteId": "abc", "ts": [1.0, 2.0, 3.0]}), MSGPACK),
+        (msgpack.packb({"siteId": ["a", "b"], "ts": [1.0]}), MSGPACK),
+        (msgpack.packb(7), MSGPACK),
+        (b"\xc1", MSGPACK),
+        (b'{"siteId": "s1"}\n{"siteId": ', NDJSON),
+        (b"[1, 2]", NDJSON),
+    ],
+    ids=["scalar-column", "ragged-columns", "scalar-payload", "corrupt-msgpack", "truncated-ndjson", "non-object-row"],
+)
+def test_malformed_bodies_raise_value_error(body, content_type):
+    with pytest.raises(ValueError):
+        decode_batch(body, content_type)
+
+
+def test_unknown_content_type_is_unsupported():
+    with pytest.raises(UnsupportedFormat):
+        decode_batch(b"{}", "application/json")
+
+
+class BlockingStore(TelemetryStore):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def add_many(self, *args):
+        self.release.wait(5)
+        super().add_many(*args)
+
+
+def test_writer_refuses_batches_beyond_capacity():
+    store = BlockingStore()
+    writer = BulkWriter(store, capacity=3)
+    batch = decode_batch(ndjson(READINGS[:2]), NDJSON)
+
+    assert writer.submit(batch) == 1
+    with pytest.raises(BufferFull) as refused:
+        writer.submit(batch)
+    assert refused.value.retry_after >= 1
+    store.release.set()
+    assert writer.flush(timeout=5)
+    assert writer.committed_seq == 1 and writer.buffered == 0
+    assert writer.submit(batch) == 2
+
+
+class FailingStore(TelemetryStore):
+    def add_many(self, sites, *args):
+        if "bad" in sites:
+            raise RuntimeError("store failure")
+        super().add_many(sites, *args)
+
+
+def test_writer_survives_a_failing_batch():
+    store = FailingStore()
+    writer = BulkWriter(store)
+    writer.submit(decode_batch(ndjson([{"siteId": "bad", "ts": 60.0}]), NDJSON))
+    writer.submit(decode_batch(ndjson([{"siteId": "s1", "ts": 60.0, "energy_kwh": 5.0}]), NDJSON))
+
+    assert writer.flush(timeout=5)
+    assert writer.failed_batches == 1 and writer.committed_seq == 2
+    assert store.kpis("s1", 3600, 60.0)["energy_kwh"] == 5.0
+
+
+def test_bulk_endpoint_status_codes():
+    client = TestClient(main.app)
+    ok = client.post("/ingest/bulk", content=ndjson(READINGS), headers={"content-type": NDJSON})
+    assert ok.status_code == 202
+    assert ok.json()["accepted"] == 2 and ok.json()["rejectedRows"] == [2, 3]
+
+    scalar = client.post("/ingest/bulk", content=msgpack.packb({"siteId": "abc"}), headers={"content-type": MSGPACK})
+    assert scalar.status_code == 422
+    assert client.post("/ingest/bulk", content=b"x", headers={"content-type": "text/csv"}).status_code == 415
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from telemetry import Rollup, TelemetryStore, parse_window
+
+
+def column(*values):
+    return np.asarray(values, dtype=float).reshape(-1, 1)
+
+
+def test_rollup_bucket_boundaries():
+    rollup = Rollup(60, 4, 1)
+    rollup.add(np.array([59.999, 60.0, 119.0]), column(1, 2, 4))
+
+    assert rollup.total(0, 1).tolist() == [1.0]
+    assert rollup.total(1, 2).tolist() == [6.0]
+    assert rollup.counts[1] == 2
+    assert rollup.total(0, 2).tolist() == [7.0]
+
+
+def test_rollup_out_of_order_points_land_in_their_bucket():
+    rollup = Rollup(60, 4, 1)
+    rollup.add(np.array([180.0, 60.0]), column(1, 2))
+    rollup.add(np.array([70.0]), column(4))
+
+    assert rollup.total(1, 2).tolist() == [6.0]
+    assert rollup.total(3, 4).tolist() == [1.0]
+
+
+def test_rollup_evicts_buckets_that_fell_off_the_ring():
+    rollup = Rollup(60, 4, 1)
+    rollup.add(np.array([0.0]), column(1))
+    rollup.add(np.array([240.0]), column(2))  # bucket 4 reuses bucket 0's slot
+
+    assert rollup.total(0, 1).tolist() == [0.0]
+    assert rollup.total(4, 5).tolist() == [2.0]
+    # A late point for the evicted bucket is dropped, not added to bucket 4.
+    rollup.add(np.array([30.0]), column(8))
+    assert rollup.total(0, 5).tolist() == [2.0]
+    # A single batch wider than the ring keeps only its newest buckets.
+    rollup.add(np.arange(0.0, 600.0, 60.0), column(*range(10)))
+    assert rollup.total(0, 10).tolist() == [6.0 + 7.0 + 8.0 + 9.0]
+
+
+def test_window_combines_rollups_and_ends_with_the_current_minute():
+    store = TelemetryStore()
+    ts = np.arange(0.0, 3 * 3600.0, 60.0)
+    store.add("s1", "m1", ts, np.ones((len(ts), 3)))
+
+    now = 3 * 3600.0 - 1  # inside the last minute with data
+    assert store.kpis("s1", parse_window("PT1M"), now)["energy_kwh"] == 1.0
+    assert store.kpis("s1", parse_window("PT97M"), now)["energy_kwh"] == 97.0
+    assert store.kpis("s1", parse_window("PT2H"), now, asset_id="m1")["cost"] == 120.0
+    assert store.kpis("s1", parse_window("P1D"), now)["carbon_kg"] == len(ts)
+    assert store.kpis("s2", 3600, now) == {"energy_kwh": 0.0, "cost": 0.0, "carbon_kg": 0.0}
+
+
+def test_least_recently_written_series_is_evicted():
+    store = TelemetryStore(max_series=2)
+    store.add("s1", None, [60.0], [[1, 0, 0]])
+    store.add("s2", None, [60.0], [[1, 0, 0]])
+    store.add("s1", None, [120.0], [[1, 0, 0]])
+    store.add("s3", None, [60.0], [[1, 0, 0]])
+
+    assert len(store) == 2
+    assert store.kpis("s2", 3600, 120.0)["energy_kwh"] == 0.0
+    assert store.kpis("s1", 3600, 120.0)["energy_kwh"] == 2.0
+
+
+@pytest.mark.parametrize("window", ["P", "PT", "P1DT", "PT0M", "1H"])
+def test_invalid_windows_are_rejected(window):
+    with pytest.raises(ValueError):
+        parse_window(window)